@@ -0,0 +1,217 @@
+import operator
+
+import numpy as np
+from Tekla.Structures.Analysis import AnalysisModelHandler
+
+from .wrappers import BaseWrapper
+
+
+DEGREES_OF_FREEDOM = ("Ux", "Uy", "Uz", "Rx", "Ry", "Rz")
+
+NODE_TYPE = "AnalysisNode"
+
+MEMBER_TYPE = "AnalysisBar"
+
+# Attributes read from the analysis objects
+NODE_POSITION = "Position"
+MEMBER_NODES = ("StartNode", "EndNode")
+MEMBER_ENDS = ("StartEnd", "EndEnd")
+MEMBER_MODEL_OBJECT = "ModelObjectID"
+MEMBER_ATTRIBUTES = (*MEMBER_NODES, MEMBER_MODEL_OBJECT, *MEMBER_ENDS)
+
+MISSING_CONDITION = -1
+
+# Attribute getters checked for each type, by type
+_getters = {}
+
+
+def _unwrap(obj):
+    return obj.unwrap() if isinstance(obj, BaseWrapper) else obj
+
+
+def _object_id(obj):
+    if obj is None:
+        return 0
+    identifier = getattr(obj, "Identifier", obj)
+    return int(getattr(identifier, "ID", identifier))
+
+
+def _getter(obj, key, names):
+    """Get a getter of `names`, checking once per type that the objects have all of them."""
+    try:
+        return _getters[key, names]
+    except KeyError:
+        for name in names:
+            if not hasattr(obj, name):
+                raise AttributeError(f"The analysis object {key!r} has no attribute {name!r}")
+        getter = _getters[key, names] = operator.attrgetter(*names)
+        return getter
+
+
+def _end_conditions(end):
+    # a member end without conditions is allowed, but the conditions of an end are not optional
+    if end is None:
+        return [MISSING_CONDITION] * len(DEGREES_OF_FREEDOM)
+    values = _getter(end, type(end).__name__, DEGREES_OF_FREEDOM)(end)
+    return [int(v) for v in values]
+
+
+class AnalysisArrays:
+    """
+    The nodes and members of an analysis model as NumPy arrays.
+
+    Use [`extract_analysis_model`][pytekla.analysis.extract_analysis_model] to create them.
+
+    Parameters
+    ----------
+    node_ids : numpy.ndarray
+        The identifiers of the nodes, sorted.
+    node_coordinates : numpy.ndarray
+        The X, Y and Z coordinates of each node, with shape (nodes, 3).
+    member_ids : numpy.ndarray
+        The identifiers of the members.
+    member_nodes : numpy.ndarray
+        The positions in `node_ids` of the start and end node of each member, with shape (members, 2). -1 if the node is unknown.
+    member_model_ids : numpy.ndarray
+        The identifier of the model object of each member, 0 if there is none.
+    end_conditions : numpy.ndarray
+        The condition of each degree of freedom (`DEGREES_OF_FREEDOM`) of the start and end of each
+        member, as the integer value of the Tekla enumeration, with shape (members, 2, 6). `MISSING_CONDITION` when it could not be read.
+    """
+
+    def __init__(
+        self, node_ids, node_coordinates, member_ids, member_nodes, member_model_ids, end_conditions
+    ):
+        self.node_ids = node_ids
+        self.node_coordinates = node_coordinates
+        self.member_ids = member_ids
+        self.member_nodes = member_nodes
+        self.member_model_ids = member_model_ids
+        self.end_conditions = end_conditions
+
+    def member_coordinates(self):
+        """
+        Get the coordinates of the start and end node of each member.
+
+        Returns
+        -------
+        numpy.ndarray
+            The coordinates with shape (members, 2, 3), NaN for unknown nodes.
+        """
+        coordinates = np.vstack([self.node_coordinates, np.full((1, 3), np.nan)])
+        return coordinates[self.member_nodes]
+
+    def member_lengths(self):
+        """
+        Get the distance between the start and end node of each member.
+
+        Returns
+        -------
+        numpy.ndarray
+            The lengths, NaN for members with unknown nodes.
+        """
+        coordinates = self.member_coordinates()
+        return np.linalg.norm(coordinates[:, 1] - coordinates[:, 0], axis=1)
+
+    def __repr__(self):
+        return f"<PyTekla> AnalysisArrays ({len(self.node_ids)} nodes, {len(self.member_ids)} members)"
+
+
+def get_analysis_objects(analysis_model_name):
+    """
+    Get the objects of an analysis model of the current model.
+
+    Parameters
+    ----------
+    analysis_model_name : str
+        The name of the analysis model.
+
+    Returns
+    -------
+    generator
+        A generator of the `Tekla.Structures.Analysis` objects of the analysis model.
+
+    Raises
+    ------
+    ValueError
+        If there is no analysis model with the name.
+    """
+    for analysis_model in AnalysisModelHandler().GetAnalysisModels():
+        if analysis_model.Name == analysis_model_name:
+            yield from analysis_model.GetObjects()
+            return
+    raise ValueError(f"There is no analysis model named {analysis_model_name!r}.")
+
+
+def extract_analysis_model(objects):
+    """
+    Read the nodes, members and member end conditions of an analysis model in a single pass.
+
+    Parameters
+    ----------
+    objects : iterable
+        The analysis objects, for example returned by [`get_analysis_objects`][pytekla.analysis.get_analysis_objects].
+        Objects that are not nodes or members are ignored.
+
+    Returns
+    -------
+    AnalysisArrays
+        The arrays.
+
+    Raises
+    ------
+    AttributeError
+        If the nodes, members or member ends don't have the attributes named by the module constants
+        (`NODE_POSITION`, `MEMBER_NODES`, `MEMBER_MODEL_OBJECT`, `MEMBER_ENDS` and `DEGREES_OF_FREEDOM`).
+
+    Examples
+    --------
+    >>> from pytekla.analysis import extract_analysis_model, get_analysis_objects
+    >>> arrays = extract_analysis_model(get_analysis_objects("Frame"))
+    >>> arrays.node_coordinates.shape
+    (412, 3)
+    >>> arrays.member_nodes[:2]
+    array([[0, 1],
+           [1, 2]])
+    """
+    node_ids, coordinates = [], []
+    member_ids, member_node_ids, member_model_ids, conditions = [], [], [], []
+
+    for obj in objects:
+        obj = _unwrap(obj)
+        type_name = obj.GetType().Name
+        if type_name == NODE_TYPE:
+            position = _getter(obj, type_name, (NODE_POSITION,))(obj)
+            node_ids.append(_object_id(obj))
+            coordinates.append((position.X, position.Y, position.Z))
+        elif type_name == MEMBER_TYPE:
+            # the nodes, the model object and the ends can be None, but the attributes must exist
+            values = _getter(obj, type_name, MEMBER_ATTRIBUTES)(obj)
+            member_ids.append(_object_id(obj))
+            member_node_ids.append([_object_id(node) for node in values[:2]])
+            member_model_ids.append(_object_id(values[2]))
+            conditions.append([_end_conditions(end) for end in values[3:]])
+
+    node_ids = np.asarray(node_ids, dtype=np.int64)
+    order = np.argsort(node_ids, kind="stable")
+    node_ids = node_ids[order]
+    coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 3)[order]
+
+    member_node_ids = np.asarray(member_node_ids, dtype=np.int64).reshape(-1, 2)
+    member_nodes = np.full(member_node_ids.shape, -1, dtype=np.int64)
+    if len(node_ids):
+        positions = np.minimum(np.searchsorted(node_ids, member_node_ids), len(node_ids) - 1)
+        found = node_ids[positions] == member_node_ids
+        member_nodes[found] = positions[found]
+
+    return AnalysisArrays(
+        node_ids,
+        coordinates,
+        np.asarray(member_ids, dtype=np.int64),
+        member_nodes,
+        np.asarray(member_model_ids, dtype=np.int64),
+        np.asarray(conditions, dtype=np.int8).reshape(-1, 2, len(DEGREES_OF_FREEDOM)),
+    )
+
+
+__all__ = ["AnalysisArrays", "get_analysis_objects", "extract_analysis_model"]
@@ -0,0 +1,164 @@
+import functools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from Tekla.Structures.Model import ModelHandler
+
+from . import session
+from .snapshot import ModelSnapshot
+
+
+def open_model(model_path):
+    """
+    Open a model in the running Tekla Structures and wrap it.
+
+    This is the default model factory of [`run_batch`][pytekla.batch.run_batch].
+
+    Parameters
+    ----------
+    model_path : str
+        The path of the model folder.
+
+    Returns
+    -------
+    ModelWrapper
+        The opened model.
+
+    Raises
+    ------
+    RuntimeError
+        If the model could not be opened.
+    """
+    from .wrappers import ModelWrapper
+
+    if not ModelHandler().Open(model_path):
+        raise RuntimeError(f"The model {model_path!r} could not be opened.")
+    session.reset()
+    return ModelWrapper()
+
+
+def extract_spec(model, spec):
+    """
+    Extract a snapshot of a model following a declarative specification.
+
+    Parameters
+    ----------
+    model : ModelWrapper
+        The model.
+    spec : dict
+        The specification, with the optional items "types" (the type names of the objects, by default
+        all of them), "report_properties" (a dictionary with the property names and types) and "geometry"
+        (whether to read the bounding boxes). See [`ModelSnapshot.from_objects`][pytekla.snapshot.ModelSnapshot.from_objects].
+
+    Returns
+    -------
+    ModelSnapshot
+        The snapshot.
+    """
+    types = spec.get("types")
+    objects = model.get_objects_with_types(list(types)) if types else model.get_all_objects()
+    return ModelSnapshot.from_objects(
+        objects, spec.get("report_properties"), spec.get("geometry", False)
+    )
+
+
+def _to_dataframe(result):
+    if isinstance(result, ModelSnapshot):
+        return result.to_dataframe()
+    if isinstance(result, pd.DataFrame):
+        return result
+    return pd.DataFrame(result)
+
+
+def _run_model(model_factory, spec, model_path):
+    start = time.perf_counter()
+    try:
+        model = model_factory(model_path)
+        result = spec(model) if callable(spec) else extract_spec(model, spec)
+        return model_path, _to_dataframe(result), time.perf_counter() - start, None
+    except Exception as error:
+        return model_path, None, time.perf_counter() - start, f"{type(error).__name__}: {error}"
+
+
+def run_batch(model_paths, spec, max_workers=None, model_factory=open_model):
+    """
+    Run the same extraction over many models in a pool of processes.
+
+    Each worker process has its own pythonnet runtime, opens its models with `model_factory` and
+    extracts them with `spec`. The results of all the models are joined in a single table.
+
+    The default factory opens the models in the running Tekla Structures, which has only one open
+    model at a time, so with it the models are extracted one after the other. Running several workers
+    needs a factory that isolates the models, for example connecting each worker to a different
+    Tekla Structures (or, in tests, returning a stand-in model).
+
+    Parameters
+    ----------
+    model_paths : iterable of str
+        The paths of the model folders.
+    spec : dict or function
+        A specification for [`extract_spec`][pytekla.batch.extract_spec], or a picklable (module level)
+        function that takes a [`ModelWrapper`][pytekla.wrappers.ModelWrapper] and returns a
+        [`ModelSnapshot`][pytekla.snapshot.ModelSnapshot], a pandas DataFrame or a dictionary of columns.
+    max_workers : int, optional
+        The maximum number of processes. By default 1 with [`open_model`][pytekla.batch.open_model],
+        and the number of processors of the machine with any other factory.
+    model_factory : function, optional
+        A picklable function that takes a model path and returns the model. Default is [`open_model`][pytekla.batch.open_model].
+
+    Returns
+    -------
+    tuple of pd.DataFrame
+        The rows extracted from all the models, with a "model" column with the model path, and the
+        timing of each model, with the "model", "seconds", "rows" and "error" columns. The models that
+        failed have no rows and the error message.
+
+    Raises
+    ------
+    ValueError
+        If `max_workers` is greater than 1 with the [`open_model`][pytekla.batch.open_model] factory.
+
+    Examples
+    --------
+    >>> from pytekla.batch import run_batch
+    >>> table, timings = run_batch(
+    ...     ["C:/TeklaModels/A", "C:/TeklaModels/B"],
+    ...     {"types": ["Beam"], "report_properties": {"PROFILE": str, "WEIGHT": float}},
+    ... )
+    >>> table.groupby(["model", "PROFILE"])["WEIGHT"].sum()
+    """
+    model_paths = list(model_paths)
+    if model_factory is open_model:
+        # the workers would share the model open in the running Tekla Structures
+        if max_workers is not None and max_workers > 1:
+            raise ValueError(
+                "open_model opens the models in a single Tekla Structures, use max_workers=1"
+            )
+        max_workers = 1
+    max_workers = max_workers or os.cpu_count() or 1
+    run = functools.partial(_run_model, model_factory, spec)
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, max(len(model_paths), 1))) as executor:
+        results = list(executor.map(run, model_paths))
+
+    frames, timings = [], []
+    for model_path, dataframe, seconds, error in results:
+        if dataframe is not None:
+            frames.append(dataframe.assign(model=model_path))
+        timings.append(
+            {
+                "model": model_path,
+                "seconds": seconds,
+                "rows": 0 if dataframe is None else len(dataframe),
+                "error": error,
+            }
+        )
+
+    table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame({"model": []})
+    table["model"] = table["model"].astype("category")
+    return table, pd.DataFrame(timings, columns=["model", "seconds", "rows", "error"])
+
+
+__all__ = ["open_model", "extract_spec", "run_batch"]
@@ -0,0 +1,216 @@
+import json
+import os
+import time
+from pathlib import Path
+
+from Tekla.Structures.Catalogs import CatalogHandler
+
+from . import session
+
+
+CACHE_FILE_PATH = Path.home() / ".pytekla" / "catalogs.json"
+
+CATALOG_FILES = ("profdb.bin", "matdb.bin", "screwdb.db")
+
+MATERIAL_PROPERTIES = (
+    "ProfileDensity",
+    "PlateDensity",
+    "ModulusOfElasticity",
+    "PoissonsRatio",
+    "ThermalDilatation",
+)
+
+BOLT_PROPERTIES = ("Standard", "Size", "Type")
+
+
+def _plain(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _model_signature(model_path):
+    files = {}
+    for file_name in CATALOG_FILES:
+        path = os.path.join(model_path, file_name)
+        if os.path.exists(path):
+            files[file_name] = os.path.getmtime(path)
+    return {"model_path": model_path, "files": files}
+
+
+class CatalogIndex:
+    """
+    An in-memory index of the profile, material and bolt catalogs.
+
+    The catalogs are enumerated once, and each item is stored in a dictionary by name with its
+    properties, so looking up an item doesn't need any call to Tekla Structures. The index can be
+    cached to a file and reused while the catalogs of the model don't change.
+
+    Attributes
+    ----------
+    profiles : dict
+        The library profiles, with key being the profile name and value being a dictionary with the profile parameters (for example "HEIGHT" or "WEIGHT").
+    materials : dict
+        The materials, with key being the material name and value being a dictionary with its properties.
+    bolts : dict
+        The bolts, with key being "<standard> <size>" and value being a dictionary with its properties.
+
+    Examples
+    --------
+    >>> from pytekla.catalogs import CatalogIndex
+    >>> catalogs = CatalogIndex.load_or_build()
+    >>> catalogs.profiles["HEA200"]["HEIGHT"]
+    190.0
+    """
+
+    def __init__(self, profiles=None, materials=None, bolts=None, signature=None, created=None):
+        self.profiles = profiles or {}
+        self.materials = materials or {}
+        self.bolts = bolts or {}
+        self.signature = signature
+        self.created = created if created is not None else time.time()
+
+    @classmethod
+    def build(cls, catalog_handler=None, signature=None):
+        """
+        Enumerate the catalogs of the running Tekla Structures.
+
+        Parameters
+        ----------
+        catalog_handler : Tekla.Structures.Catalogs.CatalogHandler, optional
+            The catalog handler. By default a new one.
+        signature : dict, optional
+            The signature of the catalogs, stored to check later if the index is stale.
+
+        Returns
+        -------
+        CatalogIndex
+            The index.
+        """
+        catalog_handler = catalog_handler or CatalogHandler()
+
+        profiles = {}
+        for profile in catalog_handler.GetLibraryProfileItems():
+            profiles[profile.ProfileName] = {
+                parameter.Property: _plain(parameter.Value)
+                for parameter in profile.aProfileItemParameters
+            }
+
+        materials = {}
+        for material in catalog_handler.GetMaterialItems():
+            materials[material.MaterialName] = {
+                p: _plain(getattr(material, p, None)) for p in MATERIAL_PROPERTIES
+            }
+
+        bolts = {}
+        for bolt in catalog_handler.GetBoltItems():
+            bolts[f"{bolt.Standard} {bolt.Size}"] = {
+                p: _plain(getattr(bolt, p, None)) for p in BOLT_PROPERTIES
+            }
+
+        return cls(profiles, materials, bolts, signature)
+
+    def save(self, path=CACHE_FILE_PATH):
+        """
+        Save the index to a JSON file.
+
+        Parameters
+        ----------
+        path : str or os.PathLike, optional
+            The path of the file. By default `CACHE_FILE_PATH`.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "created": self.created,
+            "signature": self.signature,
+            "profiles": self.profiles,
+            "materials": self.materials,
+            "bolts": self.bolts,
+        }
+        with path.open("w") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path=CACHE_FILE_PATH):
+        """
+        Load an index saved with [`save`][pytekla.catalogs.CatalogIndex.save].
+
+        Parameters
+        ----------
+        path : str or os.PathLike, optional
+            The path of the file. By default `CACHE_FILE_PATH`.
+
+        Returns
+        -------
+        CatalogIndex
+            The index.
+        """
+        with Path(path).open("r") as f:
+            data = json.load(f)
+        return cls(
+            data["profiles"], data["materials"], data["bolts"], data["signature"], data["created"]
+        )
+
+    def is_stale(self, signature, max_age=None):
+        """
+        Check if the index must be built again.
+
+        Parameters
+        ----------
+        signature : dict
+            The current signature of the catalogs.
+        max_age : float, optional
+            The maximum age of the index in seconds. By default the age is not checked.
+
+        Returns
+        -------
+        bool
+            True if the signature changed or the index is too old.
+        """
+        if self.signature != signature:
+            return True
+        return max_age is not None and time.time() - self.created > max_age
+
+    @classmethod
+    def load_or_build(cls, model=None, path=CACHE_FILE_PATH, max_age=None):
+        """
+        Load the cached index, or build it and cache it if it is missing or stale.
+
+        The index is stale when it was built for another model, when any of the catalog files of the
+        model folder (`CATALOG_FILES`) was modified, or when it is older than `max_age`.
+
+        Parameters
+        ----------
+        model : ModelWrapper, optional
+            The model whose catalogs are indexed. By default the shared model of the [`session`][pytekla.session].
+        path : str or os.PathLike, optional
+            The cache file. By default `CACHE_FILE_PATH`.
+        max_age : float, optional
+            The maximum age of the cached index in seconds. By default the age is not checked.
+
+        Returns
+        -------
+        CatalogIndex
+            The index.
+        """
+        tekla_model = model.unwrap() if model is not None else session.get_model()
+        signature = _model_signature(tekla_model.GetInfo().ModelPath)
+
+        if os.path.exists(path):
+            index = cls.load(path)
+            if not index.is_stale(signature, max_age):
+                return index
+
+        index = cls.build(signature=signature)
+        index.save(path)
+        return index
+
+    def __repr__(self):
+        return (
+            f"<PyTekla> CatalogIndex ({len(self.profiles)} profiles, "
+            f"{len(self.materials)} materials, {len(self.bolts)} bolts)"
+        )
+
+
+__all__ = ["CatalogIndex"]
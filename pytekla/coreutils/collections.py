@@ -5,6 +5,8 @@ from System import Array
 from System.Collections import ArrayList
 from System.Collections.Generic import List
 
+from .names import intern_string
+
 
 def warn_if_set(func):
     """Warns if input iterable is a set.
@@ -53,6 +55,75 @@ def net_idictionary_to_dict(idictionary):
     return {k: v for k, v in zip(idictionary.Keys, idictionary.Values)}
 
 
+def net_idictionaries_to_dict(*idictionaries):
+    """
+    Merge several .NET IDictionary like objects into a single Python dictionary.
+
+    Each dictionary is enumerated only once, reading the key and the value from each entry.
+    Keys are interned. When a key is repeated, the value of the last dictionary is kept.
+
+    Parameters
+    ----------
+    *idictionaries : System.Collections.IDictionary
+        The IDictionary objects to merge. None values are skipped.
+
+    Returns
+    -------
+    dict
+        A dictionary with the key-value pairs of all the IDictionary objects.
+
+    Examples
+    --------
+    >>> net_idictionaries_to_dict(string_dict, int_dict, float_dict)
+    {'property1': 'value1', 'property2': 42, 'property3': 3.14}
+    """
+    result = {}
+    for idictionary in idictionaries:
+        if idictionary is None:
+            continue
+        for entry in idictionary:
+            result[intern_string(entry.Key)] = entry.Value
+    return result
+
+
+PRIMITIVE_TYPES = (str, int, float, bool, type(None))
+
+
+def net_hashtable_to_dict(idictionary, convert=None):
+    """
+    Convert a .NET Hashtable (or any IDictionary like object) to a Python dictionary in a single pass.
+
+    Keys are interned. Primitive values (`str`, `int`, `float`, `bool` and None), which is what the
+    property helpers of Tekla return, are stored as they are; only the other values are passed to `convert`.
+
+    Parameters
+    ----------
+    idictionary : System.Collections.IDictionary
+        The Hashtable object to convert.
+    convert : function, optional
+        A function applied to the values that are not primitive. By default they are stored unchanged.
+
+    Returns
+    -------
+    dict
+        A dictionary with the same key-value pairs as the Hashtable object.
+
+    Examples
+    --------
+    >>> ht = Hashtable()
+    >>> ht["PROFILE"] = "HEA200"
+    >>> net_hashtable_to_dict(ht)
+    {'PROFILE': 'HEA200'}
+    """
+    result = {}
+    for entry in idictionary:
+        value = entry.Value
+        if convert is not None and not isinstance(value, PRIMITIVE_TYPES):
+            value = convert(value)
+        result[intern_string(entry.Key)] = value
+    return result
+
+
 @warn_if_set
 def iterable_to_net_array_list(iterable):
     """
@@ -133,6 +204,8 @@ def iterable_to_net_array(iterable):
 
 __all__ = [
     "net_idictionary_to_dict",
+    "net_idictionaries_to_dict",
+    "net_hashtable_to_dict",
     "iterable_to_net_array_list",
     "iterable_to_net_list",
     "iterable_to_net_array",
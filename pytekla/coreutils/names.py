@@ -1,4 +1,5 @@
 import re
+import sys
 
 
 def is_pascal_case(s):
@@ -48,3 +49,32 @@ def to_pascal_case(snake_str):
         return snake_str
     components = snake_str.split("_")
     return "".join(x.title() for x in components)
+
+
+def intern_string(value):
+    """
+    Intern a string, so all the equal strings share a single object in memory.
+
+    Strings returned by the Tekla API are new Python objects on every call, even when they repeat
+    (profiles, materials, property names...). Interning them keeps only one copy of each.
+
+    Parameters
+    ----------
+    value : object
+        The value to intern. Values that are not strings are returned unchanged.
+
+    Returns
+    -------
+    object
+        The interned string, or the unchanged value.
+
+    Examples
+    --------
+    >>> a = intern_string("".join(["HEA", "200"]))
+    >>> b = intern_string("".join(["HEA", "200"]))
+    >>> a is b
+    True
+    """
+    if type(value) is str:
+        return sys.intern(value)
+    return value
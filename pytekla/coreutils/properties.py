@@ -18,3 +18,34 @@ def check_property_type(property_type):
     """
     if property_type not in (str, int, float):
         raise TypeError("'parameter_type' must be one of these type: [str, int, float]")
+
+
+def split_names_by_type(properties):
+    """
+    Split a dictionary of property names and types into one list of names per type.
+
+    Parameters
+    ----------
+    properties : dict
+        A dictionary with key being the property name and value being the property type.
+
+    Returns
+    -------
+    tuple of list
+        The names of the `str`, `float` and `int` properties, in that order (the order used by `GetAllReportProperties`).
+
+    Raises
+    ------
+    TypeError
+        If any property type is not one of [str, int, float].
+
+    Examples
+    --------
+    >>> split_names_by_type({"PROFILE": str, "LENGTH": float, "PHASE": int})
+    (['PROFILE'], ['LENGTH'], ['PHASE'])
+    """
+    names = {str: [], float: [], int: []}
+    for property_name, property_type in properties.items():
+        check_property_type(property_type)
+        names[property_type].append(property_name)
+    return names[str], names[float], names[int]
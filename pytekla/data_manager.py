@@ -1,4 +1,15 @@
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
 import pandas as pd
+from System import DateTime
+
+from .coreutils.names import intern_string, to_pascal_case
+from .coreutils.properties import check_property_type, split_names_by_type
+from .schema import ExtractionPlan
+from .wrappers import BaseWrapper, wrap
 
 
 def create_model_objects_dataframe(
@@ -7,6 +18,8 @@ def create_model_objects_dataframe(
     user_properties=None,
     attributes=None,
     use_all_user_properties=False,
+    schema=None,
+    categorical=False,
 ):
     """
     Create a pandas DataFrame from objects based on provided properties and attributes.
@@ -23,12 +36,21 @@ def create_model_objects_dataframe(
         A list of object attributes to be extracted from each object. Default is None.
     use_all_user_properties : bool, optional
         A flag indicating if all user properties should be extracted from each object. If set to True, the `user_properties` parameter will be ignored. Default is False.
+    schema : ReportPropertySchema, optional
+        A [`ReportPropertySchema`][pytekla.schema.ReportPropertySchema] with the report property types of each object type. When it is given, `report_properties` can be just a list of names, and each object only reads (with a single call) the properties that apply to its type. Default is None.
+    categorical : bool or list, optional
+        If True, every string value is interned during the extraction and the string columns are converted to pandas categoricals, which greatly reduces the memory used by columns with few distinct values like PROFILE, MATERIAL, NAME or CLASS. A list restricts the conversion to the given columns. Default is False.
 
     Returns
     -------
     pd.DataFrame
         A pandas DataFrame containing the extracted information.
 
+    Raises
+    ------
+    ValueError
+        If `categorical` is a list with columns that are not extracted.
+
     Examples
     --------
     >>> objects = [obj1, obj2, obj3]
@@ -45,7 +67,9 @@ def create_model_objects_dataframe(
     for obj in objects:
         obj_data = {}
 
-        if report_properties:
+        if report_properties and schema is not None:
+            obj_data |= schema.plan_for(obj, report_properties).read(obj)
+        elif report_properties:
             for report_prop_name, report_prop_type in report_properties.items():
                 obj_data[report_prop_name] = obj.get_report_property(
                     report_prop_name, report_prop_type
@@ -70,6 +94,576 @@ def create_model_objects_dataframe(
                         current_obj = current_obj()
                 obj_data[attr] = current_obj
 
+        if categorical:
+            obj_data = {intern_string(k): intern_string(v) for k, v in obj_data.items()}
+
         data.append(obj_data)
 
-    return pd.DataFrame(data)
+    dataframe = pd.DataFrame(data)
+    if categorical:
+        if categorical is not True:
+            # the requested columns are known even if there are no objects
+            known = {
+                *dataframe.columns,
+                *(report_properties or ()),
+                *(user_properties or ()),
+                *(attributes or ()),
+            }
+            unknown = [c for c in categorical if c not in known]
+            if unknown:
+                raise ValueError(f"The categorical columns {unknown} are not extracted")
+        dataframe = _to_categorical(
+            dataframe, dataframe.columns if categorical is True else categorical
+        )
+    return dataframe
+
+
+def _to_categorical(dataframe, columns):
+    for column in columns:
+        if column not in dataframe:
+            continue
+        if pd.api.types.infer_dtype(dataframe[column], skipna=True) == "string":
+            dataframe[column] = dataframe[column].astype("category")
+    return dataframe
+
+
+def _to_python_value(value):
+    if isinstance(value, DateTime):
+        return datetime(
+            value.Year, value.Month, value.Day, value.Hour, value.Minute, value.Second
+        )
+    return value
+
+
+def _read_attribute_path(tekla_object, path):
+    current_obj = tekla_object
+    for at in path:
+        current_obj = getattr(current_obj, at, None)
+        if callable(current_obj):
+            current_obj = current_obj()
+    return _to_python_value(current_obj)
+
+
+def iter_drawings_records(
+    drawings, attributes=None, user_properties=None, use_all_user_properties=False
+):
+    """
+    Generate one dictionary with the requested data of each drawing.
+
+    Attributes are read directly from the Tekla objects (each attribute name is converted to
+    PascalCase only once), and the user properties are read with one call for each of the requested
+    types instead of one call for each property.
+
+    Parameters
+    ----------
+    drawings : iterable of DrawingDbObjectWrapper or Tekla.Structures.Drawing.Drawing
+        The drawings to read.
+    attributes : list, optional
+        A list of drawing attributes to be extracted from each drawing (for example "name", "mark" or "title1"). Nested attributes are separated with a dot. Default is None.
+    user_properties : dict, optional
+        A dictionary of user properties to be extracted from each drawing, with key being the user property name and value being the user property type. Default is None.
+    use_all_user_properties : bool, optional
+        A flag indicating if all user properties should be extracted from each drawing. If set to True, the `user_properties` parameter will be ignored. Default is False.
+
+    Returns
+    -------
+    generator
+        A generator of dictionaries, with keys being the attribute and property names.
+
+    Raises
+    ------
+    TypeError
+        If any user property type is not `str`, `int`, or `float`.
+    """
+    attribute_paths = [
+        (attr, [to_pascal_case(at) for at in attr.split(".")])
+        for attr in attributes or []
+    ]
+
+    property_types = None
+    if user_properties and not use_all_user_properties:
+        str_names, float_names, int_names = split_names_by_type(user_properties)
+        property_types = [
+            t for t, names in ((str, str_names), (float, float_names), (int, int_names)) if names
+        ]
+
+    for drawing in drawings:
+        if not isinstance(drawing, BaseWrapper):
+            drawing = wrap(drawing, detect_types=False)
+        to = drawing.unwrap()
+
+        record = {attr: _read_attribute_path(to, path) for attr, path in attribute_paths}
+
+        if use_all_user_properties:
+            record |= drawing.get_all_user_properties()
+        elif property_types:
+            found = drawing.get_all_user_properties(property_types)
+            for user_prop_name in user_properties:
+                record[user_prop_name] = found.get(user_prop_name)
+
+        yield record
+
+
+def create_drawings_dataframe(
+    drawings, attributes=None, user_properties=None, use_all_user_properties=False
+):
+    """
+    Create a pandas DataFrame from drawings based on provided attributes and user properties.
+
+    Parameters
+    ----------
+    drawings : iterable of DrawingDbObjectWrapper
+        The drawings to be transformed into a DataFrame, for example the ones returned by [`DrawingHandlerWrapper.get_drawings`][pytekla.wrappers.DrawingHandlerWrapper.get_drawings].
+    attributes : list, optional
+        A list of drawing attributes to be extracted from each drawing. Default is None.
+    user_properties : dict, optional
+        A dictionary of user properties to be extracted from each drawing, with key being the user property name and value being the user property type. Default is None.
+    use_all_user_properties : bool, optional
+        A flag indicating if all user properties should be extracted from each drawing. If set to True, the `user_properties` parameter will be ignored. Default is False.
+
+    Returns
+    -------
+    pd.DataFrame
+        A pandas DataFrame containing the extracted information.
+
+    Examples
+    --------
+    >>> from pytekla import DrawingHandlerWrapper
+    >>> drawing_handler = DrawingHandlerWrapper()
+    >>> create_drawings_dataframe(
+    ...     drawing_handler.get_drawings(),
+    ...     attributes=["mark", "name", "title1", "modification_date"],
+    ...     user_properties={"DR_REVIEWED_BY": str},
+    ... )
+              mark        name  title1    modification_date DR_REVIEWED_BY
+        0  [A.1]  COLUMN C1  LEVEL 1  2023-03-01 10:20:00            JDO
+        1  [A.2]    BEAM B1  LEVEL 2  2023-03-02 15:45:10           None
+    """
+    return pd.DataFrame(
+        iter_drawings_records(drawings, attributes, user_properties, use_all_user_properties)
+    )
+
+
+def iter_drawings_dataframes(
+    drawings,
+    chunk_size=1000,
+    attributes=None,
+    user_properties=None,
+    use_all_user_properties=False,
+):
+    """
+    Generate pandas DataFrames with the data of consecutive chunks of drawings.
+
+    It takes the same parameters as [`create_drawings_dataframe`][pytekla.data_manager.create_drawings_dataframe], plus `chunk_size`, and allows processing large projects without keeping all the rows in memory.
+
+    Parameters
+    ----------
+    drawings : iterable of DrawingDbObjectWrapper
+        The drawings to be transformed into DataFrames.
+    chunk_size : int, optional
+        The maximum number of drawings in each DataFrame. Default is 1000.
+
+    Returns
+    -------
+    generator
+        A generator of pandas DataFrames.
+
+    Examples
+    --------
+    >>> for chunk in iter_drawings_dataframes(drawing_handler.get_drawings(), 500, attributes=["mark"]):
+    >>>     chunk.to_csv("drawings.csv", mode="a")
+    """
+    records = iter_drawings_records(
+        drawings, attributes, user_properties, use_all_user_properties
+    )
+    while chunk := list(itertools.islice(records, chunk_size)):
+        yield pd.DataFrame(chunk)
+
+
+def aggregate_quantities(objects, by, quantities=("WEIGHT",)):
+    """
+    Sum quantities of objects grouped by some of their report properties, without keeping the objects data in memory.
+
+    The objects are consumed one by one, reading all the needed report properties with a single call
+    per object, and only the running sums and counts of each group are kept.
+
+    Parameters
+    ----------
+    objects : iterable of ModelObjectWrapper
+        The objects to aggregate, for example the generator returned by [`ModelWrapper.get_all_objects`][pytekla.wrappers.ModelWrapper.get_all_objects].
+    by : list or dict
+        The report properties to group by. A list of names is read as `str` properties; a dictionary maps each name to its type.
+    quantities : list or dict, optional
+        The report properties to sum. A list of names is read as `float` properties; a dictionary maps each name to its type. Default is ("WEIGHT",).
+
+    Returns
+    -------
+    pd.DataFrame
+        A DataFrame indexed by the `by` properties, with one column with the sum of each quantity and a "count" column with the number of objects of each group.
+
+    Raises
+    ------
+    TypeError
+        If any property type is not `str`, `int`, or `float`.
+
+    Examples
+    --------
+    >>> model = ModelWrapper()
+    >>> aggregate_quantities(
+    ...     model.get_objects_with_types(["Beam", "ContourPlate"]),
+    ...     by={"PHASE": int, "PROFILE": str, "MATERIAL": str},
+    ...     quantities=["WEIGHT", "VOLUME", "AREA"],
+    ... )
+                                  WEIGHT      VOLUME       AREA  count
+        PHASE PROFILE  MATERIAL
+        1     HEA200   S355      1270.54  1.6185e+08  2.356e+07     8
+        2     IPE300   S355       845.10  1.0765e+08  1.479e+07     3
+    """
+    group_properties = by if isinstance(by, dict) else dict.fromkeys(by, str)
+    quantity_properties = (
+        quantities if isinstance(quantities, dict) else dict.fromkeys(quantities, float)
+    )
+    group_names = list(group_properties)
+    quantity_names = list(quantity_properties)
+    plan = ExtractionPlan(
+        group_names + quantity_names, group_properties | quantity_properties
+    )
+
+    totals = {}
+    for obj in objects:
+        values = plan.read(obj)
+        key = tuple(values[name] for name in group_names)
+        accumulator = totals.get(key)
+        if accumulator is None:
+            accumulator = totals[key] = [0] * (len(quantity_names) + 1)
+        for i, name in enumerate(quantity_names):
+            value = values[name]
+            if value is not None:
+                accumulator[i] += value
+        accumulator[-1] += 1
+
+    dataframe = pd.DataFrame(
+        [(*key, *accumulator) for key, accumulator in totals.items()],
+        columns=[*group_names, *quantity_names, "count"],
+    )
+    return dataframe.set_index(group_names).sort_index()
+
+
+def join_catalog_properties(
+    dataframe,
+    catalogs,
+    profile_column="PROFILE",
+    profile_properties=None,
+    material_column=None,
+    material_properties=None,
+):
+    """
+    Add catalog properties of the profile and material of each row to a DataFrame.
+
+    The properties are looked up in a [`CatalogIndex`][pytekla.catalogs.CatalogIndex], so no call to
+    Tekla Structures is made.
+
+    Parameters
+    ----------
+    dataframe : pd.DataFrame
+        The DataFrame, for example created with [`create_model_objects_dataframe`][pytekla.data_manager.create_model_objects_dataframe].
+    catalogs : CatalogIndex
+        The catalog index.
+    profile_column : str, optional
+        The column with the profile names. Default is "PROFILE". None to skip profiles.
+    profile_properties : list, optional
+        The profile parameters to add, for example ["HEIGHT", "WEIGHT"]. By default all of them.
+    material_column : str, optional
+        The column with the material names. Default is None (materials are skipped).
+    material_properties : list, optional
+        The material properties to add. By default all of them.
+
+    Returns
+    -------
+    pd.DataFrame
+        A new DataFrame with one more column per property, prefixed with the name of its column (for
+        example "PROFILE.HEIGHT"). The values are NaN for the profiles or materials that are not in the
+        catalog, like parametric profiles.
+
+    Examples
+    --------
+    >>> from pytekla.catalogs import CatalogIndex
+    >>> model = ModelWrapper()
+    >>> df = create_model_objects_dataframe(model.get_all_objects(), report_properties={"PROFILE": str})
+    >>> df = join_catalog_properties(df, CatalogIndex.load_or_build(model), profile_properties=["WEIGHT"])
+    """
+    dataframe = dataframe.copy()
+    for column, items, properties in (
+        (profile_column, catalogs.profiles, profile_properties),
+        (material_column, catalogs.materials, material_properties),
+    ):
+        if column is None:
+            continue
+        table = pd.DataFrame.from_dict(items, orient="index")
+        if properties is not None:
+            table = table.reindex(columns=properties)
+        keys = dataframe[column].astype(object)
+        for name in table.columns:
+            dataframe[f"{column}.{name}"] = keys.map(table[name]).to_numpy()
+    return dataframe
+
+
+def _read_columns(objects, specs):
+    report_properties = {n: arg for n, (kind, arg) in specs.items() if kind == "report"}
+    plan = ExtractionPlan(report_properties, report_properties)
+    others = [(n, kind, arg) for n, (kind, arg) in specs.items() if kind != "report"]
+
+    columns = {name: [] for name in specs}
+    for to in objects:
+        if report_properties:
+            for name, value in plan.read(to).items():
+                columns[name].append(value)
+        for name, kind, arg in others:
+            if kind == "user":
+                was_found, value = to.GetUserProperty(name, arg())
+                columns[name].append(value if was_found else None)
+            else:
+                columns[name].append(wrap(_read_attribute_path(to, arg), detect_types=False))
+    return columns
+
+
+class LazyFrame:
+    """
+    A table of model objects whose columns are read from Tekla Structures only when they are first used.
+
+    Creating the frame only records the objects and the column specifications. When a column is
+    accessed, it is read for all the rows at once (all the report properties requested together are
+    read with a single call per object), optionally splitting the rows between several threads, and
+    then cached.
+
+    Use [`create_lazy_dataframe`][pytekla.data_manager.create_lazy_dataframe] to create it.
+
+    Examples
+    --------
+    >>> frame = create_lazy_dataframe(objects, report_properties={"PROFILE": str, "WEIGHT": float, "LENGTH": float})
+    >>> frame["WEIGHT"].sum()  # only WEIGHT is read
+    >>> frame.to_pandas(["PROFILE", "WEIGHT"])
+    """
+
+    def __init__(self, objects, specs, max_workers=None, chunk_size=1000):
+        """
+        Create a lazy frame.
+
+        Parameters
+        ----------
+        objects : iterable of ModelObjectWrapper
+            The rows of the frame.
+        specs : dict
+            The column specifications, with key being the column name and value being a tuple with the
+            kind of column ("report", "user" or "attribute") and the property type (or the attribute path).
+        max_workers : int, optional
+            The number of threads used to read a column. By default the columns are read in the calling thread.
+        chunk_size : int, optional
+            The number of rows read by each thread task. Default is 1000.
+        """
+        self._objects = [o.unwrap() if isinstance(o, BaseWrapper) else o for o in objects]
+        self.ids = np.array([o.Identifier.ID for o in self._objects], dtype=np.int64)
+        self._specs = dict(specs)
+        self._cache = {}
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+
+    @property
+    def columns(self):
+        """The names of all the columns, materialized or not."""
+        return list(self._specs)
+
+    @property
+    def materialized_columns(self):
+        """The names of the columns that have already been read."""
+        return list(self._cache)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __getitem__(self, name):
+        """
+        Get a column, reading it if needed.
+
+        Parameters
+        ----------
+        name : str
+            The column name.
+
+        Returns
+        -------
+        pd.Series
+            The column values, indexed by object identifier.
+
+        Raises
+        ------
+        KeyError
+            If there is no column with that name.
+        """
+        self.materialize(name)
+        return self._cache[name]
+
+    def materialize(self, *names):
+        """
+        Read some columns (all of them by default) that are not cached yet.
+
+        Parameters
+        ----------
+        names : str
+            The column names.
+
+        Raises
+        ------
+        KeyError
+            If any name is not a column of the frame.
+        """
+        names = names or self.columns
+        for name in names:
+            if name not in self._specs:
+                raise KeyError(name)
+        specs = {n: self._specs[n] for n in names if n not in self._cache}
+        if not specs:
+            return
+
+        chunks = [
+            self._objects[i : i + self.chunk_size]
+            for i in range(0, len(self._objects), self.chunk_size)
+        ]
+        if self.max_workers and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(lambda c: _read_columns(c, specs), chunks))
+        else:
+            results = [_read_columns(c, specs) for c in chunks]
+
+        index = pd.Index(self.ids, name="id")
+        for name in specs:
+            values = list(itertools.chain.from_iterable(r[name] for r in results))
+            self._cache[name] = pd.Series(values, index=index, name=name, dtype=object).infer_objects()
+
+    def invalidate(self, ids):
+        """
+        Read again the materialized columns of the rows of some objects, for example after they were modified.
+
+        This makes the frame an invalidator that can be registered in a [`ChangeLog`][pytekla.events.ChangeLog].
+
+        Parameters
+        ----------
+        ids : array-like of int or None
+            The identifiers of the changed objects. Identifiers that are not rows of the frame are
+            ignored, and the rows of the objects that were deleted from the model are removed. None
+            drops every materialized column.
+
+        Notes
+        -----
+        The columns keep their type: missing numbers are stored as NaN (integer columns become float
+        columns then), and only the other columns store None.
+        """
+        if ids is None:
+            self.invalidate_all()
+            return
+        changed = np.isin(self.ids, np.asarray(ids, dtype=np.int64))
+        if not changed.any():
+            return
+
+        deleted = np.zeros(len(self.ids), dtype=bool)
+        deleted[changed] = [not self._objects[i].Select() for i in np.flatnonzero(changed)]
+        if deleted.any():
+            kept = ~deleted
+            self._objects = [o for o, k in zip(self._objects, kept) if k]
+            self.ids = self.ids[kept]
+            self._cache = {n: c[kept] for n, c in self._cache.items()}
+            changed = changed[kept]
+
+        rows = np.flatnonzero(changed)
+        if not len(rows) or not self._cache:
+            return
+        objects = [self._objects[i] for i in rows]
+        values = _read_columns(objects, {n: self._specs[n] for n in self._cache})
+        for name, column in self._cache.items():
+            new_values = values[name]
+            if any(v is None for v in new_values):
+                if column.dtype.kind in "iuf":
+                    if column.dtype.kind != "f":
+                        column = self._cache[name] = column.astype(np.float64)
+                    new_values = [np.nan if v is None else v for v in new_values]
+                elif column.dtype != object:
+                    column = self._cache[name] = column.astype(object)
+            column.iloc[rows] = new_values
+
+    def invalidate_all(self):
+        """Drop every materialized column, so they are read again when used."""
+        self._cache.clear()
+
+    def to_pandas(self, columns=None):
+        """
+        Convert the frame to a regular pandas DataFrame, reading the missing columns.
+
+        Parameters
+        ----------
+        columns : list of str, optional
+            The columns to include. By default all of them.
+
+        Returns
+        -------
+        pd.DataFrame
+            The DataFrame, indexed by object identifier.
+        """
+        columns = list(columns or self.columns)
+        self.materialize(*columns)
+        return pd.DataFrame(
+            {name: self._cache[name] for name in columns}, index=pd.Index(self.ids, name="id")
+        )
+
+    def __repr__(self):
+        return f"<PyTekla> LazyFrame ({len(self)} rows, {len(self._cache)}/{len(self._specs)} columns materialized)"
+
+
+def create_lazy_dataframe(
+    objects,
+    report_properties=None,
+    user_properties=None,
+    attributes=None,
+    max_workers=None,
+):
+    """
+    Create a [`LazyFrame`][pytekla.data_manager.LazyFrame] from objects based on provided properties and attributes.
+
+    It takes the same column parameters as [`create_model_objects_dataframe`][pytekla.data_manager.create_model_objects_dataframe], but no property is read until the column is used.
+
+    Parameters
+    ----------
+    objects : iterable of ModelObjectWrapper
+        A iterable of objects to be transformed into a LazyFrame.
+    report_properties : dict, optional
+        A dictionary of report properties, with key being the report property name and value being the report property type. Default is None.
+    user_properties : dict, optional
+        A dictionary of user properties, with key being the user property name and value being the user property type. Default is None.
+    attributes : list, optional
+        A list of object attributes. Nested attributes are separated with a dot. Default is None.
+    max_workers : int, optional
+        The number of threads used to read each column. Default is None (no threads).
+
+    Returns
+    -------
+    LazyFrame
+        The lazy frame.
+
+    Raises
+    ------
+    TypeError
+        If any property type is not `str`, `int`, or `float`.
+
+    Examples
+    --------
+    >>> model = ModelWrapper()
+    >>> frame = create_lazy_dataframe(model.get_all_objects(), report_properties={"PROFILE": str, "WEIGHT": float})
+    >>> frame["WEIGHT"].sum()
+    """
+    specs = {}
+    for kind, properties in (("report", report_properties), ("user", user_properties)):
+        for name, property_type in (properties or {}).items():
+            check_property_type(property_type)
+            specs[name] = (kind, property_type)
+    for attr in attributes or []:
+        specs[attr] = ("attribute", [to_pascal_case(at) for at in attr.split(".")])
+    return LazyFrame(objects, specs, max_workers)
@@ -0,0 +1,175 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from Tekla.Structures.Drawing import View
+
+from . import session
+from .wrappers import BaseWrapper
+
+
+# Attributes tried, in order, to get the position of a drawing object
+POSITION_ATTRIBUTES = ("InsertionPoint", "Origin", "StartPoint", "CenterPoint")
+
+# Attribute with the model object of the drawing objects that represent one
+MODEL_IDENTIFIER_ATTRIBUTE = "ModelIdentifier"
+
+# Position attribute found for each CLR type, None if it has none
+_position_attributes = {}
+
+
+def _unwrap(obj):
+    return obj.unwrap() if isinstance(obj, BaseWrapper) else obj
+
+
+def _identifier(obj):
+    try:
+        return obj.GetIdentifier().ID
+    except AttributeError:
+        return 0
+
+
+def _position(obj, type_name):
+    try:
+        attr = _position_attributes[type_name]
+    except KeyError:
+        attr = _position_attributes[type_name] = next(
+            (a for a in POSITION_ATTRIBUTES if hasattr(obj, a)), None
+        )
+    if attr is None:
+        return np.nan, np.nan
+    point = getattr(obj, attr)
+    return point.X, point.Y
+
+
+def _read_container(container, skip_views):
+    """Read the direct children of a sheet or a view into a list of rows."""
+    rows = []
+    for obj in container.GetObjects():
+        if skip_views and isinstance(obj, View):
+            continue
+        type_name = obj.GetType().Name
+        x, y = _position(obj, type_name)
+        model_identifier = getattr(obj, MODEL_IDENTIFIER_ATTRIBUTE, None)
+        rows.append(
+            (
+                _identifier(obj),
+                type_name,
+                x,
+                y,
+                model_identifier.ID if model_identifier is not None else 0,
+            )
+        )
+    return rows
+
+
+def _table(columns, rows, dtypes):
+    data = list(zip(*rows)) if rows else [[] for _ in columns]
+    return pd.DataFrame(
+        {
+            name: pd.Categorical(values) if dtype == "category" else np.array(values, dtype=dtype)
+            for name, values, dtype in zip(columns, data, dtypes)
+        }
+    )
+
+
+def extract_drawing_contents(drawings, drawing_handler=None, max_workers=None):
+    """
+    Read the views and objects of many drawings into tables in a single pass.
+
+    Each drawing is opened in the background, its sheet and views are read without wrapping any
+    object, and it is closed again. As Tekla Structures has only one active drawing at a time, the
+    drawings are read one after the other; with `max_workers`, the views of each drawing are read
+    by a pool of threads.
+
+    Parameters
+    ----------
+    drawings : iterable of DrawingDbObjectWrapper or Tekla.Structures.Drawing.Drawing
+        The drawings, for example returned by [`DrawingHandlerWrapper.get_drawings`][pytekla.wrappers.DrawingHandlerWrapper.get_drawings].
+    drawing_handler : DrawingHandlerWrapper, optional
+        The drawing handler. By default the one shared by the process (see [`session`][pytekla.session]).
+    max_workers : int, optional
+        The number of threads used to read the views of each drawing. By default the views are read in the calling thread.
+
+    Returns
+    -------
+    dict of pd.DataFrame
+        Three tables:
+
+        - "drawings": the "drawing" number (position in `drawings`), "mark", "name" and "type".
+        - "views": the "drawing", the "view" number (from 1 in each drawing), "id", "type", the origin
+          "x" and "y", and the "scale".
+        - "objects": the "drawing", the "view" (0 for the objects placed directly on the sheet), "id",
+          "type", the "x" and "y" of the insertion point (NaN if it has none), and the "model_id" of the
+          model object it represents (0 if it doesn't represent one).
+
+    Examples
+    --------
+    >>> from pytekla import DrawingHandlerWrapper
+    >>> from pytekla.drawings import extract_drawing_contents
+    >>> tables = extract_drawing_contents(DrawingHandlerWrapper().get_drawings(), max_workers=4)
+    >>> tables["objects"].groupby(["drawing", "type"], observed=True).size()
+    """
+    handler = (
+        _unwrap(drawing_handler) if drawing_handler is not None else session.get_drawing_handler()
+    )
+    executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers else None
+    drawing_rows, view_rows, object_rows = [], [], []
+
+    try:
+        for d, drawing in enumerate(drawings):
+            to = _unwrap(drawing)
+            drawing_rows.append((d, to.Mark, to.Name, to.GetType().Name))
+
+            if not handler.SetActiveDrawing(to, False):
+                continue
+            try:
+                sheet = to.GetSheet()
+                views = list(sheet.GetAllViews())
+                for v, view in enumerate(views, start=1):
+                    origin = view.Origin
+                    view_rows.append(
+                        (
+                            d,
+                            v,
+                            _identifier(view),
+                            view.GetType().Name,
+                            origin.X,
+                            origin.Y,
+                            view.Attributes.Scale,
+                        )
+                    )
+
+                containers = [(sheet, True)] + [(view, False) for view in views]
+                if executor is not None:
+                    results = executor.map(lambda c: _read_container(*c), containers)
+                else:
+                    results = (_read_container(*c) for c in containers)
+                for v, rows in enumerate(results):
+                    object_rows.extend((d, v, *row) for row in rows)
+            finally:
+                handler.CloseActiveDrawing(False)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return {
+        "drawings": _table(
+            ["drawing", "mark", "name", "type"],
+            drawing_rows,
+            [np.int64, object, object, "category"],
+        ),
+        "views": _table(
+            ["drawing", "view", "id", "type", "x", "y", "scale"],
+            view_rows,
+            [np.int64, np.int64, np.int64, "category", np.float64, np.float64, np.float64],
+        ),
+        "objects": _table(
+            ["drawing", "view", "id", "type", "x", "y", "model_id"],
+            object_rows,
+            [np.int64, np.int64, np.int64, "category", np.float64, np.float64, np.int64],
+        ),
+    }
+
+
+__all__ = ["extract_drawing_contents"]
@@ -0,0 +1,300 @@
+import threading
+
+import numpy as np
+from Tekla.Structures.Model import Events
+
+
+INSERTED = "inserted"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+CHANGE_KINDS = (INSERTED, MODIFIED, DELETED)
+
+# Names of the Tekla.Structures.Model.ChangeData.ChangeTypeEnum values by kind of change
+_CHANGE_TYPES = {
+    "OBJECT_INSERT": INSERTED,
+    "OBJECT_MODIFY": MODIFIED,
+    "OBJECT_DELETE": DELETED,
+}
+
+
+class ChangeLog:
+    """
+    A thread-safe log of the identifiers of the model objects that were inserted, modified or deleted.
+
+    Model events are received in a thread of their own, so the changes are only recorded when they
+    arrive, and the registered invalidators are notified when [`flush`][pytekla.events.ChangeLog.flush]
+    is called from the thread that owns the caches.
+
+    An invalidator is any object with an `invalidate(ids)` method, which receives a NumPy array with the
+    identifiers of the changed (inserted, modified or deleted) objects and must drop only the entries
+    of those objects. It can also have an `invalidate_all()` method, called when the whole model
+    changed (for example, when another model is opened); otherwise `invalidate` is called with None.
+
+    Examples
+    --------
+    >>> from pytekla.events import ChangeLog, ModelEventListener
+    >>> log = ChangeLog()
+    >>> log.register(lazy_frame)
+    >>> with ModelEventListener(log):
+    ...     ...  # the user edits the model
+    ...     log.flush()  # lazy_frame reads again only the edited rows
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._changes = {kind: set() for kind in CHANGE_KINDS}
+        self._reset = False
+        self._invalidators = []
+        self.version = 0
+
+    def record(self, ids, kind=MODIFIED):
+        """
+        Record changed objects.
+
+        Parameters
+        ----------
+        ids : iterable of int
+            The identifiers of the objects.
+        kind : str, optional
+            The kind of change, one of `CHANGE_KINDS`. Default is "modified".
+
+        Raises
+        ------
+        ValueError
+            If the kind of change is not valid.
+        """
+        if kind not in CHANGE_KINDS:
+            raise ValueError(f"The kind of change must be one of {CHANGE_KINDS}, not {kind!r}.")
+        with self._lock:
+            self._changes[kind].update(int(i) for i in ids)
+            self.version += 1
+
+    def record_reset(self):
+        """Record that the whole model changed, so every cached entry must be dropped."""
+        with self._lock:
+            self._reset = True
+            self.version += 1
+
+    def __len__(self):
+        with self._lock:
+            return len(set().union(*self._changes.values()))
+
+    def drain(self):
+        """
+        Get the recorded changes and clear the log.
+
+        Returns
+        -------
+        tuple
+            A dictionary with key being the kind of change and value being a sorted NumPy array
+            of identifiers, and a bool that is True if the whole model changed.
+        """
+        with self._lock:
+            changes = {
+                kind: np.array(sorted(ids), dtype=np.int64) for kind, ids in self._changes.items()
+            }
+            reset = self._reset
+            for ids in self._changes.values():
+                ids.clear()
+            self._reset = False
+        return changes, reset
+
+    def register(self, invalidator):
+        """
+        Register an object to be notified of the changes on [`flush`][pytekla.events.ChangeLog.flush].
+
+        Parameters
+        ----------
+        invalidator : object
+            An object with an `invalidate(ids)` method.
+
+        Raises
+        ------
+        TypeError
+            If the object has no `invalidate` method.
+        """
+        if not callable(getattr(invalidator, "invalidate", None)):
+            raise TypeError("The invalidator must have an 'invalidate(ids)' method.")
+        with self._lock:
+            if invalidator not in self._invalidators:
+                self._invalidators.append(invalidator)
+
+    def unregister(self, invalidator):
+        """
+        Stop notifying an object.
+
+        Parameters
+        ----------
+        invalidator : object
+            A registered invalidator.
+        """
+        with self._lock:
+            if invalidator in self._invalidators:
+                self._invalidators.remove(invalidator)
+
+    def flush(self):
+        """
+        Notify the recorded changes to the registered invalidators and clear the log.
+
+        Returns
+        -------
+        numpy.ndarray or None
+            The sorted identifiers of all the changed objects, or None if the whole model changed.
+        """
+        changes, reset = self.drain()
+        with self._lock:
+            invalidators = list(self._invalidators)
+
+        if reset:
+            for invalidator in invalidators:
+                invalidate_all = getattr(invalidator, "invalidate_all", None)
+                if callable(invalidate_all):
+                    invalidate_all()
+                else:
+                    invalidator.invalidate(None)
+            return None
+
+        ids = np.unique(np.concatenate(list(changes.values())))
+        if len(ids):
+            for invalidator in invalidators:
+                invalidator.invalidate(ids)
+        return ids
+
+    def __repr__(self):
+        return f"<PyTekla> ChangeLog ({len(self)} changed objects, {len(self._invalidators)} invalidators)"
+
+
+class _EventHook:
+    def __init__(self):
+        self.handlers = []
+
+    def __iadd__(self, handler):
+        self.handlers.append(handler)
+        return self
+
+    def __isub__(self, handler):
+        self.handlers.remove(handler)
+        return self
+
+    def __call__(self, *args):
+        for handler in list(self.handlers):
+            handler(*args)
+
+
+class ManualEvents:
+    """
+    A stand-in for `Tekla.Structures.Model.Events` that raises the events when asked, to test the code that listens to model changes without Tekla Structures.
+
+    Examples
+    --------
+    >>> events = ManualEvents()
+    >>> with ModelEventListener(log, events):
+    ...     events.emit_changes([(1234, "modified"), (5678, "deleted")])
+    """
+
+    def __init__(self):
+        self.ModelObjectChanged = _EventHook()
+        self.ModelLoad = _EventHook()
+        self.registered = False
+
+    def Register(self):
+        self.registered = True
+
+    def UnRegister(self):
+        self.registered = False
+
+    def emit_changes(self, changes):
+        """
+        Raise a ModelObjectChanged event.
+
+        Parameters
+        ----------
+        changes : iterable of tuple
+            The identifier and kind of change (one of `CHANGE_KINDS`) of each changed object.
+        """
+        types = {kind: name for name, kind in _CHANGE_TYPES.items()}
+        self.ModelObjectChanged([_ManualChange(i, types[kind]) for i, kind in changes])
+
+    def emit_model_load(self):
+        """Raise a ModelLoad event."""
+        self.ModelLoad()
+
+
+class _ManualIdentifier:
+    def __init__(self, id_):
+        self.ID = id_
+
+
+class _ManualObject:
+    def __init__(self, id_):
+        self.Identifier = _ManualIdentifier(id_)
+
+
+class _ManualChange:
+    def __init__(self, id_, change_type):
+        self.Object = _ManualObject(id_)
+        self.Type = change_type
+
+
+class ModelEventListener:
+    """
+    Record the changes of the model objects in a [`ChangeLog`][pytekla.events.ChangeLog] while it is started.
+
+    It can be used as a context manager, which starts and stops it.
+
+    Parameters
+    ----------
+    change_log : ChangeLog
+        The log where the changes are recorded.
+    events : Tekla.Structures.Model.Events, optional
+        The event source. By default a new `Events`; a [`ManualEvents`][pytekla.events.ManualEvents] can be used for tests.
+    """
+
+    def __init__(self, change_log, events=None):
+        self.change_log = change_log
+        self.events = events if events is not None else Events()
+        self.started = False
+        # The same handler objects are needed to unsubscribe
+        self._object_changed_handler = self._on_model_object_changed
+        self._model_load_handler = self._on_model_load
+
+    def _on_model_object_changed(self, changes):
+        by_kind = {}
+        for change in changes:
+            kind = _CHANGE_TYPES.get(str(change.Type))
+            if kind is not None and change.Object is not None:
+                by_kind.setdefault(kind, []).append(change.Object.Identifier.ID)
+        for kind, ids in by_kind.items():
+            self.change_log.record(ids, kind)
+
+    def _on_model_load(self, *args):
+        self.change_log.record_reset()
+
+    def start(self):
+        """Subscribe to the model events."""
+        if self.started:
+            return
+        self.events.ModelObjectChanged += self._object_changed_handler
+        self.events.ModelLoad += self._model_load_handler
+        self.events.Register()
+        self.started = True
+
+    def stop(self):
+        """Unsubscribe from the model events."""
+        if not self.started:
+            return
+        self.events.UnRegister()
+        self.events.ModelObjectChanged -= self._object_changed_handler
+        self.events.ModelLoad -= self._model_load_handler
+        self.started = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+__all__ = ["ChangeLog", "ManualEvents", "ModelEventListener"]
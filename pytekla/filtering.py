@@ -0,0 +1,344 @@
+import functools
+import itertools
+import operator
+
+import numpy as np
+from System.Collections import Hashtable
+from Tekla.Structures.Filtering import (
+    BinaryFilterExpression,
+    BinaryFilterExpressionCollection,
+    BinaryFilterExpressionItem,
+    BinaryFilterOperatorType,
+    NumericConstantFilterExpression,
+    NumericOperatorType,
+    StringConstantFilterExpression,
+    StringOperatorType,
+)
+from Tekla.Structures.Filtering.Categories import (
+    ObjectFilterExpressions,
+    PartFilterExpressions,
+    TemplateFilterExpressions,
+)
+
+from .coreutils.collections import iterable_to_net_array_list
+from .coreutils.properties import split_names_by_type
+from .query import F, Field, _Comparison, _IsIn, _Not, _Operation, _StringMethod
+
+
+STRING_CATEGORIES = {
+    "profile": PartFilterExpressions.Profile,
+    "material": PartFilterExpressions.Material,
+    "name": PartFilterExpressions.Name,
+    "class": PartFilterExpressions.Class,
+    "finish": PartFilterExpressions.Finish,
+    "guid": ObjectFilterExpressions.Guid,
+}
+
+NUMERIC_CATEGORIES = {
+    "phase": ObjectFilterExpressions.Phase,
+    "id": ObjectFilterExpressions.IdNumber,
+}
+
+STRING_OPERATORS = {
+    "==": StringOperatorType.IS_EQUAL,
+    "!=": StringOperatorType.IS_NOT_EQUAL,
+    "startswith": StringOperatorType.STARTS_WITH,
+    "not startswith": StringOperatorType.NOT_STARTS_WITH,
+    "endswith": StringOperatorType.ENDS_WITH,
+    "not endswith": StringOperatorType.NOT_ENDS_WITH,
+    "contains": StringOperatorType.CONTAINS,
+    "not contains": StringOperatorType.NOT_CONTAINS,
+}
+
+NUMERIC_OPERATORS = {
+    "==": NumericOperatorType.IS_EQUAL,
+    "!=": NumericOperatorType.IS_NOT_EQUAL,
+    "<": NumericOperatorType.SMALLER_THAN,
+    "<=": NumericOperatorType.SMALLER_OR_EQUAL,
+    ">": NumericOperatorType.GREATER_THAN,
+    ">=": NumericOperatorType.GREATER_OR_EQUAL,
+}
+
+_NEGATED_OPERATORS = {
+    "==": "!=",
+    "!=": "==",
+    "<": ">=",
+    ">=": "<",
+    ">": "<=",
+    "<=": ">",
+    "startswith": "not startswith",
+    "endswith": "not endswith",
+    "contains": "not contains",
+}
+
+
+class _NotSupported(Exception):
+    pass
+
+
+def _normalize_name(name):
+    return name.rstrip("_").lower()
+
+
+def report_property_name(field_name):
+    """
+    Get the report property used to read a field locally.
+
+    Parameters
+    ----------
+    field_name : str
+        The field name. Case is ignored and trailing underscores are removed (so `F.class_` can be used for the class).
+
+    Returns
+    -------
+    str
+        The report property name.
+
+    Examples
+    --------
+    >>> report_property_name("class_")
+    'CLASS'
+    """
+    return _normalize_name(field_name).upper()
+
+
+def _collection(expressions, operator_type):
+    collection = BinaryFilterExpressionCollection()
+    for expression in expressions:
+        collection.Add(BinaryFilterExpressionItem(expression, operator_type))
+    return collection
+
+
+def _compile_comparison(field, symbol, value):
+    if not isinstance(field, Field) or isinstance(value, bool):
+        raise _NotSupported
+    name = _normalize_name(field.name)
+
+    if isinstance(value, str):
+        if symbol not in STRING_OPERATORS:
+            raise _NotSupported
+        category = STRING_CATEGORIES.get(name)
+        category = category() if category else TemplateFilterExpressions.CustomString(name.upper())
+        return BinaryFilterExpression(
+            category, STRING_OPERATORS[symbol], StringConstantFilterExpression(value)
+        )
+
+    if isinstance(value, (int, float)):
+        if symbol not in NUMERIC_OPERATORS:
+            raise _NotSupported
+        category = NUMERIC_CATEGORIES.get(name)
+        category = category() if category else TemplateFilterExpressions.CustomNumber(name.upper())
+        return BinaryFilterExpression(
+            category, NUMERIC_OPERATORS[symbol], NumericConstantFilterExpression(float(value))
+        )
+
+    raise _NotSupported
+
+
+def _compile(expression, negate=False):
+    if isinstance(expression, _Operation) and expression.symbol in ("&", "|"):
+        # De Morgan's laws are used to push the negations down to the comparisons
+        is_and = (expression.symbol == "&") != negate
+        operator_type = (
+            BinaryFilterOperatorType.BOOLEAN_AND if is_and else BinaryFilterOperatorType.BOOLEAN_OR
+        )
+        return _collection(
+            [_compile(expression.left, negate), _compile(expression.right, negate)],
+            operator_type,
+        )
+
+    if isinstance(expression, _Not):
+        return _compile(expression.operand, not negate)
+
+    if isinstance(expression, (_Comparison, _StringMethod)):
+        if isinstance(expression, _Comparison):
+            field, symbol, value = expression.left, expression.symbol, expression.right
+        else:
+            field, symbol, value = expression.operand, expression.method, expression.argument
+        if negate:
+            symbol = _NEGATED_OPERATORS[symbol]
+        return _compile_comparison(field, symbol, value)
+
+    if isinstance(expression, _IsIn):
+        if not expression.values:
+            raise _NotSupported
+        symbol = "!=" if negate else "=="
+        operator_type = (
+            BinaryFilterOperatorType.BOOLEAN_AND if negate else BinaryFilterOperatorType.BOOLEAN_OR
+        )
+        return _collection(
+            [_compile_comparison(expression.operand, symbol, v) for v in expression.values],
+            operator_type,
+        )
+
+    raise _NotSupported
+
+
+def _conjuncts(expression):
+    if isinstance(expression, _Operation) and expression.symbol == "&":
+        return _conjuncts(expression.left) + _conjuncts(expression.right)
+    return [expression]
+
+
+def compile_filter(predicate):
+    """
+    Compile a query predicate to a Tekla Structures filter expression.
+
+    The predicate is split in the terms joined by `&`. Every term that can be expressed with
+    `Tekla.Structures.Filtering` is compiled, and the other ones are returned as a residual
+    predicate that must be evaluated locally over the objects selected by the filter.
+
+    Fields are mapped (case insensitive) to the filter categories of profile, material, name, class,
+    finish, guid, phase and id. Other fields are mapped to template (report property) filters,
+    using a string or numeric filter according to the compared value.
+
+    Parameters
+    ----------
+    predicate : Expression
+        A boolean [`Expression`][pytekla.query.Expression] built with [`F`][pytekla.query.F].
+
+    Returns
+    -------
+    tuple
+        The compiled `Tekla.Structures.Filtering.FilterExpression` (None if no term could be compiled)
+        and the residual [`Expression`][pytekla.query.Expression] (None if every term was compiled).
+
+    Examples
+    --------
+    >>> from pytekla.filtering import F, compile_filter
+    >>> filter_expression, residual = compile_filter(
+    ...     F.profile.startswith("HEA") & (F.phase == 2) & (F.weight / F.length > 0.1)
+    ... )
+    >>> residual
+    ((F.weight / F.length) > 0.1)
+    """
+    compiled, residual = [], []
+    for term in _conjuncts(predicate):
+        try:
+            compiled.append(_compile(term))
+        except _NotSupported:
+            residual.append(term)
+
+    filter_expression = None
+    if compiled:
+        filter_expression = _collection(compiled, BinaryFilterOperatorType.BOOLEAN_AND)
+
+    return filter_expression, functools.reduce(operator.and_, residual) if residual else None
+
+
+def _infer_property_types(expression, types):
+    """Infer the report property type of each field from the values it is compared with."""
+    if isinstance(expression, _Operation) and expression.symbol not in ("&", "|"):
+        for operand in (expression.left, expression.right):
+            if isinstance(operand, Field):
+                types.setdefault(operand.name, float)
+    if isinstance(expression, (_Comparison, _Operation)):
+        for field, value in ((expression.left, expression.right), (expression.right, expression.left)):
+            if isinstance(field, Field) and isinstance(value, (str, int, float)):
+                types.setdefault(field.name, type(value) if not isinstance(value, bool) else int)
+        for operand in (expression.left, expression.right):
+            _infer_property_types(operand, types)
+    elif isinstance(expression, _IsIn):
+        if isinstance(expression.operand, Field) and expression.values:
+            types.setdefault(expression.operand.name, type(expression.values[0]))
+        _infer_property_types(expression.operand, types)
+    elif isinstance(expression, _StringMethod):
+        _infer_property_types(expression.operand, types)
+    elif isinstance(expression, _Not):
+        _infer_property_types(expression.operand, types)
+    return types
+
+
+def filter_locally(objects, predicate, property_types=None, chunk_size=1000):
+    """
+    Filter model objects evaluating a predicate in Python.
+
+    The fields of the predicate are read as report properties with one call per object, and the
+    predicate is evaluated over chunks of objects at once.
+
+    Parameters
+    ----------
+    objects : iterable of ModelObjectWrapper
+        The objects to filter.
+    predicate : Expression
+        A boolean [`Expression`][pytekla.query.Expression].
+    property_types : dict, optional
+        The report property type of the fields, with key being the field name and value being the type. By default the type is inferred from the values the field is compared with, or `str`.
+    chunk_size : int, optional
+        The number of objects evaluated at once. Default is 1000.
+
+    Returns
+    -------
+    generator
+        A generator of the objects that match the predicate.
+    """
+    types = _infer_property_types(predicate, dict(property_types or {}))
+    fields = sorted(predicate.fields())
+    field_types = {f: types.get(f, str) for f in fields}
+    names = {report_property_name(f): t for f, t in field_types.items()}
+    net_names = [iterable_to_net_array_list(n) for n in split_names_by_type(names)]
+
+    objects = iter(objects)
+    while chunk := list(itertools.islice(objects, chunk_size)):
+        values = {f: [] for f in fields}
+        for obj in chunk:
+            hash_table = Hashtable()
+            obj.unwrap().GetAllReportProperties(*net_names, hash_table)
+            for f in fields:
+                name = report_property_name(f)
+                values[f].append(hash_table[name] if hash_table.ContainsKey(name) else None)
+
+        table = {}
+        for f, field_type in field_types.items():
+            if field_type is str:
+                table[f] = np.array(values[f], dtype=object)
+            else:
+                table[f] = np.array(
+                    [np.nan if v is None else v for v in values[f]], dtype=np.float64
+                )
+
+        mask = np.broadcast_to(predicate.evaluate(table), (len(chunk),))
+        yield from itertools.compress(chunk, mask)
+
+
+def filter_objects(model, predicate, property_types=None):
+    """
+    Get the objects of the model that match a predicate, selecting them inside Tekla Structures when possible.
+
+    The predicate is compiled with [`compile_filter`][pytekla.filtering.compile_filter]. Only the objects
+    selected by the compiled filter cross to Python, and the residual predicate (if any) is evaluated
+    with [`filter_locally`][pytekla.filtering.filter_locally].
+
+    Parameters
+    ----------
+    model : ModelWrapper
+        The model.
+    predicate : Expression
+        A boolean [`Expression`][pytekla.query.Expression] built with [`F`][pytekla.query.F].
+    property_types : dict, optional
+        The report property type of the fields evaluated locally. See [`filter_locally`][pytekla.filtering.filter_locally].
+
+    Returns
+    -------
+    generator
+        A generator of [`ModelObjectWrapper`][pytekla.wrappers.ModelObjectWrapper] objects.
+
+    Examples
+    --------
+    >>> from pytekla import ModelWrapper
+    >>> from pytekla.filtering import F
+    >>> model = ModelWrapper()
+    >>> beams = model.get_objects_by_filter(F.profile.startswith("HEA") & (F.phase == 2))
+    """
+    filter_expression, residual = compile_filter(predicate)
+    if filter_expression is None:
+        objects = model.get_all_objects()
+    else:
+        objects = model.get_objects_by_filter(filter_expression)
+
+    if residual is None:
+        return objects
+    return filter_locally(objects, residual, property_types)
+
+
+__all__ = ["F", "report_property_name", "compile_filter", "filter_locally", "filter_objects"]
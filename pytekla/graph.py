@@ -0,0 +1,282 @@
+import clr
+import numpy as np
+from Tekla.Structures.Model import BaseWeld, BoltGroup
+
+from .wrappers import _get_type_by_namespace
+
+
+CONNECTOR_KINDS = ("bolt", "weld")
+
+CONNECTOR_TYPES = ("BoltArray", "BoltCircle", "BoltXYList", "Weld", "PolygonWeld")
+
+
+def _csr(rows, columns, size):
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+    return indptr, columns[order]
+
+
+class ConnectivityGraph:
+    """
+    The graph of which parts are connected by which bolts and welds.
+
+    The graph is stored as the incidence between parts and connectors in CSR form: the
+    connectors of the part in position `i` of `part_ids` are
+    `indices[indptr[i]:indptr[i + 1]]`, positions in `connector_ids`.
+
+    Use [`build_connectivity_graph`][pytekla.graph.build_connectivity_graph] to create it from a model.
+
+    Parameters
+    ----------
+    part_ids : numpy.ndarray
+        The sorted identifiers of the connected parts.
+    connector_ids : numpy.ndarray
+        The identifiers of the connectors.
+    connector_kinds : numpy.ndarray
+        The index of the kind of each connector in `CONNECTOR_KINDS` (0 for bolts and 1 for welds).
+    indptr : numpy.ndarray
+        The CSR index pointer, with `len(part_ids) + 1` items.
+    indices : numpy.ndarray
+        The CSR column indices (connector positions).
+    """
+
+    def __init__(self, part_ids, connector_ids, connector_kinds, indptr, indices):
+        self.part_ids = part_ids
+        self.connector_ids = connector_ids
+        self.connector_kinds = connector_kinds
+        self.indptr = indptr
+        self.indices = indices
+
+    @classmethod
+    def from_edges(cls, connector_ids, connector_kinds, edge_connectors, edge_parts):
+        """
+        Create the graph from its list of edges.
+
+        Parameters
+        ----------
+        connector_ids : array-like of int
+            The identifiers of the connectors.
+        connector_kinds : array-like of int
+            The index of the kind of each connector in `CONNECTOR_KINDS`.
+        edge_connectors : array-like of int
+            The position in `connector_ids` of the connector of each edge.
+        edge_parts : array-like of int
+            The identifier of the part of each edge.
+
+        Returns
+        -------
+        ConnectivityGraph
+            The graph. Repeated edges are removed.
+        """
+        edge_connectors = np.asarray(edge_connectors, dtype=np.int64)
+        edge_parts = np.asarray(edge_parts, dtype=np.int64)
+        part_ids, rows = np.unique(edge_parts, return_inverse=True)
+        edges = np.unique(np.column_stack([rows.ravel(), edge_connectors]), axis=0)
+        indptr, indices = _csr(edges[:, 0], edges[:, 1], len(part_ids))
+        return cls(
+            part_ids,
+            np.asarray(connector_ids, dtype=np.int64),
+            np.asarray(connector_kinds, dtype=np.int8),
+            indptr,
+            indices,
+        )
+
+    def __len__(self):
+        return len(self.part_ids)
+
+    def part_index(self, part_ids):
+        """
+        Get the positions of parts in `part_ids`.
+
+        Parameters
+        ----------
+        part_ids : int or array-like of int
+            The part identifiers.
+
+        Returns
+        -------
+        int or numpy.ndarray
+            The positions, -1 for the parts that are not in the graph.
+        """
+        part_ids = np.asarray(part_ids, dtype=np.int64)
+        positions = np.searchsorted(self.part_ids, part_ids)
+        positions = np.minimum(positions, max(len(self.part_ids) - 1, 0))
+        found = len(self.part_ids) > 0 and self.part_ids[positions] == part_ids
+        return np.where(found, positions, -1)
+
+    def connectors_of(self, part_id):
+        """
+        Get the connectors of a part.
+
+        Parameters
+        ----------
+        part_id : int
+            The part identifier.
+
+        Returns
+        -------
+        numpy.ndarray
+            The identifiers of the bolts and welds connected to the part.
+        """
+        i = int(self.part_index(part_id))
+        if i < 0:
+            return np.empty(0, dtype=np.int64)
+        return self.connector_ids[self.indices[self.indptr[i] : self.indptr[i + 1]]]
+
+    def part_adjacency(self):
+        """
+        Get the part to part adjacency, two parts being adjacent if they share a connector.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            The CSR `indptr` and `indices` (positions in `part_ids`) of the adjacency.
+        """
+        rows = np.repeat(np.arange(len(self.part_ids)), np.diff(self.indptr))
+        connector_indptr, parts_by_connector = _csr(
+            self.indices, rows, len(self.connector_ids)
+        )
+        degrees = np.diff(connector_indptr)
+        size = len(self.part_ids)
+
+        # the pairs of the connectors with the same number of parts are built at once
+        keys = [np.empty(0, dtype=np.int64)]
+        for degree in np.unique(degrees[degrees > 1]):
+            starts = connector_indptr[:-1][degrees == degree]
+            parts = parts_by_connector[starts[:, None] + np.arange(degree)]
+            a = np.repeat(parts, degree, axis=1).ravel()
+            b = np.tile(parts, (1, degree)).ravel()
+            different = a != b
+            keys.append(a[different] * size + b[different])
+
+        keys = np.sort(np.concatenate(keys))
+        keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+        return _csr(keys // size, keys % size, size)
+
+    def to_scipy(self, part_to_part=False):
+        """
+        Export the graph as a SciPy sparse matrix. SciPy must be installed.
+
+        Parameters
+        ----------
+        part_to_part : bool, optional
+            If True, the part to part adjacency matrix is returned instead of the part to connector incidence matrix. Default is False.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            The matrix.
+        """
+        from scipy.sparse import csr_matrix
+
+        if part_to_part:
+            indptr, indices = self.part_adjacency()
+            shape = (len(self.part_ids), len(self.part_ids))
+        else:
+            indptr, indices = self.indptr, self.indices
+            shape = (len(self.part_ids), len(self.connector_ids))
+        return csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=shape)
+
+    def connected_components(self):
+        """
+        Label the groups of parts connected to each other.
+
+        SciPy is used if it is installed; otherwise labels are propagated through the connectors with NumPy.
+
+        Returns
+        -------
+        numpy.ndarray
+            The component label of each part in `part_ids`, numbered from 0.
+        """
+        try:
+            from scipy.sparse.csgraph import connected_components
+        except ImportError:
+            connected_components = None
+
+        if connected_components is not None:
+            from scipy.sparse import csr_matrix
+
+            # the graph of parts and connectors has the same components without the part pairs
+            size = len(self.part_ids) + len(self.connector_ids)
+            indptr = np.concatenate(
+                [self.indptr, np.full(len(self.connector_ids), self.indptr[-1])]
+            )
+            graph = csr_matrix(
+                (np.ones(len(self.indices), dtype=np.int8), self.indices + len(self.part_ids), indptr),
+                shape=(size, size),
+            )
+            labels = connected_components(graph, directed=False)[1][: len(self.part_ids)]
+            return np.unique(labels, return_inverse=True)[1].ravel()
+
+        rows = np.repeat(np.arange(len(self.part_ids)), np.diff(self.indptr))
+        labels = np.arange(len(self.part_ids))
+        while True:
+            connector_labels = np.full(len(self.connector_ids), len(self.part_ids))
+            np.minimum.at(connector_labels, self.indices, labels[rows])
+            new_labels = labels.copy()
+            np.minimum.at(new_labels, rows, connector_labels[self.indices])
+            new_labels = new_labels[new_labels]
+            if np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+        return np.unique(labels, return_inverse=True)[1].ravel()
+
+    def __repr__(self):
+        return f"<PyTekla> ConnectivityGraph ({len(self.part_ids)} parts, {len(self.connector_ids)} connectors)"
+
+
+def _connected_parts(connector):
+    if isinstance(connector, BoltGroup):
+        yield connector.PartToBoltTo
+        yield connector.PartToBeBolted
+        yield from connector.GetOtherPartsToBolt()
+    elif isinstance(connector, BaseWeld):
+        yield connector.MainObject
+        yield connector.SecondaryObject
+
+
+def build_connectivity_graph(model):
+    """
+    Build the connectivity graph of a model enumerating its bolts and welds only once.
+
+    Parameters
+    ----------
+    model : ModelWrapper
+        The model.
+
+    Returns
+    -------
+    ConnectivityGraph
+        The graph of parts and connectors.
+
+    Examples
+    --------
+    >>> from pytekla import ModelWrapper
+    >>> from pytekla.graph import build_connectivity_graph
+    >>> graph = build_connectivity_graph(ModelWrapper())
+    >>> labels = graph.connected_components()
+    >>> graph.connectors_of(1234)
+    array([5678, 5690])
+    """
+    selector = model.unwrap().GetModelObjectSelector()
+    connectors = selector.GetAllObjectsWithType(
+        [clr.GetClrType(_get_type_by_namespace("Model." + t)) for t in CONNECTOR_TYPES]
+    )
+
+    connector_ids, connector_kinds, edge_connectors, edge_parts = [], [], [], []
+    for connector in connectors:
+        position = len(connector_ids)
+        connector_ids.append(connector.Identifier.ID)
+        connector_kinds.append(0 if isinstance(connector, BoltGroup) else 1)
+        for part in _connected_parts(connector):
+            if part is not None and part.Identifier.ID > 0:
+                edge_connectors.append(position)
+                edge_parts.append(part.Identifier.ID)
+
+    return ConnectivityGraph.from_edges(
+        connector_ids, connector_kinds, edge_connectors, edge_parts
+    )
+
+
+__all__ = ["ConnectivityGraph", "build_connectivity_graph"]
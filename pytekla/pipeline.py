@@ -0,0 +1,527 @@
+import ast
+import functools
+import itertools
+import json
+import operator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import clr
+import numpy as np
+import pandas as pd
+
+from . import session
+from .coreutils.names import to_pascal_case
+from .coreutils.properties import check_property_type
+from .data_manager import _read_attribute_path
+from .filtering import _infer_property_types, compile_filter, report_property_name
+from .query import Expression, Field
+from .schema import ExtractionPlan
+from .wrappers import _get_type_by_namespace
+
+
+PROPERTY_TYPES = {"str": str, "int": int, "float": float}
+
+SOURCES = ("all", "selected")
+
+SINK_FORMATS = (".csv", ".parquet", ".xlsx")
+
+SPEC_KEYS = (
+    "source",
+    "types",
+    "where",
+    "report_properties",
+    "user_properties",
+    "attributes",
+    "derived",
+    "sink",
+    "max_workers",
+    "chunk_size",
+)
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_,
+}
+
+_COMPARISON_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+_METHODS = ("startswith", "endswith", "contains", "isin", "isna")
+
+
+def _parse_node(node):
+    if isinstance(node, ast.Expression):
+        return _parse_node(node.body)
+    if isinstance(node, ast.Name):
+        return Field(node.id)
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [_parse_node(e) for e in node.elts]
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        return _BINARY_OPERATORS[type(node.op)](_parse_node(node.left), _parse_node(node.right))
+    if isinstance(node, ast.BoolOp):
+        func = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+        return functools.reduce(func, [_parse_node(v) for v in node.values])
+    if isinstance(node, ast.UnaryOp):
+        operand = _parse_node(node.operand)
+        if isinstance(node.op, (ast.Not, ast.Invert)):
+            return ~operand
+        if isinstance(node.op, ast.USub):
+            return operand * -1
+    if isinstance(node, ast.Compare) and len(node.ops) == 1:
+        left, right = _parse_node(node.left), _parse_node(node.comparators[0])
+        op = type(node.ops[0])
+        if op in _COMPARISON_OPERATORS:
+            return _COMPARISON_OPERATORS[op](left, right)
+        if op in (ast.In, ast.NotIn):
+            expression = left.isin(right)
+            return expression if op is ast.In else ~expression
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr in _METHODS
+        and not node.keywords
+    ):
+        return getattr(_parse_node(node.func.value), node.func.attr)(
+            *[_parse_node(a) for a in node.args]
+        )
+    raise ValueError(f"Unsupported expression: {ast.unparse(node)!r}")
+
+
+def parse_expression(text):
+    """
+    Parse an [`Expression`][pytekla.query.Expression] from a string.
+
+    Names are fields, and the supported syntax is made of constants, lists, the arithmetic operators,
+    comparisons, `in` and `not in`, `and`, `or`, `not` (or `&`, `|`, `~`), and the methods
+    `startswith`, `endswith`, `contains`, `isin` and `isna`. Nothing is executed, so the strings can
+    come from configuration files.
+
+    Parameters
+    ----------
+    text : str
+        The expression.
+
+    Returns
+    -------
+    Expression
+        The parsed expression.
+
+    Raises
+    ------
+    ValueError
+        If the string uses a syntax that is not supported.
+
+    Examples
+    --------
+    >>> parse_expression("profile.startswith('HEA') and phase in [1, 2] and WEIGHT / LENGTH > 0.1")
+    (((F.profile.startswith('HEA') & F.phase.isin([1, 2])) & ((F.WEIGHT / F.LENGTH) > 0.1))
+    """
+    try:
+        tree = ast.parse(text, mode="eval")
+    except SyntaxError as error:
+        raise ValueError(f"Invalid expression {text!r}: {error.msg}") from None
+    return _parse_node(tree)
+
+
+def _as_expression(value):
+    return parse_expression(value) if isinstance(value, str) else value
+
+
+def _as_property_types(properties, name):
+    result = {}
+    for property_name, property_type in (properties or {}).items():
+        if isinstance(property_type, str):
+            if property_type not in PROPERTY_TYPES:
+                raise TypeError(
+                    f"The type of '{property_name}' in '{name}' must be one of {list(PROPERTY_TYPES)}"
+                )
+            property_type = PROPERTY_TYPES[property_type]
+        check_property_type(property_type)
+        result[property_name] = property_type
+    return result
+
+
+def load_spec(path):
+    """
+    Load an extraction spec from a JSON or YAML file. YAML files need PyYAML to be installed.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        The path of the file. Files ending in ".yaml" or ".yml" are read as YAML, the other ones as JSON.
+
+    Returns
+    -------
+    dict
+        The spec.
+    """
+    path = Path(path)
+    text = path.read_text()
+    if path.suffix.lower() in (".yaml", ".yml"):
+        import yaml
+
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def _typed_column(values, property_type):
+    """Build a column with the dtype of a property type, whatever the values of the chunk are."""
+    if property_type is str:
+        return np.array(values, dtype=object)
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+class Pipeline:
+    """
+    An extraction spec compiled into an ordered list of stages.
+
+    The spec is a dictionary (or a JSON/YAML file, see [`load_spec`][pytekla.pipeline.load_spec]) with the items:
+
+    - "source": "all" (default) or "selected".
+    - "types": the type names of the objects, for example ["Beam", "ContourPlate"].
+    - "where": a predicate, as an [`Expression`][pytekla.query.Expression] or a string (see [`parse_expression`][pytekla.pipeline.parse_expression]).
+    - "report_properties" and "user_properties": dictionaries with the property names and types ("str", "int", "float" or the Python types).
+    - "attributes": the attribute paths, like "name" or "start_point.x".
+    - "derived": a dictionary of derived columns, with expressions over the other columns.
+    - "sink": the path of a ".csv", ".parquet" or ".xlsx" file where the result is also written.
+    - "max_workers": the number of threads that process the chunks of objects.
+    - "chunk_size": the number of objects per chunk. Default is 1000.
+
+    When the spec is compiled:
+
+    1. The terms of "where" that Tekla Structures can evaluate are pushed down to a model filter (see
+       [`compile_filter`][pytekla.filtering.compile_filter]), so only the matching objects are fetched.
+       With the "selected" source the whole predicate is evaluated locally.
+    2. All the report properties needed by the output and by the rest of the predicate are deduplicated
+       and read with a single call per object.
+    3. The rest of the predicate is evaluated on each chunk before reading the user properties and the
+       attributes, which are only read for the matching objects.
+    4. The chunks are processed by a pool of threads, and the derived columns are computed at the end.
+
+    Parameters
+    ----------
+    spec : dict
+        The spec.
+
+    Raises
+    ------
+    ValueError
+        If the spec has unknown items, an unknown source or sink format, or an invalid expression.
+    TypeError
+        If any property type is not valid.
+
+    Examples
+    --------
+    >>> from pytekla.pipeline import Pipeline
+    >>> pipeline = Pipeline({
+    ...     "types": ["Beam"],
+    ...     "where": "profile.startswith('HEA') and WEIGHT > 100",
+    ...     "report_properties": {"PROFILE": "str", "WEIGHT": "float", "LENGTH": "float"},
+    ...     "attributes": ["name"],
+    ...     "derived": {"WEIGHT_PER_M": "WEIGHT / LENGTH * 1000"},
+    ...     "sink": "heavy_beams.csv",
+    ... })
+    >>> print(pipeline.explain(object_count=100000))
+    >>> dataframe = pipeline.run()
+    """
+
+    def __init__(self, spec):
+        unknown = set(spec) - set(SPEC_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown spec items {sorted(unknown)}, expected some of {SPEC_KEYS}")
+
+        self.source = spec.get("source", "all")
+        if self.source not in SOURCES:
+            raise ValueError(f"The source must be one of {SOURCES}, not {self.source!r}")
+        self.types = list(spec.get("types") or [])
+        self.output_report_properties = _as_property_types(
+            spec.get("report_properties"), "report_properties"
+        )
+        self.user_properties = _as_property_types(spec.get("user_properties"), "user_properties")
+        self.attributes = {
+            attr: [to_pascal_case(at) for at in attr.split(".")]
+            for attr in spec.get("attributes") or []
+        }
+        self.derived = {k: _as_expression(v) for k, v in (spec.get("derived") or {}).items()}
+        self.max_workers = spec.get("max_workers")
+        self.chunk_size = spec.get("chunk_size", 1000)
+
+        self.sink = spec.get("sink")
+        if self.sink is not None and Path(self.sink).suffix.lower() not in SINK_FORMATS:
+            raise ValueError(f"The sink must be a file with one of the extensions {SINK_FORMATS}")
+
+        predicate = _as_expression(spec.get("where"))
+        if predicate is None:
+            self.filter_expression, self.residual = None, None
+        elif self.source == "selected":
+            # the selected objects are not fetched with a model filter, nothing can be pushed down
+            self.filter_expression, self.residual = None, predicate
+        else:
+            self.filter_expression, self.residual = compile_filter(predicate)
+
+        # The report properties read from each object: the output ones and the ones of the residual predicate
+        self.report_properties = dict(self.output_report_properties)
+        self.residual_fields = {}
+        if self.residual is not None:
+            types = _infer_property_types(self.residual, {})
+            for field in sorted(self.residual.fields()):
+                name = report_property_name(field)
+                # the type requested for the output wins over the inferred one
+                self.report_properties.setdefault(name, types.get(field, str))
+                self.residual_fields[field] = name
+        self._plan = (
+            ExtractionPlan(self.report_properties, self.report_properties)
+            if self.report_properties
+            else None
+        )
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Compile a spec file. See [`load_spec`][pytekla.pipeline.load_spec].
+
+        Returns
+        -------
+        Pipeline
+            The pipeline.
+        """
+        return cls(load_spec(path))
+
+    @property
+    def columns(self):
+        """The names of the output columns."""
+        return [
+            "id",
+            *self.output_report_properties,
+            *self.user_properties,
+            *self.attributes,
+            *self.derived,
+        ]
+
+    def stages(self):
+        """
+        Describe the stages of the pipeline.
+
+        Returns
+        -------
+        list of tuple
+            One tuple per stage, with its name, its description, the estimated number of interop calls per
+            object reaching the stage, and whether the stage runs only on the objects that match the predicate.
+        """
+        stages = []
+        if self.filter_expression is not None:
+            description = "select the objects with the pushed-down model filter"
+            stages.append(("fetch", description, 1, False))
+        elif self.types and self.source == "all":
+            stages.append(("fetch", f"select the objects of the types {self.types}", 1, False))
+        else:
+            stages.append(("fetch", f"enumerate the {self.source} objects", 1, False))
+        if self.types and (self.filter_expression is not None or self.source == "selected"):
+            stages.append(("type filter", f"keep the types {self.types}", 1, False))
+
+        stages.append(("id", "read the identifiers", 1, False))
+        if self.report_properties:
+            stages.append(
+                (
+                    "report properties",
+                    f"read {sorted(self.report_properties)} with one call per object",
+                    1 + 2 * len(self.report_properties),
+                    False,
+                )
+            )
+        if self.residual is not None:
+            stages.append(("local filter", f"evaluate {self.residual!r} per chunk", 0, False))
+        if self.user_properties:
+            stages.append(
+                (
+                    "user properties",
+                    f"read {list(self.user_properties)}",
+                    len(self.user_properties),
+                    True,
+                )
+            )
+        if self.attributes:
+            stages.append(
+                (
+                    "attributes",
+                    f"read {list(self.attributes)}",
+                    sum(len(path) for path in self.attributes.values()),
+                    True,
+                )
+            )
+        if self.derived:
+            stages.append(("derived", f"compute {list(self.derived)}", 0, True))
+        if self.max_workers:
+            description = f"process chunks of {self.chunk_size} objects in {self.max_workers} threads"
+            stages.append(("fan-out", description, 0, False))
+        if self.sink is not None:
+            stages.append(("sink", f"write {self.sink}", 0, True))
+        return stages
+
+    def explain(self, object_count=None, selectivity=1.0):
+        """
+        Get the execution plan with the estimated number of interop calls.
+
+        The estimate of an unoptimized extraction reads every property and attribute of every fetched
+        object with one call each, wrapping the objects, as a loop over
+        [`create_model_objects_dataframe`][pytekla.data_manager.create_model_objects_dataframe] does.
+
+        Parameters
+        ----------
+        object_count : int, optional
+            The estimated number of fetched objects. By default the calls are estimated per object.
+        selectivity : float, optional
+            The estimated fraction of the fetched objects that match the local part of the predicate. Default is 1.0.
+
+        Returns
+        -------
+        str
+            The plan.
+        """
+        count = object_count if object_count is not None else 1
+        unit = "calls" if object_count is not None else "calls/object"
+        lines = ["Execution plan"]
+        total = 0
+        for i, (name, description, calls, matched_only) in enumerate(self.stages(), start=1):
+            objects = count * selectivity if matched_only and self.residual is not None else count
+            stage_calls = calls * objects
+            total += stage_calls
+            estimate = f"~{stage_calls:,.0f} {unit}" if calls else "no interop"
+            lines.append(f"  {i}. {name}: {description} ({estimate})")
+
+        naive_per_object = 2 + len(self.report_properties) + len(self.user_properties) + sum(
+            len(path) + 1 for path in self.attributes.values()
+        )
+        lines.append(f"Estimated interop calls: ~{total:,.0f} {unit}")
+        lines.append(f"Without optimizations: ~{naive_per_object * count:,.0f} {unit}")
+        return "\n".join(lines)
+
+    def _fetch(self, model):
+        tekla_model = model.unwrap() if model is not None else session.get_model()
+        if self.source == "selected":
+            objects = session.get_ui_model_object_selector().GetSelectedObjects()
+        elif self.filter_expression is not None:
+            objects = tekla_model.GetModelObjectSelector().GetObjectsByFilter(
+                self.filter_expression
+            )
+        elif self.types:
+            objects = tekla_model.GetModelObjectSelector().GetAllObjectsWithType(
+                [clr.GetClrType(_get_type_by_namespace("Model." + t)) for t in self.types]
+            )
+        else:
+            objects = tekla_model.GetModelObjectSelector().GetAllObjects()
+
+        if self.types and (self.filter_expression is not None or self.source == "selected"):
+            types = set(self.types)
+            objects = (to for to in objects if to.GetType().Name in types)
+        return objects
+
+    def _process_chunk(self, chunk):
+        ids = np.array([to.Identifier.ID for to in chunk], dtype=np.int64)
+        values = [self._plan.read(to) for to in chunk] if self._plan else [{} for _ in chunk]
+
+        if self.residual is not None:
+            table = {}
+            for field, name in self.residual_fields.items():
+                column = [v[name] for v in values]
+                table[field] = _typed_column(column, self.report_properties[name])
+            mask = np.broadcast_to(self.residual.evaluate(table), (len(chunk),))
+            rows = np.flatnonzero(mask)
+        else:
+            rows = range(len(chunk))
+
+        data = {"id": ids[rows]}
+        for name, property_type in self.output_report_properties.items():
+            data[name] = _typed_column([values[i][name] for i in rows], property_type)
+        for name, property_type in self.user_properties.items():
+            column = []
+            for i in rows:
+                was_found, value = chunk[i].GetUserProperty(name, property_type())
+                column.append(value if was_found else None)
+            data[name] = _typed_column(column, property_type)
+        for attr, path in self.attributes.items():
+            data[attr] = [_read_attribute_path(chunk[i], path) for i in rows]
+        return pd.DataFrame(data, columns=list(data))
+
+    def run(self, model=None):
+        """
+        Run the pipeline.
+
+        Parameters
+        ----------
+        model : ModelWrapper, optional
+            The model. By default the shared model of the [`session`][pytekla.session].
+
+        Returns
+        -------
+        pd.DataFrame
+            The extracted table, also written to the sink if the spec has one. The string properties
+            are object columns with None for the missing values, and the numeric properties are float
+            columns with NaN for the missing values.
+        """
+        objects = iter(self._fetch(model))
+        chunks = iter(lambda: list(itertools.islice(objects, self.chunk_size)), [])
+
+        if self.max_workers:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                frames = list(executor.map(self._process_chunk, chunks))
+        else:
+            frames = [self._process_chunk(chunk) for chunk in chunks]
+
+        dataframe = pd.concat(frames, ignore_index=True) if frames else self._process_chunk([])
+        if self.derived:
+            table = {name: dataframe[name].to_numpy() for name in dataframe.columns}
+            for name, expression in self.derived.items():
+                value = (
+                    expression.evaluate(table) if isinstance(expression, Expression) else expression
+                )
+                dataframe[name] = np.broadcast_to(value, (len(dataframe),))
+                table[name] = dataframe[name].to_numpy()
+
+        if self.sink is not None:
+            suffix = Path(self.sink).suffix.lower()
+            if suffix == ".csv":
+                dataframe.to_csv(self.sink, index=False)
+            elif suffix == ".parquet":
+                dataframe.to_parquet(self.sink, index=False)
+            else:
+                dataframe.to_excel(self.sink, index=False)
+        return dataframe
+
+    def __repr__(self):
+        return f"<PyTekla> Pipeline ({len(self.stages())} stages, columns: {self.columns})"
+
+
+def compile_spec(spec):
+    """
+    Compile an extraction spec into a [`Pipeline`][pytekla.pipeline.Pipeline].
+
+    Parameters
+    ----------
+    spec : dict or str or os.PathLike
+        The spec, or the path of a JSON or YAML file with it.
+
+    Returns
+    -------
+    Pipeline
+        The compiled pipeline.
+    """
+    if isinstance(spec, dict):
+        return Pipeline(spec)
+    return Pipeline.from_file(spec)
+
+
+__all__ = ["parse_expression", "load_spec", "Pipeline", "compile_spec"]
@@ -0,0 +1,531 @@
+import operator
+
+import numpy as np
+import pandas as pd
+
+from .snapshot import MISSING_INT, ModelSnapshot, StringColumn
+from .wrappers import ModelWrapper
+
+
+class Expression:
+    """
+    Base class of the query expressions.
+
+    Expressions are built from [`Field`][pytekla.query.Field] objects with the Python operators and are
+    evaluated at once over all the rows of a table, so no Python loop over the objects is needed.
+
+    - Comparisons: `==`, `!=`, `<`, `<=`, `>`, `>=`.
+    - Logical operators: `&` (and), `|` (or), `~` (not).
+    - Arithmetic: `+`, `-`, `*`, `/`.
+    - Methods: `isin`, `startswith`, `endswith`, `contains` and `isna`.
+
+    Missing values (None, NaN or `MISSING_INT`) don't match any comparison, and are NaN in arithmetic.
+    """
+
+    def evaluate(self, table):
+        """
+        Evaluate the expression over a table.
+
+        Parameters
+        ----------
+        table : ModelSnapshot, pd.DataFrame or dict
+            The table with the columns used by the expression. A dict must map column names to sequences of the same length.
+
+        Returns
+        -------
+        numpy.ndarray
+            The value of the expression for each row.
+        """
+        raise NotImplementedError
+
+    def fields(self):
+        """
+        Get the names of the fields used by the expression.
+
+        Returns
+        -------
+        set of str
+            The field names.
+        """
+        raise NotImplementedError
+
+    def __and__(self, other):
+        return _Operation(np.logical_and, "&", self, other)
+
+    def __or__(self, other):
+        return _Operation(np.logical_or, "|", self, other)
+
+    def __invert__(self):
+        return _Not(self)
+
+    def __eq__(self, other):
+        return _Comparison(operator.eq, "==", self, other)
+
+    def __ne__(self, other):
+        return _Comparison(operator.ne, "!=", self, other)
+
+    def __lt__(self, other):
+        return _Comparison(operator.lt, "<", self, other)
+
+    def __le__(self, other):
+        return _Comparison(operator.le, "<=", self, other)
+
+    def __gt__(self, other):
+        return _Comparison(operator.gt, ">", self, other)
+
+    def __ge__(self, other):
+        return _Comparison(operator.ge, ">=", self, other)
+
+    def __add__(self, other):
+        return _Operation(operator.add, "+", self, other)
+
+    def __sub__(self, other):
+        return _Operation(operator.sub, "-", self, other)
+
+    def __mul__(self, other):
+        return _Operation(operator.mul, "*", self, other)
+
+    def __truediv__(self, other):
+        return _Operation(operator.truediv, "/", self, other)
+
+    __hash__ = object.__hash__
+
+    def isin(self, values):
+        """
+        Check if the values of the expression are in a collection.
+
+        Parameters
+        ----------
+        values : iterable
+            The accepted values.
+
+        Returns
+        -------
+        Expression
+            A boolean expression.
+        """
+        return _IsIn(self, values)
+
+    def startswith(self, prefix):
+        """Check if the string values of the expression start with `prefix`."""
+        return _StringMethod("startswith", self, prefix)
+
+    def endswith(self, suffix):
+        """Check if the string values of the expression end with `suffix`."""
+        return _StringMethod("endswith", self, suffix)
+
+    def contains(self, substring):
+        """Check if the string values of the expression contain `substring`."""
+        return _StringMethod("contains", self, substring)
+
+    def isna(self):
+        """Check if the values of the expression are missing (None or NaN)."""
+        return _IsNa(self)
+
+
+class Field(Expression):
+    """
+    An expression that refers to a column of the table.
+
+    Parameters
+    ----------
+    name : str
+        The column name.
+
+    Examples
+    --------
+    >>> from pytekla.query import F, Field
+    >>> Field("LENGTH") > 6000
+    >>> F.LENGTH > 6000  # the same
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def evaluate(self, table):
+        column = _get_column(table, self.name)
+        if isinstance(column, StringColumn):
+            return column.decode()
+        return column
+
+    def fields(self):
+        return {self.name}
+
+    def __repr__(self):
+        return f"F.{self.name}"
+
+
+class _FieldFactory:
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return Field(name)
+
+    def __getitem__(self, name):
+        return Field(name)
+
+
+F = _FieldFactory()
+"""Shortcut to create fields, `F.PROFILE` or `F["PROFILE"]` are the same as `Field("PROFILE")`."""
+
+
+def _evaluate(operand, table):
+    if isinstance(operand, Expression):
+        return operand.evaluate(table)
+    return operand
+
+
+def _fields(*operands):
+    return set().union(*(o.fields() for o in operands if isinstance(o, Expression)))
+
+
+def _map_values(expression, table, func):
+    """Apply `func` (a function from an object array to a boolean array) to the values of
+    `expression`. For encoded string columns `func` is applied only to the distinct values."""
+    if isinstance(expression, Field):
+        column = _get_column(table, expression.name)
+        if isinstance(column, StringColumn):
+            categories = np.array(column.categories + (None,), dtype=object)
+            return _map_values_array(categories, func)[column.codes]
+    return _map_values_array(np.asarray(_evaluate(expression, table), dtype=object), func)
+
+
+def _map_values_array(values, func):
+    result = np.zeros(len(values), dtype=bool)
+    valid = ~pd.isna(values)
+    if valid.any():
+        result[valid] = func(values[valid])
+    return result
+
+
+def _missing(values):
+    """Get the mask of the missing values (NaN or `MISSING_INT`) of an evaluated operand, or None if it can have none."""
+    if isinstance(values, np.ndarray):
+        if values.dtype == np.int64:
+            return values == MISSING_INT
+        if values.dtype.kind == "f":
+            return np.isnan(values)
+    return None
+
+
+def _as_numbers(values):
+    """Turn the missing values of an integer column into NaN, so they propagate through arithmetic."""
+    if isinstance(values, np.ndarray) and values.dtype == np.int64:
+        missing = values == MISSING_INT
+        if missing.any():
+            values = values.astype(np.float64)
+            values[missing] = np.nan
+    return values
+
+
+class _BinaryExpression(Expression):
+    def __init__(self, func, symbol, left, right):
+        self.func = func
+        self.symbol = symbol
+        self.left = left
+        self.right = right
+
+    def fields(self):
+        return _fields(self.left, self.right)
+
+    def __repr__(self):
+        return f"({self.left!r} {self.symbol} {self.right!r})"
+
+
+class _Operation(_BinaryExpression):
+    def evaluate(self, table):
+        left = _evaluate(self.left, table)
+        right = _evaluate(self.right, table)
+        if self.symbol not in ("&", "|"):
+            left, right = _as_numbers(left), _as_numbers(right)
+        return self.func(left, right)
+
+
+class _Comparison(_BinaryExpression):
+    def evaluate(self, table):
+        if isinstance(self.left, Field) and not isinstance(self.right, Expression):
+            column = _get_column(table, self.left.name)
+            if isinstance(column, StringColumn):
+                return _map_values(self.left, table, lambda v: self.func(v, self.right))
+        left = _evaluate(self.left, table)
+        right = _evaluate(self.right, table)
+        if isinstance(left, np.ndarray) and left.dtype == object and np.ndim(right) == 0:
+            return _map_values_array(left, lambda v: self.func(v, right))
+        result = np.asarray(self.func(left, right), dtype=bool)
+        # a missing value doesn't match any comparison, like the missing strings
+        for missing in (_missing(left), _missing(right)):
+            if missing is not None and missing.any():
+                result = result & ~missing
+        return result
+
+
+class _Not(Expression):
+    def __init__(self, operand):
+        self.operand = operand
+
+    def evaluate(self, table):
+        return np.logical_not(_evaluate(self.operand, table))
+
+    def fields(self):
+        return _fields(self.operand)
+
+    def __repr__(self):
+        return f"~{self.operand!r}"
+
+
+class _IsIn(Expression):
+    def __init__(self, operand, values):
+        self.operand = operand
+        self.values = list(values)
+
+    def evaluate(self, table):
+        return _map_values(
+            self.operand, table, lambda v: pd.Series(v).isin(self.values).to_numpy()
+        )
+
+    def fields(self):
+        return _fields(self.operand)
+
+    def __repr__(self):
+        return f"{self.operand!r}.isin({self.values!r})"
+
+
+class _StringMethod(Expression):
+    _FUNCTIONS = {
+        "startswith": np.char.startswith,
+        "endswith": np.char.endswith,
+        "contains": lambda values, sub: np.char.find(values, sub) >= 0,
+    }
+
+    def __init__(self, method, operand, argument):
+        self.method = method
+        self.operand = operand
+        self.argument = argument
+
+    def evaluate(self, table):
+        func = self._FUNCTIONS[self.method]
+        return _map_values(
+            self.operand, table, lambda v: func(v.astype(str), self.argument)
+        )
+
+    def fields(self):
+        return _fields(self.operand)
+
+    def __repr__(self):
+        return f"{self.operand!r}.{self.method}({self.argument!r})"
+
+
+class _IsNa(Expression):
+    def __init__(self, operand):
+        self.operand = operand
+
+    def evaluate(self, table):
+        values = _evaluate(self.operand, table)
+        if isinstance(values, np.ndarray) and values.dtype == np.int64:
+            return values == MISSING_INT
+        return np.asarray(pd.isna(values), dtype=bool)
+
+    def fields(self):
+        return _fields(self.operand)
+
+    def __repr__(self):
+        return f"{self.operand!r}.isna()"
+
+
+def _get_column(table, name):
+    if isinstance(table, ModelSnapshot):
+        if name in ("id", "type"):
+            return table.ids if name == "id" else table.types
+        return table.columns[name]
+    if isinstance(table, pd.DataFrame):
+        return table[name].to_numpy()
+    return np.asarray(table[name])
+
+
+def _table_length(table):
+    if isinstance(table, (ModelSnapshot, pd.DataFrame)):
+        return len(table)
+    return len(next(iter(table.values()), ()))
+
+
+class Query:
+    """
+    A query over a table of extracted model data.
+
+    The table can be a [`ModelSnapshot`][pytekla.snapshot.ModelSnapshot], a pandas DataFrame (for example
+    one created with [`create_model_objects_dataframe`][pytekla.data_manager.create_model_objects_dataframe])
+    or a dict of columns. Queries are immutable, each method returns a new query.
+
+    Examples
+    --------
+    >>> from pytekla.query import F, Query
+    >>> query = Query(snapshot).where(
+    ...     F.PROFILE.startswith("HEA") & (F.LENGTH > 6000) & F.PHASE.isin([2, 3])
+    ... )
+    >>> query.rows()
+    >>> for part in query.to_wrappers():
+    >>>     print(part.name)
+    """
+
+    def __init__(self, table, predicate=None, projection=None):
+        """
+        Create a new query.
+
+        Parameters
+        ----------
+        table : ModelSnapshot, pd.DataFrame or dict
+            The table to query.
+        predicate : Expression, optional
+            A boolean expression with the rows to keep. By default all of them.
+        projection : dict, optional
+            The output columns, with key being the column name and value being an expression. By default all the columns of the table.
+        """
+        self.table = table
+        self.predicate = predicate
+        self.projection = projection
+
+    def where(self, predicate):
+        """
+        Filter the rows of the query.
+
+        Parameters
+        ----------
+        predicate : Expression
+            A boolean expression. It is combined with the current filter using `&`.
+
+        Returns
+        -------
+        Query
+            The filtered query.
+        """
+        if self.predicate is not None:
+            predicate = self.predicate & predicate
+        return Query(self.table, predicate, self.projection)
+
+    def select(self, *names, **expressions):
+        """
+        Choose the output columns of the query.
+
+        Parameters
+        ----------
+        names : str
+            Names of columns of the table.
+        expressions : Expression
+            Derived columns, with the keyword being the output column name.
+
+        Returns
+        -------
+        Query
+            The query with the new projection.
+
+        Examples
+        --------
+        >>> Query(snapshot).select("PROFILE", WEIGHT_T=F.WEIGHT / 1000)
+        """
+        projection = {name: Field(name) for name in names}
+        projection |= expressions
+        return Query(self.table, self.predicate, projection)
+
+    def mask(self):
+        """
+        Evaluate the filter of the query.
+
+        Returns
+        -------
+        numpy.ndarray
+            A boolean array with True for the rows that match the filter.
+        """
+        size = _table_length(self.table)
+        if self.predicate is None:
+            return np.ones(size, dtype=bool)
+        return np.broadcast_to(
+            np.asarray(self.predicate.evaluate(self.table), dtype=bool), (size,)
+        )
+
+    def rows(self):
+        """
+        Get the rows that match the query.
+
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame with the projected columns of the matching rows.
+        """
+        mask = self.mask()
+        if self.projection is None:
+            if isinstance(self.table, ModelSnapshot):
+                return self.table.take(mask).to_dataframe()
+            if isinstance(self.table, pd.DataFrame):
+                return self.table[mask].reset_index(drop=True)
+            return pd.DataFrame({k: np.asarray(v)[mask] for k, v in self.table.items()})
+
+        size = len(mask)
+        return pd.DataFrame(
+            {
+                name: np.broadcast_to(_evaluate(expression, self.table), (size,))[mask]
+                for name, expression in self.projection.items()
+            }
+        )
+
+    def group_by(self, *keys, **aggregations):
+        """
+        Group the matching rows and aggregate them.
+
+        Parameters
+        ----------
+        keys : str
+            The names of the output columns to group by.
+        aggregations : tuple of (str, str)
+            Named aggregations as accepted by `pd.DataFrame.agg`, with the keyword being the output column name and the value being a tuple with the column name and the aggregation function.
+
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame with one row per group.
+
+        Examples
+        --------
+        >>> Query(snapshot).group_by("PROFILE", total=("WEIGHT", "sum"), count=("id", "count"))
+        """
+        rows = self.rows()
+        return rows.groupby(list(keys), observed=True, dropna=False).agg(**aggregations)
+
+    def ids(self, id_column="id"):
+        """
+        Get the identifiers of the matching rows.
+
+        Parameters
+        ----------
+        id_column : str, optional
+            The column with the object identifiers. Default is "id".
+
+        Returns
+        -------
+        numpy.ndarray
+            The identifiers.
+        """
+        return np.asarray(_get_column(self.table, id_column))[self.mask()]
+
+    def to_wrappers(self, model=None, id_column="id"):
+        """
+        Get the live model objects of the matching rows.
+
+        Parameters
+        ----------
+        model : ModelWrapper, optional
+            The model where the objects are. By default a new [`ModelWrapper`][pytekla.wrappers.ModelWrapper].
+        id_column : str, optional
+            The column with the object identifiers. Default is "id".
+
+        Returns
+        -------
+        generator
+            A generator of [`ModelObjectWrapper`][pytekla.wrappers.ModelObjectWrapper] objects.
+        """
+        return (model or ModelWrapper()).get_objects_by_ids(self.ids(id_column))
+
+    def __repr__(self):
+        return f"<PyTekla> Query (where: {self.predicate!r})"
+
+
+__all__ = ["Expression", "Field", "F", "Query"]
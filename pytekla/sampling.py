@@ -0,0 +1,246 @@
+import math
+import random
+from collections import Counter
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from .schema import ExtractionPlan
+from .wrappers import BaseWrapper
+
+
+def _unwrap(obj):
+    return obj.unwrap() if isinstance(obj, BaseWrapper) else obj
+
+
+def reservoir_sample(objects, size, seed=None):
+    """
+    Take a uniform random sample of a stream of objects of unknown length, keeping only the sample in memory.
+
+    Parameters
+    ----------
+    objects : iterable
+        The objects, for example the generator returned by [`ModelWrapper.get_all_objects`][pytekla.wrappers.ModelWrapper.get_all_objects].
+    size : int
+        The sample size.
+    seed : int, optional
+        The seed of the random generator, to get the same sample again. Default is None.
+
+    Returns
+    -------
+    tuple
+        The list with the sampled objects (all of them if there are fewer than `size`) and the number of objects in the stream.
+
+    Examples
+    --------
+    >>> sample, count = reservoir_sample(model.get_all_objects(), 100, seed=1)
+    """
+    rng = random.Random(seed)
+    sample = []
+    count = 0
+    for count, obj in enumerate(objects, start=1):
+        if count <= size:
+            sample.append(obj)
+        else:
+            j = rng.randrange(count)
+            if j < size:
+                sample[j] = obj
+    return sample, count
+
+
+def stratified_sample(objects, size, seed=None):
+    """
+    Take a uniform random sample of each CLR type of a stream of objects.
+
+    Parameters
+    ----------
+    objects : iterable of ModelObjectWrapper
+        The objects.
+    size : int
+        The sample size of each type.
+    seed : int, optional
+        The seed of the random generator. Default is None.
+
+    Returns
+    -------
+    dict
+        A dictionary with key being the CLR type name and value being a tuple with the list of sampled Tekla objects and the number of objects of the type.
+    """
+    rng = random.Random(seed)
+    strata = {}
+    for obj in objects:
+        to = _unwrap(obj)
+        type_name = to.GetType().Name
+        stratum = strata.get(type_name)
+        if stratum is None:
+            stratum = strata[type_name] = [[], 0]
+        stratum[1] += 1
+        sample, count = stratum
+        if count <= size:
+            sample.append(to)
+        else:
+            j = rng.randrange(count)
+            if j < size:
+                sample[j] = to
+    return {type_name: (sample, count) for type_name, (sample, count) in strata.items()}
+
+
+def _weighted_quantiles(values, weights, quantiles):
+    """Get the quantiles of a sample where each value represents `weight` objects."""
+    if not len(values):
+        return [np.nan] * len(quantiles)
+    order = np.argsort(values)
+    values, cumulative = values[order], np.cumsum(weights[order])
+    positions = np.searchsorted(cumulative, np.asarray(quantiles) * cumulative[-1], side="left")
+    return values[np.minimum(positions, len(values) - 1)].tolist()
+
+
+def approximate_aggregates(
+    objects,
+    quantities=("WEIGHT",),
+    sample_size=200,
+    confidence=0.95,
+    seed=None,
+    quantiles=(0.1, 0.5, 0.9),
+):
+    """
+    Estimate the total, mean and distribution of some quantities by object type reading only a sample of the objects.
+
+    The objects are counted exactly, but the report properties are only read from a stratified sample
+    (see [`stratified_sample`][pytekla.sampling.stratified_sample]). Every object is still enumerated
+    and its type read (one `GetType` call each), so the cost grows with the size of the model, but the
+    number of report property reads only depends on the number of types. The error bounds use the
+    normal approximation with the finite population correction, and are 0 for the types that were
+    completely read.
+
+    Missing values count as 0 in the means, totals and errors, like in the quantity takeoff, but they
+    are left out of the quantiles. The quantiles of the "total" row weight the sample of each type by
+    the number of objects it represents.
+
+    Parameters
+    ----------
+    objects : iterable of ModelObjectWrapper
+        The objects.
+    quantities : list or dict, optional
+        The report properties to estimate. A list of names is read as `float` properties; a dictionary maps each name to its type. Default is ("WEIGHT",).
+    sample_size : int, optional
+        The sample size of each type. Default is 200.
+    confidence : float, optional
+        The confidence level of the error bounds. Default is 0.95.
+    seed : int, optional
+        The seed of the random generator. Default is None.
+    quantiles : iterable of float, optional
+        The quantiles of the distribution of each quantity estimated from the sample, between 0 and 1. Default is (0.1, 0.5, 0.9).
+
+    Returns
+    -------
+    pd.DataFrame
+        A DataFrame indexed by type, with the "count" and "sampled" number of objects, and for each
+        quantity the "<name>_mean", "<name>_total", "<name>_error" (the half width of the
+        confidence interval of the total) and one "<name>_q<percent>" column per quantile (for
+        example "WEIGHT_q50" for the median). A row "total" sums all the types.
+
+    Examples
+    --------
+    >>> model = ModelWrapper()
+    >>> approximate_aggregates(model.get_all_objects(), ["WEIGHT", "VOLUME"], seed=1)
+                   count  sampled  WEIGHT_mean  WEIGHT_total  WEIGHT_error  WEIGHT_q10  WEIGHT_q50  ...
+    type
+    Beam          812340      200       412.31   3.349e+08      1.21e+07       48.20      301.50
+    ContourPlate  402117      200        35.80   1.440e+07      8.22e+05        4.10       22.70
+    total        1214457      400          NaN   3.493e+08      1.22e+07        7.90      180.20
+    """
+    quantities = quantities if isinstance(quantities, dict) else dict.fromkeys(quantities, float)
+    quantiles = list(quantiles)
+    plan = ExtractionPlan(quantities, quantities)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+    rows = {}
+    # the sampled values of every type and the number of objects each one represents
+    samples = {name: ([], []) for name in quantities}
+    for type_name, (sample, count) in sorted(stratified_sample(objects, sample_size, seed).items()):
+        values = [plan.read(to) for to in sample]
+        row = {"count": count, "sampled": len(sample)}
+        n = len(sample)
+        fpc = math.sqrt((count - n) / (count - 1)) if count > 1 else 0.0
+        for name in quantities:
+            column = np.array(
+                [np.nan if v[name] is None else v[name] for v in values], dtype=np.float64
+            )
+            present = column[~np.isnan(column)]
+            column = np.nan_to_num(column)
+            mean = column.mean() if n else np.nan
+            std = column.std(ddof=1) if n > 1 else 0.0
+            row[f"{name}_mean"] = mean
+            row[f"{name}_total"] = mean * count
+            row[f"{name}_error"] = z * count * std / math.sqrt(n) * fpc if n else np.nan
+            weights = np.full(len(present), count / n if n else 0.0)
+            for q, value in zip(quantiles, _weighted_quantiles(present, weights, quantiles)):
+                row[f"{name}_q{q * 100:g}"] = value
+            samples[name][0].append(present)
+            samples[name][1].append(weights)
+        rows[type_name] = row
+
+    dataframe = pd.DataFrame.from_dict(rows, orient="index")
+    dataframe.index.name = "type"
+    if len(dataframe):
+        total = {"count": dataframe["count"].sum(), "sampled": dataframe["sampled"].sum()}
+        for name in quantities:
+            total[f"{name}_mean"] = np.nan
+            total[f"{name}_total"] = dataframe[f"{name}_total"].sum()
+            # the strata are independent, so their variances are added
+            total[f"{name}_error"] = math.sqrt((dataframe[f"{name}_error"] ** 2).sum())
+            values, weights = (np.concatenate(arrays) for arrays in samples[name])
+            for q, value in zip(quantiles, _weighted_quantiles(values, weights, quantiles)):
+                total[f"{name}_q{q * 100:g}"] = value
+        dataframe.loc["total"] = total
+    return dataframe
+
+
+def estimate_distinct(objects, property_name, sample_size=1000, seed=None):
+    """
+    Estimate the number of distinct values of a string report property, for example the number of profiles.
+
+    The property is read from a reservoir sample, and the number of distinct values is estimated with
+    the Chao1 estimator, which adds to the observed values an estimation of the unseen ones based on how
+    many values were seen once and twice.
+
+    Parameters
+    ----------
+    objects : iterable of ModelObjectWrapper
+        The objects.
+    property_name : str
+        The report property name.
+    sample_size : int, optional
+        The sample size. Default is 1000.
+    seed : int, optional
+        The seed of the random generator. Default is None.
+
+    Returns
+    -------
+    dict
+        A dictionary with the "observed" number of distinct values, the "estimate" of the number of
+        distinct values, and the "frequencies" of the observed values in the sample (a `collections.Counter`).
+
+    Examples
+    --------
+    >>> estimate_distinct(model.get_objects_with_types(["Beam"]), "PROFILE", seed=1)["estimate"]
+    143.5
+    """
+    sample, count = reservoir_sample(objects, sample_size, seed)
+    plan = ExtractionPlan([property_name], {property_name: str})
+    frequencies = Counter(
+        v for v in (plan.read(obj)[property_name] for obj in sample) if v is not None
+    )
+    observed = len(frequencies)
+    if len(sample) == count:
+        return {"observed": observed, "estimate": float(observed), "frequencies": frequencies}
+
+    f1 = sum(1 for n in frequencies.values() if n == 1)
+    f2 = sum(1 for n in frequencies.values() if n == 2)
+    unseen = f1 * f1 / (2 * f2) if f2 else f1 * (f1 - 1) / 2
+    return {"observed": observed, "estimate": observed + unseen, "frequencies": frequencies}
+
+
+__all__ = ["reservoir_sample", "stratified_sample", "approximate_aggregates", "estimate_distinct"]
@@ -0,0 +1,323 @@
+import json
+import os
+
+from System.Collections import Hashtable
+
+from .coreutils.collections import iterable_to_net_array_list
+from .coreutils.properties import split_names_by_type
+from .wrappers import BaseWrapper
+
+
+PROBE_ORDER = (int, float, str)
+
+SCHEMA_FILE_NAME = "pytekla_report_schema.json"
+
+# Number of objects of a type on which the properties that were not found are probed
+REPROBE_LIMIT = 100
+
+_TYPES_BY_NAME = {t.__name__: t for t in PROBE_ORDER}
+
+
+def _unwrap(obj):
+    return obj.unwrap() if isinstance(obj, BaseWrapper) else obj
+
+
+class ExtractionPlan:
+    """
+    A precompiled list of report properties to read from objects of one CLR type.
+
+    Only the properties that apply to the type are requested, all of them with a single
+    `GetAllReportProperties` call per object.
+
+    Parameters
+    ----------
+    names : iterable of str
+        All the requested property names, including the ones that don't apply to the type.
+    properties : dict
+        The properties that apply to the type, with key being the property name and value being the property type.
+    """
+
+    def __init__(self, names, properties):
+        self.names = list(names)
+        self.properties = dict(properties)
+        self._net_names = [
+            iterable_to_net_array_list(n) for n in split_names_by_type(self.properties)
+        ]
+
+    def read(self, obj):
+        """
+        Read the properties of an object.
+
+        Parameters
+        ----------
+        obj : ModelObjectWrapper or Tekla.Structures.Model.ModelObject
+            The object to read.
+
+        Returns
+        -------
+        dict
+            The value of every requested property, None for the ones that were not found or don't apply to the object type.
+        """
+        values = dict.fromkeys(self.names)
+        if self.properties:
+            hash_table = Hashtable()
+            _unwrap(obj).GetAllReportProperties(*self._net_names, hash_table)
+            for name in self.properties:
+                if hash_table.ContainsKey(name):
+                    values[name] = hash_table[name]
+        return values
+
+
+class ReportPropertySchema:
+    """
+    The type of each report property for each CLR type of model object.
+
+    The schema is discovered probing a few objects of each type, so there is no need to declare the
+    property types by hand, and it can be saved next to the model to avoid probing again. A property
+    that was not found in the probed objects of a type is probed again on the next objects of the
+    type that are read, until `REPROBE_LIMIT` objects of the type have been probed. The schemas
+    loaded from a file keep their results: the properties that were not found are not probed again.
+
+    Examples
+    --------
+    >>> from pytekla import ModelWrapper
+    >>> from pytekla.schema import ReportPropertySchema
+    >>> model = ModelWrapper()
+    >>> names = ["PROFILE", "LENGTH", "PHASE", "WEIGHT"]
+    >>> schema = ReportPropertySchema.load_or_discover(model, model.get_all_objects(), names)
+    >>> schema.types["Beam"]
+    {'PROFILE': <class 'str'>, 'LENGTH': <class 'float'>, 'PHASE': <class 'int'>, 'WEIGHT': <class 'float'>}
+    """
+
+    def __init__(self, types=None):
+        """
+        Create a schema.
+
+        Parameters
+        ----------
+        types : dict, optional
+            A dictionary with key being the CLR type name and value being a dictionary with the
+            property names and their types (None for the properties that don't apply to the type). Default is None.
+        """
+        self.types = {k: dict(v) for k, v in (types or {}).items()}
+        self._plans = {}
+        # Number of objects probed of each type
+        self._probed = {}
+
+    def update(self, objects, property_names, sample_size=10):
+        """
+        Probe the properties that are not in the schema yet, or that were not found before in fewer
+        than `REPROBE_LIMIT` objects of the type.
+
+        For every CLR type, up to `sample_size` objects are probed. A property is resolved with the
+        first type of `PROBE_ORDER` (int, float, str) for which it is found; the properties that are
+        not found in any of the probed objects are recorded as not found (None). The enumeration of
+        `objects` stops as soon as every type found so far has its sample; the types that appear
+        later are probed when their objects are read (see [`plan_for`][pytekla.schema.ReportPropertySchema.plan_for]).
+
+        Parameters
+        ----------
+        objects : iterable of ModelObjectWrapper
+            The objects to sample.
+        property_names : iterable of str
+            The report property names to probe.
+        sample_size : int, optional
+            The maximum number of objects probed per CLR type. Default is 10.
+
+        Returns
+        -------
+        ReportPropertySchema
+            The updated schema (self).
+        """
+        property_names = list(property_names)
+        sampled = {}
+        pending = {}
+        incomplete = set()
+
+        for obj in objects:
+            to = _unwrap(obj)
+            type_name = to.GetType().Name
+
+            if type_name not in pending:
+                known = self.types.setdefault(type_name, {})
+                reprobe = self._probed.get(type_name, 0) < REPROBE_LIMIT
+                pending[type_name] = [
+                    n for n in property_names if n not in known or (reprobe and known[n] is None)
+                ]
+                sampled[type_name] = 0
+                if pending[type_name]:
+                    incomplete.add(type_name)
+            if type_name not in incomplete:
+                continue
+            sampled[type_name] += 1
+            self._probed[type_name] = self._probed.get(type_name, 0) + 1
+
+            for name in list(pending[type_name]):
+                for property_type in PROBE_ORDER:
+                    was_found, _ = to.GetReportProperty(name, property_type())
+                    if was_found:
+                        self.types[type_name][name] = property_type
+                        pending[type_name].remove(name)
+                        break
+
+            if not pending[type_name] or sampled[type_name] >= sample_size:
+                incomplete.discard(type_name)
+                if not incomplete:
+                    break
+
+        for type_name, names in pending.items():
+            for name in names:
+                self.types[type_name][name] = None
+
+        self._plans = {k: v for k, v in self._plans.items() if k[0] not in pending}
+        return self
+
+    @classmethod
+    def discover(cls, objects, property_names, sample_size=10):
+        """
+        Create a schema probing a sample of objects. See [`update`][pytekla.schema.ReportPropertySchema.update].
+
+        Returns
+        -------
+        ReportPropertySchema
+            The discovered schema.
+        """
+        return cls().update(objects, property_names, sample_size)
+
+    def plan(self, type_name, property_names):
+        """
+        Get the extraction plan of a CLR type.
+
+        Plans are cached, so asking for the same type and names again is free.
+
+        Parameters
+        ----------
+        type_name : str
+            The CLR type name, for example "Beam".
+        property_names : iterable of str
+            The requested report property names.
+
+        Returns
+        -------
+        ExtractionPlan
+            The plan, with only the properties that are known to apply to the type.
+        """
+        property_names = tuple(property_names)
+        key = (type_name, property_names)
+        try:
+            return self._plans[key]
+        except KeyError:
+            known = self.types.get(type_name, {})
+            properties = {n: known[n] for n in property_names if known.get(n) is not None}
+            plan = self._plans[key] = ExtractionPlan(property_names, properties)
+            return plan
+
+    def plan_for(self, obj, property_names):
+        """
+        Get the extraction plan for the type of an object.
+
+        If the type or any of the properties are not in the schema yet, they are probed on this object
+        first. The properties that were not found before are probed again, until `REPROBE_LIMIT`
+        objects of the type have been probed.
+
+        Parameters
+        ----------
+        obj : ModelObjectWrapper or Tekla.Structures.Model.ModelObject
+            The object.
+        property_names : iterable of str
+            The requested report property names.
+
+        Returns
+        -------
+        ExtractionPlan
+            The plan for the object type.
+        """
+        property_names = tuple(property_names)
+        to = _unwrap(obj)
+        type_name = to.GetType().Name
+        known = self.types.get(type_name, {})
+        if any(n not in known for n in property_names) or (
+            self._probed.get(type_name, 0) < REPROBE_LIMIT
+            and any(known.get(n, str) is None for n in property_names)
+        ):
+            self.update([to], property_names, sample_size=1)
+        return self.plan(type_name, property_names)
+
+    def save(self, path):
+        """
+        Save the schema to a JSON file. The properties that were not found are saved as null.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            The path of the file.
+        """
+        data = {
+            type_name: {n: t.__name__ if t else None for n, t in properties.items()}
+            for type_name, properties in self.types.items()
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a schema saved with [`save`][pytekla.schema.ReportPropertySchema.save].
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            The path of the file.
+
+        Returns
+        -------
+        ReportPropertySchema
+            The loaded schema.
+        """
+        with open(path, "r") as f:
+            data = json.load(f)
+        schema = cls(
+            {
+                type_name: {n: _TYPES_BY_NAME[t] if t else None for n, t in properties.items()}
+                for type_name, properties in data.items()
+            }
+        )
+        # the properties that were not found when the schema was saved are not probed again
+        schema._probed = dict.fromkeys(schema.types, REPROBE_LIMIT)
+        return schema
+
+    @classmethod
+    def load_or_discover(cls, model, objects, property_names, sample_size=10, path=None):
+        """
+        Load the schema cached for a model, probe the properties it doesn't know yet and save it again.
+
+        Parameters
+        ----------
+        model : ModelWrapper
+            The model. By default, the schema is cached in its folder.
+        objects : iterable of ModelObjectWrapper
+            The objects to sample if any property is unknown.
+        property_names : iterable of str
+            The report property names.
+        sample_size : int, optional
+            The maximum number of objects probed per CLR type. Default is 10.
+        path : str or os.PathLike, optional
+            The cache file. By default `SCHEMA_FILE_NAME` in the model folder.
+
+        Returns
+        -------
+        ReportPropertySchema
+            The schema.
+        """
+        path = path or os.path.join(model.unwrap().GetInfo().ModelPath, SCHEMA_FILE_NAME)
+        property_names = list(property_names)
+
+        schema = cls.load(path) if os.path.exists(path) else cls()
+        known = set.intersection(*(set(p) for p in schema.types.values())) if schema.types else set()
+        if not set(property_names) <= known:
+            schema.update(objects, property_names, sample_size)
+            schema.save(path)
+        return schema
+
+
+__all__ = ["ExtractionPlan", "ReportPropertySchema"]
@@ -0,0 +1,381 @@
+import io
+import pickle
+import secrets
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+
+import numpy as np
+
+from .query import Query
+from .snapshot import ModelSnapshot
+
+
+DEFAULT_ADDRESS = ("127.0.0.1", 47150)
+
+AUTHKEY_FILE_PATH = Path.home() / ".pytekla" / "server.key"
+
+
+def _default_authkey():
+    if not AUTHKEY_FILE_PATH.exists():
+        AUTHKEY_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        AUTHKEY_FILE_PATH.write_bytes(secrets.token_bytes(32))
+        AUTHKEY_FILE_PATH.chmod(0o600)
+    return AUTHKEY_FILE_PATH.read_bytes()
+
+
+def _serialize(dataframe):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return "pickle", pickle.dumps(dataframe, protocol=pickle.HIGHEST_PROTOCOL)
+
+    table = pa.Table.from_pandas(dataframe, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return "arrow", sink.getvalue()
+
+
+def _deserialize(serialization, payload, as_arrow=False):
+    if serialization == "arrow":
+        import pyarrow as pa
+
+        table = pa.ipc.open_stream(payload).read_all()
+        return table if as_arrow else table.to_pandas()
+    dataframe = pickle.loads(payload)
+    if as_arrow:
+        import pyarrow as pa
+
+        return pa.Table.from_pandas(dataframe, preserve_index=False)
+    return dataframe
+
+
+class QueryServer:
+    """
+    A long-running local server that keeps a model connection and the extracted tables warm for many scripts.
+
+    Each table is a [`ModelSnapshot`][pytekla.snapshot.ModelSnapshot] of the objects of some types with
+    some report properties. It is extracted the first time a client asks for it and then answered from
+    memory. The results are sent as Apache Arrow streams if `pyarrow` is installed, or pickled otherwise.
+
+    Connections are authenticated with a key, by default a random one stored in `AUTHKEY_FILE_PATH`
+    that only the current user can read.
+
+    Parameters
+    ----------
+    model : ModelWrapper, optional
+        The model. By default a new [`ModelWrapper`][pytekla.wrappers.ModelWrapper].
+    address : tuple or str, optional
+        A (host, port) tuple for TCP, or a path for a UNIX socket (a `\\\\.\\pipe\\name` on Windows). Default is `DEFAULT_ADDRESS`.
+    authkey : bytes, optional
+        The authentication key. By default the key in `AUTHKEY_FILE_PATH`.
+    change_log : ChangeLog, optional
+        A [`ChangeLog`][pytekla.events.ChangeLog] fed by a [`ModelEventListener`][pytekla.events.ModelEventListener].
+        When it is given, the tables with modified or deleted objects are dropped before each request,
+        and all of them when objects are inserted.
+
+    Examples
+    --------
+    >>> from pytekla.server import QueryServer
+    >>> QueryServer().serve_forever()
+    """
+
+    def __init__(self, model=None, address=DEFAULT_ADDRESS, authkey=None, change_log=None):
+        if model is None:
+            from .wrappers import ModelWrapper
+
+            model = ModelWrapper()
+        self.model = model
+        self.change_log = change_log
+        self._tables = {}
+        # the tables being extracted, by key, and the number of times the cache was invalidated
+        self._pending = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._authkey = authkey or _default_authkey()
+        self._listener = Listener(address, authkey=self._authkey)
+        self._running = False
+        self.requests = 0
+
+    @property
+    def address(self):
+        """The address the server is listening on."""
+        return self._listener.address
+
+    def get_table(self, types=None, report_properties=None):
+        """
+        Get a cached table, extracting it from the model if needed.
+
+        The extraction doesn't block the other requests. The requests of a table that is being
+        extracted wait for that extraction instead of starting another one.
+
+        Parameters
+        ----------
+        types : list of str, optional
+            The type names of the objects, as accepted by [`ModelWrapper.get_objects_with_types`][pytekla.wrappers.ModelWrapper.get_objects_with_types]. By default all the objects.
+        report_properties : dict, optional
+            The report properties, with key being the name and value being the type. Default is None.
+
+        Returns
+        -------
+        ModelSnapshot
+            The table.
+        """
+        report_properties = dict(report_properties or {})
+        key = (
+            tuple(types) if types else None,
+            tuple(sorted((n, t.__name__) for n, t in report_properties.items())),
+        )
+        with self._lock:
+            self._apply_changes()
+            table = self._tables.get(key)
+            if table is not None:
+                return table
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = Future()
+                generation = self._generation
+            else:
+                generation = None
+        if generation is None:
+            return future.result()
+
+        try:
+            objects = (
+                self.model.get_objects_with_types(list(types))
+                if types
+                else self.model.get_all_objects()
+            )
+            table = ModelSnapshot.from_objects(objects, report_properties)
+        except BaseException as error:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(error)
+            raise
+        with self._lock:
+            del self._pending[key]
+            # a table extracted while the cache was invalidated may be stale, so it isn't kept
+            if generation == self._generation:
+                self._tables[key] = table
+        future.set_result(table)
+        return table
+
+    def _drop_tables(self, ids=None):
+        self._generation += 1
+        if ids is None:
+            self._tables.clear()
+            return
+        for key, table in list(self._tables.items()):
+            if np.isin(table.ids, ids).any():
+                del self._tables[key]
+
+    def _apply_changes(self):
+        if self.change_log is None:
+            return
+        changes, reset = self.change_log.drain()
+        if reset or len(changes["inserted"]):
+            self._drop_tables()
+            return
+        changed = np.concatenate([changes["modified"], changes["deleted"]])
+        if len(changed):
+            self._drop_tables(changed)
+
+    def invalidate(self, ids=None):
+        """
+        Drop the cached tables that contain any of the objects.
+
+        This makes the server an invalidator that can be registered in a [`ChangeLog`][pytekla.events.ChangeLog].
+
+        Parameters
+        ----------
+        ids : array-like of int, optional
+            The identifiers of the changed objects. By default every table is dropped.
+        """
+        with self._lock:
+            self._drop_tables(None if ids is None else np.asarray(ids, dtype=np.int64))
+
+    def handle(self, request):
+        """
+        Answer a request.
+
+        Parameters
+        ----------
+        request : dict
+            The request, with an "op" item being one of "ping", "query", "tables", "invalidate" or "shutdown".
+            A "query" request can have the "types" and "report_properties" of the table, a "where" predicate
+            ([`Expression`][pytekla.query.Expression]) and the output "columns".
+
+        Returns
+        -------
+        dict
+            The response, with an "ok" item and either a "result" or an "error".
+        """
+        self.requests += 1
+        op = request.get("op")
+        try:
+            if op == "ping":
+                return {"ok": True, "result": "pong"}
+            if op == "query":
+                start = time.perf_counter()
+                table = self.get_table(request.get("types"), request.get("report_properties"))
+                query = Query(table, request.get("where"))
+                if request.get("columns"):
+                    query = query.select(*request["columns"])
+                serialization, payload = _serialize(query.rows())
+                return {
+                    "ok": True,
+                    "result": payload,
+                    "serialization": serialization,
+                    "time": time.perf_counter() - start,
+                }
+            if op == "tables":
+                with self._lock:
+                    return {"ok": True, "result": {k: len(t) for k, t in self._tables.items()}}
+            if op == "invalidate":
+                self.invalidate(request.get("ids"))
+                return {"ok": True, "result": None}
+            if op == "shutdown":
+                self._running = False
+                return {"ok": True, "result": None}
+            return {"ok": False, "error": f"Unknown operation {op!r}"}
+        except Exception as error:
+            return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+
+    def _serve_connection(self, connection):
+        with connection:
+            while True:
+                try:
+                    request = connection.recv()
+                except (EOFError, OSError):
+                    return
+                connection.send(self.handle(request))
+                if not self._running:
+                    # wake up the accept call of serve_forever
+                    Client(self.address, authkey=self._authkey).close()
+                    return
+
+    def serve_forever(self):
+        """Accept clients until a "shutdown" request is received. Each client is served in a thread."""
+        self._running = True
+        try:
+            while self._running:
+                try:
+                    connection = self._listener.accept()
+                except OSError:
+                    break
+                except Exception:
+                    # failed authentication
+                    continue
+                if not self._running:
+                    connection.close()
+                    break
+                threading.Thread(
+                    target=self._serve_connection, args=(connection,), daemon=True
+                ).start()
+        finally:
+            self._listener.close()
+
+    def __repr__(self):
+        return f"<PyTekla> QueryServer ({self.address}, {len(self._tables)} cached tables)"
+
+
+class QueryClient:
+    """
+    A thin client of a [`QueryServer`][pytekla.server.QueryServer]. It doesn't need Tekla Structures.
+
+    Parameters
+    ----------
+    address : tuple or str, optional
+        The address of the server. Default is `DEFAULT_ADDRESS`.
+    authkey : bytes, optional
+        The authentication key. By default the key in `AUTHKEY_FILE_PATH`.
+
+    Examples
+    --------
+    >>> from pytekla.query import F
+    >>> from pytekla.server import QueryClient
+    >>> with QueryClient() as client:
+    ...     df = client.query(["Beam"], {"PROFILE": str, "WEIGHT": float}, where=F.WEIGHT > 100)
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=None):
+        self._connection = Client(address, authkey=authkey or _default_authkey())
+
+    def _request(self, **request):
+        self._connection.send(request)
+        response = self._connection.recv()
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response
+
+    def ping(self):
+        """Check that the server answers."""
+        return self._request(op="ping")["result"] == "pong"
+
+    def query(self, types=None, report_properties=None, where=None, columns=None, as_arrow=False):
+        """
+        Get the rows of a table.
+
+        Parameters
+        ----------
+        types : list of str, optional
+            The type names of the objects. By default all the objects.
+        report_properties : dict, optional
+            The report properties, with key being the name and value being the type. Default is None.
+        where : Expression, optional
+            A predicate evaluated by the server. By default all the rows.
+        columns : list of str, optional
+            The columns to return. By default all of them.
+        as_arrow : bool, optional
+            If True, a `pyarrow.Table` is returned instead of a pandas DataFrame. Default is False.
+
+        Returns
+        -------
+        pd.DataFrame or pyarrow.Table
+            The rows.
+
+        Raises
+        ------
+        RuntimeError
+            If the server could not answer the query.
+        """
+        response = self._request(
+            op="query",
+            types=types,
+            report_properties=report_properties,
+            where=where,
+            columns=columns,
+        )
+        return _deserialize(response["serialization"], response["result"], as_arrow)
+
+    def tables(self):
+        """Get the number of rows of each cached table, by table key."""
+        return self._request(op="tables")["result"]
+
+    def invalidate(self, ids=None):
+        """Drop the cached tables with any of the objects (all of them by default)."""
+        self._request(op="invalidate", ids=None if ids is None else list(ids))
+
+    def shutdown(self):
+        """Stop the server."""
+        self._request(op="shutdown")
+
+    def close(self):
+        """Close the connection."""
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+__all__ = ["QueryServer", "QueryClient"]
+
+
+if __name__ == "__main__":
+    QueryServer().serve_forever()
@@ -0,0 +1,151 @@
+import threading
+
+from Tekla.Structures.Drawing import DrawingHandler
+from Tekla.Structures.Model import UI, Model
+
+
+_handles = {}
+_lock = threading.RLock()
+
+# Handles that depend on the model connection and must be recreated with it
+_MODEL_HANDLES = ("model", "model_object_selector", "picker", "ui_model_object_selector")
+
+
+def _get_handle(key, factory):
+    with _lock:
+        try:
+            return _handles[key]
+        except KeyError:
+            handle = _handles[key] = factory()
+            return handle
+
+
+def _drop(keys):
+    with _lock:
+        for key in keys:
+            _handles.pop(key, None)
+
+
+def get_model(check_connection=True):
+    """
+    Get the `Tekla.Structures.Model.Model` shared by the whole process.
+
+    Parameters
+    ----------
+    check_connection : bool, optional
+        If True and the shared model is not connected to Tekla Structures (for example, because
+        Tekla Structures was restarted), the model and all the handles that depend on it are
+        recreated. Default is True.
+
+    Returns
+    -------
+    Tekla.Structures.Model.Model
+        The shared model.
+
+    Examples
+    --------
+    >>> from pytekla import session
+    >>> model = session.get_model()
+    """
+    with _lock:
+        model = _get_handle("model", Model)
+        if check_connection and not model.GetConnectionStatus():
+            _drop(_MODEL_HANDLES)
+            model = _get_handle("model", Model)
+        return model
+
+
+def get_model_object_selector():
+    """
+    Get the shared `Tekla.Structures.Model.ModelObjectSelector` of the shared model.
+
+    Returns
+    -------
+    Tekla.Structures.Model.ModelObjectSelector
+        The shared selector.
+    """
+    return _get_handle(
+        "model_object_selector", lambda: get_model().GetModelObjectSelector()
+    )
+
+
+def get_picker():
+    """
+    Get the shared `Tekla.Structures.Model.UI.Picker`.
+
+    Returns
+    -------
+    Tekla.Structures.Model.UI.Picker
+        The shared picker.
+    """
+    return _get_handle("picker", UI.Picker)
+
+
+def get_ui_model_object_selector():
+    """
+    Get the shared `Tekla.Structures.Model.UI.ModelObjectSelector`.
+
+    Returns
+    -------
+    Tekla.Structures.Model.UI.ModelObjectSelector
+        The shared UI selector.
+    """
+    return _get_handle("ui_model_object_selector", UI.ModelObjectSelector)
+
+
+def get_drawing_handler(check_connection=True):
+    """
+    Get the `Tekla.Structures.Drawing.DrawingHandler` shared by the whole process.
+
+    Parameters
+    ----------
+    check_connection : bool, optional
+        If True and the shared drawing handler is not connected to Tekla Structures, it is recreated. Default is True.
+
+    Returns
+    -------
+    Tekla.Structures.Drawing.DrawingHandler
+        The shared drawing handler.
+    """
+    with _lock:
+        drawing_handler = _get_handle("drawing_handler", DrawingHandler)
+        if check_connection and not drawing_handler.GetConnectionStatus():
+            _drop(["drawing_handler"])
+            drawing_handler = _get_handle("drawing_handler", DrawingHandler)
+        return drawing_handler
+
+
+def is_connected():
+    """
+    Check if the shared model is connected to a running Tekla Structures.
+
+    Returns
+    -------
+    bool
+        True if the shared model is connected.
+    """
+    return bool(get_model(check_connection=False).GetConnectionStatus())
+
+
+def reset():
+    """
+    Drop all the shared handles. They are created again the next time they are requested.
+
+    Examples
+    --------
+    >>> from pytekla import session
+    >>> session.reset()
+    """
+    with _lock:
+        _handles.clear()
+
+
+__all__ = [
+    "get_model",
+    "get_model_object_selector",
+    "get_picker",
+    "get_ui_model_object_selector",
+    "get_drawing_handler",
+    "is_connected",
+    "reset",
+]
@@ -0,0 +1,613 @@
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from System.Collections import Hashtable
+from Tekla.Structures.Model import Part
+
+from .coreutils.collections import iterable_to_net_array_list
+from .coreutils.properties import split_names_by_type
+from .wrappers import BaseWrapper, ModelWrapper
+
+
+MISSING_INT = np.iinfo(np.int64).min
+
+SNAPSHOT_FILE_MAGIC = b"PYTKSNAP"
+SNAPSHOT_FILE_VERSION = 1
+_ALIGNMENT = 64
+
+
+class StringColumn:
+    """
+    A dictionary encoded column of strings.
+
+    Every distinct string is stored once in `categories` and each row only keeps an integer code
+    pointing to it. Missing values are stored with the code -1.
+
+    Parameters
+    ----------
+    codes : array-like of int
+        The category code of each row.
+    categories : sequence of str
+        The distinct strings of the column.
+    """
+
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes, categories):
+        self.codes = np.asarray(codes, dtype=np.int32)
+        self.categories = tuple(categories)
+
+    @classmethod
+    def from_values(cls, values):
+        """
+        Encode a sequence of strings.
+
+        Parameters
+        ----------
+        values : iterable of str or None
+            The strings to encode. None is stored as a missing value.
+
+        Returns
+        -------
+        StringColumn
+            The encoded column.
+
+        Examples
+        --------
+        >>> column = StringColumn.from_values(["HEA200", "HEA200", None])
+        >>> column.codes
+        array([ 0,  0, -1], dtype=int32)
+        """
+        lookup = {}
+        codes = []
+        for value in values:
+            if value is None:
+                codes.append(-1)
+            else:
+                codes.append(lookup.setdefault(value, len(lookup)))
+        return cls(codes, lookup)
+
+    def decode(self):
+        """
+        Get the column as an array of Python strings.
+
+        Returns
+        -------
+        numpy.ndarray
+            An object array with the strings of each row and None for the missing ones.
+        """
+        table = np.array(self.categories + (None,), dtype=object)
+        return table[self.codes]
+
+    def take(self, indices):
+        return StringColumn(self.codes[indices], self.categories)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getstate__(self):
+        return self.codes, self.categories
+
+    def __setstate__(self, state):
+        self.codes, self.categories = state
+
+
+def _align(offset):
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+class _BlockWriter:
+    """Collects the arrays of a snapshot file and assigns them aligned offsets."""
+
+    def __init__(self):
+        self.arrays = []
+        self.size = 0
+
+    def add(self, array):
+        array = np.ascontiguousarray(array)
+        if array.dtype.hasobject:
+            raise TypeError("Only fixed width numeric columns can be saved")
+        offset = _align(self.size)
+        self.arrays.append((offset, array))
+        self.size = offset + array.nbytes
+        return {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+
+    def add_strings(self, strings):
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(e) for e in encoded], dtype=np.int64)
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return {"offsets": self.add(offsets), "data": self.add(blob)}
+
+
+def _read_block(buffer, start, info):
+    count = int(np.prod(info["shape"], dtype=np.int64))
+    if count == 0:
+        return np.empty(info["shape"], dtype=np.dtype(info["dtype"]))
+    array = np.frombuffer(
+        buffer, dtype=np.dtype(info["dtype"]), count=count, offset=start + info["offset"]
+    )
+    return array.reshape(info["shape"])
+
+
+def _read_strings(buffer, start, info):
+    offsets = _read_block(buffer, start, info["offsets"])
+    data = _read_block(buffer, start, info["data"])
+    return tuple(
+        data[offsets[i] : offsets[i + 1]].tobytes().decode("utf-8")
+        for i in range(len(offsets) - 1)
+    )
+
+
+def _as_column(values):
+    if isinstance(values, (StringColumn, np.ndarray)):
+        return values
+    values = list(values)
+    if any(isinstance(v, str) for v in values):
+        return StringColumn.from_values(values)
+    return np.asarray(values)
+
+
+def _take_column(column, indices):
+    if isinstance(column, StringColumn):
+        return column.take(indices)
+    return column[indices]
+
+
+class ModelSnapshot:
+    """
+    A compact and picklable copy of the data of a group of model objects.
+
+    The data is stored in columns backed by NumPy arrays, so the snapshot can be sent to other processes
+    and analysed there without any connection to Tekla Structures. Repeated strings (types, profiles,
+    materials...) are stored only once per column.
+
+    Use [`ModelSnapshot.from_objects`][pytekla.snapshot.ModelSnapshot.from_objects] to create it from the
+    objects returned by any of the [`ModelWrapper`][pytekla.wrappers.ModelWrapper] methods.
+
+    Examples
+    --------
+    >>> from pytekla import ModelWrapper
+    >>> from pytekla.snapshot import ModelSnapshot
+    >>> model = ModelWrapper()
+    >>> beams = model.get_objects_with_types(["Beam"])
+    >>> snapshot = ModelSnapshot.from_objects(beams, report_properties={"PROFILE": str, "LENGTH": float})
+    >>> snapshot["PROFILE"]
+    array(['HEA200', 'HEA200', 'IPE300'], dtype=object)
+    """
+
+    def __init__(self, ids, types, columns=None, bbox_min=None, bbox_max=None):
+        """
+        Create a snapshot from already extracted data.
+
+        Parameters
+        ----------
+        ids : array-like of int
+            The identifier of each object.
+        types : StringColumn or iterable of str
+            The CLR type name of each object.
+        columns : dict, optional
+            The property columns, with key being the column name and value being a NumPy array,
+            a [`StringColumn`][pytekla.snapshot.StringColumn] or an iterable of values. Default is None.
+        bbox_min : array-like, optional
+            A (N, 3) array with the minimum point of the bounding box of each object. Default is None.
+        bbox_max : array-like, optional
+            A (N, 3) array with the maximum point of the bounding box of each object. Default is None.
+
+        Raises
+        ------
+        ValueError
+            If the columns do not have the same length as `ids`.
+        """
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.types = types if isinstance(types, StringColumn) else StringColumn.from_values(types)
+        self.columns = {k: _as_column(v) for k, v in (columns or {}).items()}
+        self.bbox_min = None if bbox_min is None else np.asarray(bbox_min, dtype=np.float64)
+        self.bbox_max = None if bbox_max is None else np.asarray(bbox_max, dtype=np.float64)
+        self.path = None
+        # The (start, stop) rows of the file that the snapshot covers, if it is a part of an opened file
+        self._row_range = None
+
+        size = len(self.ids)
+        for name, column in [("types", self.types), *self.columns.items()]:
+            if len(column) != size:
+                raise ValueError(f"Column '{name}' has {len(column)} rows, expected {size}")
+
+    @classmethod
+    def from_objects(cls, objects, report_properties=None, geometry=False):
+        """
+        Materialize the data of model objects into a snapshot.
+
+        Every requested report property is read with a single call per object.
+
+        Parameters
+        ----------
+        objects : iterable of ModelObjectWrapper or Tekla.Structures.Model.ModelObject
+            The objects to extract the data from.
+        report_properties : dict, optional
+            A dictionary of report properties to be extracted from each object, with key being the report property name and value being the report property type. Default is None.
+        geometry : bool, optional
+            A flag indicating if the bounding box of the parts should be extracted. Objects that are not parts get NaN coordinates. Default is False.
+
+        Returns
+        -------
+        ModelSnapshot
+            The snapshot with the extracted data.
+
+        Raises
+        ------
+        TypeError
+            If any report property type is not `str`, `int`, or `float`.
+        """
+        report_properties = report_properties or {}
+        net_names = [
+            iterable_to_net_array_list(names)
+            for names in split_names_by_type(report_properties)
+        ]
+
+        ids, types, bbox_min, bbox_max = [], [], [], []
+        values = {name: [] for name in report_properties}
+
+        for obj in objects:
+            to = obj.unwrap() if isinstance(obj, BaseWrapper) else obj
+            ids.append(to.Identifier.ID)
+            types.append(to.GetType().Name)
+
+            if report_properties:
+                hash_table = Hashtable()
+                to.GetAllReportProperties(*net_names, hash_table)
+                for name in report_properties:
+                    values[name].append(
+                        hash_table[name] if hash_table.ContainsKey(name) else None
+                    )
+
+            if geometry:
+                if isinstance(to, Part):
+                    solid = to.GetSolid()
+                    low, high = solid.MinimumPoint, solid.MaximumPoint
+                    bbox_min.append((low.X, low.Y, low.Z))
+                    bbox_max.append((high.X, high.Y, high.Z))
+                else:
+                    bbox_min.append((np.nan,) * 3)
+                    bbox_max.append((np.nan,) * 3)
+
+        columns = {}
+        for name, property_type in report_properties.items():
+            column_values = values[name]
+            if property_type is str:
+                columns[name] = StringColumn.from_values(column_values)
+            elif property_type is int:
+                columns[name] = np.array(
+                    [MISSING_INT if v is None else v for v in column_values], dtype=np.int64
+                )
+            else:
+                columns[name] = np.array(
+                    [np.nan if v is None else v for v in column_values], dtype=np.float64
+                )
+
+        if geometry:
+            bbox_min = np.array(bbox_min, dtype=np.float64).reshape(-1, 3)
+            bbox_max = np.array(bbox_max, dtype=np.float64).reshape(-1, 3)
+        else:
+            bbox_min = bbox_max = None
+
+        return cls(ids, StringColumn.from_values(types), columns, bbox_min, bbox_max)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, name):
+        """
+        Get a decoded column.
+
+        Parameters
+        ----------
+        name : str
+            The column name. Besides the property columns, "id" and "type" are also available.
+
+        Returns
+        -------
+        numpy.ndarray
+            The values of the column. String columns are returned as object arrays.
+        """
+        if name == "id":
+            return self.ids
+        if name == "type":
+            return self.types.decode()
+        column = self.columns[name]
+        if isinstance(column, StringColumn):
+            return column.decode()
+        return column
+
+    def take(self, indices):
+        """
+        Get a new snapshot with only the given rows.
+
+        Parameters
+        ----------
+        indices : array-like of int or bool
+            The positions (or a boolean mask) of the rows to keep.
+
+        Returns
+        -------
+        ModelSnapshot
+            The snapshot with the selected rows.
+        """
+        indices = np.asarray(indices)
+        return ModelSnapshot(
+            self.ids[indices],
+            self.types.take(indices),
+            {k: _take_column(v, indices) for k, v in self.columns.items()},
+            None if self.bbox_min is None else self.bbox_min[indices],
+            None if self.bbox_max is None else self.bbox_max[indices],
+        )
+
+    def _slice(self, start, stop):
+        rows = slice(start, stop)
+        part = ModelSnapshot(
+            self.ids[rows],
+            self.types.take(rows),
+            {k: _take_column(v, rows) for k, v in self.columns.items()},
+            None if self.bbox_min is None else self.bbox_min[rows],
+            None if self.bbox_max is None else self.bbox_max[rows],
+        )
+        if self.path is not None:
+            offset = self._row_range[0] if self._row_range is not None else 0
+            part.path = self.path
+            part._row_range = (offset + start, offset + stop)
+        return part
+
+    def split(self, chunks):
+        """
+        Split the snapshot in consecutive parts of similar size.
+
+        The parts are views over the rows of the snapshot, without copying them. The parts of an
+        opened snapshot file are pickled as the path and their rows.
+
+        Parameters
+        ----------
+        chunks : int
+            The number of parts.
+
+        Returns
+        -------
+        list of ModelSnapshot
+            The parts. Empty parts are omitted.
+        """
+        return [
+            self._slice(indices[0], indices[-1] + 1)
+            for indices in np.array_split(np.arange(len(self)), chunks)
+            if len(indices)
+        ]
+
+    def to_dataframe(self):
+        """
+        Convert the snapshot to a pandas DataFrame.
+
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame with the "id" and "type" columns followed by the property columns.
+            String columns are returned as categoricals.
+        """
+        import pandas as pd
+
+        data = {
+            "id": self.ids,
+            "type": pd.Categorical.from_codes(self.types.codes, self.types.categories),
+        }
+        for name, column in self.columns.items():
+            if isinstance(column, StringColumn):
+                data[name] = pd.Categorical.from_codes(column.codes, column.categories)
+            elif column.dtype == np.int64:
+                data[name] = pd.array(
+                    np.where(column == MISSING_INT, None, column), dtype="Int64"
+                )
+            else:
+                data[name] = column
+        return pd.DataFrame(data)
+
+    def to_wrappers(self, rows=None, model=None):
+        """
+        Resolve the snapshot rows back to the live objects of the model.
+
+        Parameters
+        ----------
+        rows : array-like of int or bool, optional
+            The positions (or a boolean mask) of the rows to resolve. By default all of them.
+        model : ModelWrapper, optional
+            The model where the objects are. By default a new [`ModelWrapper`][pytekla.wrappers.ModelWrapper].
+
+        Returns
+        -------
+        generator
+            A generator of [`ModelObjectWrapper`][pytekla.wrappers.ModelObjectWrapper] objects.
+
+        Examples
+        --------
+        >>> long_beams = snapshot["LENGTH"] > 6000
+        >>> for beam in snapshot.to_wrappers(long_beams):
+        >>>     print(beam.name)
+        """
+        ids = self.ids if rows is None else self.ids[np.asarray(rows)]
+        return (model or ModelWrapper()).get_objects_by_ids(ids)
+
+    def save(self, path):
+        """
+        Save the snapshot to a binary file that can be memory mapped with [`ModelSnapshot.open`][pytekla.snapshot.ModelSnapshot.open].
+
+        The file starts with a magic string, the size of a JSON header and the header itself, which
+        describes where each column is. Then every column is stored as a raw, 64 bytes aligned,
+        little endian array. String columns are stored as their codes plus a string table.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            The path of the file to write.
+
+        Raises
+        ------
+        TypeError
+            If a column is not a numeric array or a [`StringColumn`][pytekla.snapshot.StringColumn].
+        """
+        writer = _BlockWriter()
+        header = {
+            "version": SNAPSHOT_FILE_VERSION,
+            "rows": len(self),
+            "ids": writer.add(self.ids.astype("<i8")),
+            "types": {
+                "codes": writer.add(self.types.codes.astype("<i4")),
+                "categories": writer.add_strings(self.types.categories),
+            },
+            "columns": [],
+        }
+        for name, column in self.columns.items():
+            if isinstance(column, StringColumn):
+                header["columns"].append(
+                    {
+                        "name": name,
+                        "codes": writer.add(column.codes.astype("<i4")),
+                        "categories": writer.add_strings(column.categories),
+                    }
+                )
+            else:
+                column = column.astype(column.dtype.newbyteorder("<"))
+                header["columns"].append({"name": name, "values": writer.add(column)})
+        for name in ("bbox_min", "bbox_max"):
+            bbox = getattr(self, name)
+            header[name] = None if bbox is None else writer.add(bbox.astype("<f8"))
+
+        header_bytes = json.dumps(header).encode("utf-8")
+        preamble_size = len(SNAPSHOT_FILE_MAGIC) + 8 + len(header_bytes)
+        data_start = _align(preamble_size)
+
+        with open(path, "wb") as f:
+            f.write(SNAPSHOT_FILE_MAGIC)
+            f.write(len(header_bytes).to_bytes(8, "little"))
+            f.write(header_bytes)
+            for offset, array in writer.arrays:
+                f.write(b"\0" * (data_start + offset - f.tell()))
+                f.write(array.tobytes())
+
+    @classmethod
+    def open(cls, path):
+        """
+        Open a snapshot file saved with [`ModelSnapshot.save`][pytekla.snapshot.ModelSnapshot.save] without reading it.
+
+        The file is memory mapped and the columns are read only NumPy views over it, so the
+        open time does not depend on the number of objects and all the processes that open the
+        same file share a single copy in memory. Snapshots opened this way, and the parts they are
+        split in, are pickled as their path and rows, so sending them to
+        [`map_snapshot`][pytekla.snapshot.map_snapshot] workers is cheap too.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            The path of the snapshot file.
+
+        Returns
+        -------
+        ModelSnapshot
+            The memory mapped snapshot.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a snapshot file or its version is not supported.
+
+        Examples
+        --------
+        >>> snapshot.save("beams.snapshot")
+        >>> snapshot = ModelSnapshot.open("beams.snapshot")
+        """
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic_size = len(SNAPSHOT_FILE_MAGIC)
+        if buffer[:magic_size] != SNAPSHOT_FILE_MAGIC:
+            raise ValueError(f"'{path}' is not a snapshot file")
+        header_size = int.from_bytes(buffer[magic_size : magic_size + 8], "little")
+        header_end = magic_size + 8 + header_size
+        header = json.loads(buffer[magic_size + 8 : header_end].decode("utf-8"))
+        if header["version"] != SNAPSHOT_FILE_VERSION:
+            raise ValueError(f"Unsupported snapshot file version: {header['version']}")
+        start = _align(header_end)
+
+        def read_string_column(info):
+            return StringColumn(
+                _read_block(buffer, start, info["codes"]),
+                _read_strings(buffer, start, info["categories"]),
+            )
+
+        columns = {}
+        for info in header["columns"]:
+            if "codes" in info:
+                columns[info["name"]] = read_string_column(info)
+            else:
+                columns[info["name"]] = _read_block(buffer, start, info["values"])
+
+        bbox_min, bbox_max = (
+            None if header[name] is None else _read_block(buffer, start, header[name])
+            for name in ("bbox_min", "bbox_max")
+        )
+
+        snapshot = cls(
+            _read_block(buffer, start, header["ids"]),
+            read_string_column(header["types"]),
+            columns,
+            bbox_min,
+            bbox_max,
+        )
+        snapshot.path = os.fspath(path)
+        return snapshot
+
+    def __reduce_ex__(self, protocol):
+        if self.path is not None:
+            return _open_snapshot, (self.path, self._row_range)
+        return super().__reduce_ex__(protocol)
+
+    def __repr__(self):
+        return f"<PyTekla> ModelSnapshot ({len(self)} objects, columns: {list(self.columns)})"
+
+
+def _open_snapshot(path, row_range=None):
+    snapshot = ModelSnapshot.open(path)
+    return snapshot if row_range is None else snapshot._slice(*row_range)
+
+
+def map_snapshot(func, snapshot, chunks=None, max_workers=None):
+    """
+    Apply a function to the parts of a snapshot using a pool of processes.
+
+    Parameters
+    ----------
+    func : function
+        A picklable (module level) function that takes a [`ModelSnapshot`][pytekla.snapshot.ModelSnapshot] and returns a picklable value.
+    snapshot : ModelSnapshot
+        The snapshot to process.
+    chunks : int, optional
+        The number of parts in which the snapshot is split. By default the number of workers.
+    max_workers : int, optional
+        The maximum number of processes. By default the number of processors of the machine.
+
+    Returns
+    -------
+    list
+        The results of each part, in the same order as the rows of the snapshot.
+
+    Examples
+    --------
+    >>> def total_length(part):
+    ...     return part["LENGTH"].sum()
+    >>> sum(map_snapshot(total_length, snapshot))
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    parts = snapshot.split(chunks or max_workers)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(func, parts))
+
+
+__all__ = ["StringColumn", "ModelSnapshot", "map_snapshot"]
@@ -0,0 +1,146 @@
+import itertools
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from .snapshot import ModelSnapshot
+from .wrappers import BaseWrapper
+
+
+TileResult = namedtuple("TileResult", ["index", "min_point", "max_point", "snapshot"])
+
+
+def tile_grid(min_point, max_point, shape):
+    """
+    Split a box in a regular grid of tiles.
+
+    Parameters
+    ----------
+    min_point : (x: float, y: float, z: float)
+        The minimum point of the box.
+    max_point : (x: float, y: float, z: float)
+        The maximum point of the box.
+    shape : int or (int, int, int)
+        The number of tiles along each axis. A single number is used for the three axes.
+
+    Returns
+    -------
+    numpy.ndarray
+        The minimum and maximum point of each tile, with shape (tiles, 2, 3). Tiles are ordered by X, then Y, then Z.
+
+    Raises
+    ------
+    ValueError
+        If any number of tiles is smaller than 1.
+
+    Examples
+    --------
+    >>> tile_grid((0, 0, 0), (100, 100, 10), (2, 2, 1))[1]
+    array([[  0.,  50.,   0.],
+           [ 50., 100.,  10.]])
+    """
+    low = np.asarray(min_point, dtype=np.float64)
+    high = np.asarray(max_point, dtype=np.float64)
+    shape = np.broadcast_to(np.asarray(shape, dtype=np.int64), (3,))
+    if (shape < 1).any():
+        raise ValueError("The number of tiles along each axis must be at least 1")
+
+    edges = [np.linspace(low[axis], high[axis], shape[axis] + 1) for axis in range(3)]
+    tiles = [
+        [
+            [edges[0][i], edges[1][j], edges[2][k]],
+            [edges[0][i + 1], edges[1][j + 1], edges[2][k + 1]],
+        ]
+        for i, j, k in itertools.product(*(range(n) for n in shape))
+    ]
+    return np.array(tiles, dtype=np.float64).reshape(-1, 2, 3)
+
+
+def sweep_bounding_box(
+    model,
+    min_point,
+    max_point,
+    shape=(4, 4, 1),
+    report_properties=None,
+    geometry=False,
+    max_workers=None,
+):
+    """
+    Get the objects inside a region tile by tile, querying several tiles at once.
+
+    The region is split with [`tile_grid`][pytekla.spatial.tile_grid] and every tile is queried with
+    [`ModelWrapper.get_objects_by_bounding_box`][pytekla.wrappers.ModelWrapper.get_objects_by_bounding_box]
+    in a pool of threads. An object that spans several tiles is only returned by the first tile that
+    finds it, before its properties are read. At most two tiles per thread are pending at the same
+    time, so only a few tiles are kept in memory.
+
+    Parameters
+    ----------
+    model : ModelWrapper
+        The model.
+    min_point : (x: float, y: float, z: float)
+        The minimum point of the region.
+    max_point : (x: float, y: float, z: float)
+        The maximum point of the region.
+    shape : int or (int, int, int), optional
+        The number of tiles along each axis. Default is (4, 4, 1).
+    report_properties : dict, optional
+        The report properties read from the objects of each tile. See [`ModelSnapshot.from_objects`][pytekla.snapshot.ModelSnapshot.from_objects].
+    geometry : bool, optional
+        A flag indicating if the bounding box of the parts should be read. Default is False.
+    max_workers : int, optional
+        The number of threads. By default the number of processors of the machine.
+
+    Returns
+    -------
+    generator
+        A generator of `TileResult` named tuples (index, min_point, max_point, snapshot), in the order the tiles are completed.
+
+    Examples
+    --------
+    >>> from pytekla import ModelWrapper
+    >>> from pytekla.spatial import sweep_bounding_box
+    >>> model = ModelWrapper()
+    >>> for tile in sweep_bounding_box(model, (0, 0, -1000), (120000, 80000, 30000), shape=(6, 4, 1), report_properties={"WEIGHT": float}):
+    ...     print(tile.index, len(tile.snapshot), tile.snapshot["WEIGHT"].sum())
+    """
+    tiles = tile_grid(min_point, max_point, shape)
+    max_workers = max_workers or os.cpu_count() or 1
+    seen = set()
+    lock = threading.Lock()
+
+    def query(index):
+        low, high = (tuple(float(c) for c in point) for point in tiles[index])
+        claimed = []
+        objects = [
+            o.unwrap() if isinstance(o, BaseWrapper) else o
+            for o in model.get_objects_by_bounding_box(low, high)
+        ]
+        with lock:
+            for to in objects:
+                _id = to.Identifier.ID
+                if _id not in seen:
+                    seen.add(_id)
+                    claimed.append(to)
+        return TileResult(
+            index, low, high, ModelSnapshot.from_objects(claimed, report_properties, geometry)
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        indices = iter(range(len(tiles)))
+        pending = {
+            executor.submit(query, i)
+            for i in itertools.islice(indices, 2 * max_workers)
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                for i in itertools.islice(indices, 1):
+                    pending.add(executor.submit(query, i))
+
+
+__all__ = ["TileResult", "tile_grid", "sweep_bounding_box"]
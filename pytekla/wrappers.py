@@ -1,16 +1,27 @@
+import functools
 import inspect
+import keyword
+import time
+from collections import namedtuple
 from types import GeneratorType
 
 import clr
+import numpy as np
 import Tekla.Structures
 from System import Double, Int32, String
 from System.Collections import Hashtable, IDictionary, IEnumerable, IEnumerator
 from System.Collections.Generic import Dictionary, List
+from Tekla.Structures import Identifier
 from Tekla.Structures.Drawing import DatabaseObject, DrawingHandler
 from Tekla.Structures.Geometry3d import Point
-from Tekla.Structures.Model import UI, Model, ModelObject
-
-from .coreutils.collections import iterable_to_net_array_list, net_idictionary_to_dict
+from Tekla.Structures.Model import UI, Assembly, BaseComponent, Beam, Model, ModelObject
+
+from . import session
+from .coreutils.collections import (
+    iterable_to_net_array_list,
+    net_hashtable_to_dict,
+    net_idictionaries_to_dict,
+)
 from .coreutils.names import to_pascal_case
 from .coreutils.properties import check_property_type
 
@@ -24,22 +35,101 @@ PICKER_OBJECT_TYPES = {
 }
 
 
+HIERARCHY_RELATIONS = ("main part", "secondary", "sub assembly", "child")
+
+HIERARCHY_ROOT_TYPES = ("Assembly", "Component", "Connection", "Detail", "Seam")
+
+
+SELECT_FIELD_ALIASES = {
+    "id": "identifier.ID",
+    "guid": "identifier.GUID",
+    "profile": "profile.profile_string",
+    "material": "material.material_string",
+}
+
+
 _TEKLA_OBJECT_ATTR_NAME = "_tekla_object"
 
 
+def _hierarchy_children(tekla_object):
+    if isinstance(tekla_object, Assembly):
+        main_part = tekla_object.GetMainPart()
+        if main_part is not None:
+            yield 0, main_part
+        for secondary in tekla_object.GetSecondaries():
+            yield 1, secondary
+        for sub_assembly in tekla_object.GetSubAssemblies():
+            yield 2, sub_assembly
+    elif isinstance(tekla_object, BaseComponent):
+        for child in tekla_object.GetChildren():
+            yield 3, child
+
+
+def _broadcast_column(values, size, name):
+    if values is None or np.isscalar(values):
+        return [values] * size
+    values = list(values)
+    if len(values) != size:
+        raise ValueError(f"'{name}' must be a single value or have {size} values")
+    return values
+
+
+def _point_array(values, name):
+    points = np.asarray(values, dtype=np.float64)
+    if points.shape == (3,):
+        points = points[np.newaxis]
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError(f"'{name}' must be a (N, 3) array or a single point, not {points.shape}")
+    return points
+
+
 def _process_attr(_object):
     if isinstance(_object, GeneratorType):
         return _object
     if isinstance(_object, IDictionary):
-        return {
-            k: wrap(v, detect_types=False) for k, v in zip(_object.Keys, _object.Values)
-        }
+        return net_hashtable_to_dict(_object, _wrap_value)
     elif isinstance(_object, (IEnumerator, IEnumerable)):
         return (wrap(elem, detect_types=False) for elem in _object)
     else:
         return wrap(_object, detect_types=False)
 
 
+def _read_point(value):
+    if isinstance(value, Point):
+        return (value.X, value.Y, value.Z)
+    return value
+
+
+def _compile_field(field):
+    """Compile the getter of a field, which resolves the attribute path on each object."""
+    names = [to_pascal_case(at) for at in SELECT_FIELD_ALIASES.get(field, field).split(".")]
+
+    def getter(to):
+        for name in names:
+            to = getattr(to, name, None)
+            if to is None:
+                return None
+            if callable(to):
+                to = to()
+        return _read_point(to)
+
+    return getter
+
+
+@functools.lru_cache(maxsize=128)
+def _field_getters_for(fields):
+    return tuple(_compile_field(f) for f in fields)
+
+
+def _record_field_name(field):
+    name = field.replace(".", "_")
+    return name + "_" if keyword.iskeyword(name) else name
+
+
+def _wrap_value(value):
+    return wrap(value, detect_types=False)
+
+
 def _attrs_wrapper(func):
     def wrapper(*args, **kwargs):
         args = [a.unwrap() if isinstance(a, BaseWrapper) else a for a in args]
@@ -310,7 +400,7 @@ class ModelObjectWrapper(BaseWrapper, WithUserPropertyMixin):
         hash_table = Hashtable()
         to = _get_tekla_object(self)
         to.GetAllUserProperties(hash_table)
-        return hash_table
+        return net_hashtable_to_dict(hash_table)
 
     def get_multiple_report_properties(
         self, string_names=None, float_names=None, int_names=None
@@ -351,7 +441,7 @@ class ModelObjectWrapper(BaseWrapper, WithUserPropertyMixin):
             iterable_to_net_array_list(int_names or []),
             hash_table,
         )
-        return hash_table
+        return net_hashtable_to_dict(hash_table)
 
     def get_dynamic_string_property(self, property_name):
         """
@@ -466,18 +556,31 @@ class ModelWrapper(BaseWrapper):
         """
         Create a new ModelWrapper instance.
 
+        When no Tekla object is given, the model and its selectors are taken from the process wide
+        [`session`][pytekla.session], so creating many instances is cheap. The picker and the UI
+        selector are always shared.
+
+        Parameters
+        ----------
+        tekla_object : Tekla.Structures.Model.Model, optional
+            The model to wrap. By default the shared model.
+
         Examples
         --------
         >>> from pytekla import ModelWrapper
         >>> model = ModelWrapper()
         """
         if tekla_object is None:
-            tekla_object = Model()
+            tekla_object = session.get_model()
+            model_object_selector = session.get_model_object_selector()
+        else:
+            model_object_selector = tekla_object.GetModelObjectSelector()
         super().__init__(tekla_object)
-        object.__setattr__(self, "_picker", UI.Picker())
-        to = _get_tekla_object(self)
-        object.__setattr__(self, "_model_object_selector", to.GetModelObjectSelector())
-        object.__setattr__(self, "_ui_model_object_selector", UI.ModelObjectSelector())
+        object.__setattr__(self, "_picker", session.get_picker())
+        object.__setattr__(self, "_model_object_selector", model_object_selector)
+        object.__setattr__(
+            self, "_ui_model_object_selector", session.get_ui_model_object_selector()
+        )
 
     def pick_objects(self, object_type="object", prompt=None):
         """Pick and element from the model.
@@ -586,8 +689,9 @@ class ModelWrapper(BaseWrapper):
 
         Parameters
         ----------
-        model_filter : str or Tekla.Structures.Filtering.FilterExpression
-            The filter to be applied to the model. It can be a string with the filter name, or a wrapped or unwrapped object of a FilterExpression subclass.
+        model_filter : str, Tekla.Structures.Filtering.FilterExpression or pytekla.query.Expression
+            The filter to be applied to the model. It can be a string with the filter name, a wrapped or unwrapped object of a FilterExpression subclass,
+            or a predicate built with [`F`][pytekla.query.F] (see [`filter_objects`][pytekla.filtering.filter_objects]).
 
         Returns
         -------
@@ -600,8 +704,17 @@ class ModelWrapper(BaseWrapper):
         >>> filtered_objects = model.get_objects_by_filter("my filter")
         >>> for obj in filtered_objects:
         >>>     print(obj)
+
+        >>> from pytekla.filtering import F
+        >>> filtered_objects = model.get_objects_by_filter(F.profile.startswith("HEA") & (F.phase == 2))
         """
-        selector = object.__getattribute__(self, "_model_object_selector")
+        from .query import Expression
+
+        if isinstance(model_filter, Expression):
+            from .filtering import filter_objects
+
+            return filter_objects(self, model_filter)
+
         selector = object.__getattribute__(self, "_model_object_selector")
         if isinstance(model_filter, str):
             return selector.GetObjectsByFilterName(model_filter)
@@ -640,6 +753,293 @@ class ModelWrapper(BaseWrapper):
             Point(*min_point_coords), Point(*max_point_coords)
         )
 
+    def create_beams(
+        self,
+        start_points,
+        end_points,
+        profile,
+        material=None,
+        part_class=None,
+        name=None,
+        beam_type="beam",
+    ):
+        """
+        Create and insert many beams (or columns) at once, committing the changes only once at the end.
+
+        The coordinates are converted to Python floats in a single step and each beam is created and
+        inserted directly, without going through [`wrap`][pytekla.wrappers.wrap] and attribute name conversions.
+
+        Parameters
+        ----------
+        start_points : array-like
+            A (N, 3) array with the start point coordinates of each beam, or a single (3,) point.
+        end_points : array-like
+            A (N, 3) array with the end point coordinates of each beam, or a single (3,) point.
+        profile : str or sequence of str
+            The profile of all the beams, or one profile for each beam.
+        material : str or sequence of str, optional
+            The material of all the beams, or one material for each beam. By default the Tekla Structures default.
+        part_class : str, int or sequence of str or int, optional
+            The class of all the beams, or one class for each beam. Numbers are converted to strings, as
+            `Part.Class` is a string. By default the Tekla Structures default.
+        name : str or sequence of str, optional
+            The name of all the beams, or one name for each beam. By default the Tekla Structures default.
+        beam_type : str, optional
+            The name of a `Beam.BeamTypeEnum` member, for example "beam", "column" or "panel". By default "beam".
+
+        Returns
+        -------
+        numpy.ndarray
+            The identifiers of the created beams, 0 for the beams that could not be inserted.
+
+        Raises
+        ------
+        ValueError
+            If the points are not (N, 3) arrays of the same size, or any per beam column does not have N values.
+
+        Examples
+        -------
+        >>> import numpy as np
+        >>> model = ModelWrapper()
+        >>> x, y = np.meshgrid(np.arange(10) * 6000.0, np.arange(10) * 6000.0)
+        >>> bases = np.column_stack([x.ravel(), y.ravel(), np.zeros(x.size)])
+        >>> tops = bases + [0.0, 0.0, 4000.0]
+        >>> ids = model.create_beams(bases, tops, "HEB300", "S355", beam_type="column")
+        """
+        starts = _point_array(start_points, "start_points")
+        ends = _point_array(end_points, "end_points")
+        if starts.shape != ends.shape:
+            raise ValueError("'start_points' and 'end_points' must have the same shape")
+        size = len(starts)
+
+        columns = zip(
+            starts.tolist(),
+            ends.tolist(),
+            _broadcast_column(profile, size, "profile"),
+            _broadcast_column(material, size, "material"),
+            _broadcast_column(part_class, size, "part_class"),
+            _broadcast_column(name, size, "name"),
+        )
+        tekla_beam_type = getattr(Beam.BeamTypeEnum, beam_type.upper())
+
+        ids = np.zeros(size, dtype=np.int64)
+        for i, (start, end, _profile, _material, _class, _name) in enumerate(columns):
+            beam = Beam(tekla_beam_type)
+            beam.StartPoint = Point(*start)
+            beam.EndPoint = Point(*end)
+            beam.Profile.ProfileString = _profile
+            if _material is not None:
+                beam.Material.MaterialString = _material
+            if _class is not None:
+                beam.Class = str(_class)
+            if _name is not None:
+                beam.Name = _name
+            if beam.Insert():
+                ids[i] = beam.Identifier.ID
+
+        _get_tekla_object(self).CommitChanges()
+        return ids
+
+    def get_hierarchy(self, roots=None):
+        """
+        Traverse the assembly and component hierarchies into parent-child tables.
+
+        The traversal is breadth first, one level at a time, working directly with the Tekla objects
+        (no wrapper is created for the children). Every object is expanded only once, even if it is
+        reached from several roots.
+
+        Assemblies are expanded into their main part, secondaries and sub assemblies, and components
+        (components, connections, details and seams) into their children.
+
+        Parameters
+        ----------
+        roots : iterable of ModelObjectWrapper, optional
+            The objects to start from. By default all the assemblies and components of the model.
+
+        Returns
+        -------
+        dict
+            A dictionary of NumPy arrays with one item per relation: "parent" and "child" with the
+            object identifiers, and "relation" with the index of the relation type in `HIERARCHY_RELATIONS`
+            ("main part", "secondary", "sub assembly", "child"). It can be passed directly to `pd.DataFrame`.
+
+        Examples
+        -------
+        >>> import pandas as pd
+        >>> model = ModelWrapper()
+        >>> hierarchy = pd.DataFrame(model.get_hierarchy())
+        >>> hierarchy.merge(parts_dataframe, left_on="child", right_on="id")
+        """
+        if roots is None:
+            selector = object.__getattribute__(self, "_model_object_selector")
+            roots = selector.GetAllObjectsWithType(
+                [
+                    clr.GetClrType(_get_type_by_namespace("Model." + _type))
+                    for _type in HIERARCHY_ROOT_TYPES
+                ]
+            )
+
+        level = [r.unwrap() if isinstance(r, BaseWrapper) else r for r in roots]
+        visited = set()
+        parents, children, relations = [], [], []
+
+        while level:
+            next_level = []
+            for tekla_object in level:
+                parent_id = tekla_object.Identifier.ID
+                if parent_id in visited:
+                    continue
+                visited.add(parent_id)
+                for relation, child in _hierarchy_children(tekla_object):
+                    child_id = child.Identifier.ID
+                    parents.append(parent_id)
+                    children.append(child_id)
+                    relations.append(relation)
+                    if child_id not in visited:
+                        next_level.append(child)
+            level = next_level
+
+        return {
+            "parent": np.array(parents, dtype=np.int64),
+            "child": np.array(children, dtype=np.int64),
+            "relation": np.array(relations, dtype=np.int8),
+        }
+
+    def get_report_properties(
+        self, objects, string_names=None, float_names=None, int_names=None
+    ):
+        """
+        Get multiple report properties of many objects.
+
+        The lists of names are converted to .NET only once, each object is read with a single call,
+        and the results are converted to dictionaries without wrapping the values.
+
+        Parameters
+        ----------
+        objects : iterable of ModelObjectWrapper
+            The objects to read.
+        string_names : list of str, optional
+            A list of string property names to retrieve.
+        float_names : list of str, optional
+            A list of float property names to retrieve.
+        int_names : list of str, optional
+            A list of integer property names to retrieve.
+
+        Returns
+        -------
+        generator
+            A generator of dictionaries, one per object, with the found properties and their values.
+
+        Examples
+        -------
+        >>> model = ModelWrapper()
+        >>> beams = model.get_objects_with_types(["Beam"])
+        >>> for properties in model.get_report_properties(beams, string_names=["PROFILE"], float_names=["LENGTH"]):
+        >>>     print(properties)
+        {'PROFILE': 'HEA200', 'LENGTH': 6000.0}
+        """
+        net_names = [
+            iterable_to_net_array_list(names or [])
+            for names in (string_names, float_names, int_names)
+        ]
+        for obj in objects:
+            hash_table = Hashtable()
+            to = obj.unwrap() if isinstance(obj, BaseWrapper) else obj
+            to.GetAllReportProperties(*net_names, hash_table)
+            yield net_hashtable_to_dict(hash_table)
+
+    def get_user_properties(self, objects):
+        """
+        Get all the user properties of many objects.
+
+        Parameters
+        ----------
+        objects : iterable of ModelObjectWrapper
+            The objects to read.
+
+        Returns
+        -------
+        generator
+            A generator of dictionaries, one per object, with the user properties and their values.
+
+        Examples
+        -------
+        >>> model = ModelWrapper()
+        >>> for properties in model.get_user_properties(model.get_selected_objects()):
+        >>>     print(properties)
+        """
+        for obj in objects:
+            hash_table = Hashtable()
+            to = obj.unwrap() if isinstance(obj, BaseWrapper) else obj
+            to.GetAllUserProperties(hash_table)
+            yield net_hashtable_to_dict(hash_table)
+
+    def select(self, fields, objects=None):
+        """
+        Read a fixed set of fields from many objects into lightweight records.
+
+        The list of fields is compiled once, and the fields are read from the Tekla objects without
+        creating any wrapper. Points are returned as (x, y, z) tuples.
+
+        Parameters
+        ----------
+        fields : list of str
+            The field names, in snake_case like the wrapper attributes. Nested attributes are separated
+            with a dot, and methods without arguments are called. The aliases in `SELECT_FIELD_ALIASES`
+            ("id", "guid", "profile" and "material") can be used as well. Fields that don't exist for
+            an object type are None.
+        objects : iterable of ModelObjectWrapper, optional
+            The objects to read. By default all the objects of the model.
+
+        Returns
+        -------
+        generator
+            A generator of named tuples, one per object, with one item per field. Dots in the field names
+            are replaced by underscores, and Python keywords get a trailing underscore ("class" is `class_`).
+
+        Examples
+        -------
+        >>> model = ModelWrapper()
+        >>> for part in model.select(["id", "name", "profile", "material", "start_point", "end_point"], model.get_objects_with_types(["Beam"])):
+        >>>     print(part.profile, part.start_point)
+        HEA200 (0.0, 0.0, 0.0)
+        """
+        fields = tuple(fields)
+        record_type = namedtuple("Record", [_record_field_name(f) for f in fields], rename=True)
+        getters = _field_getters_for(fields)
+        if objects is None:
+            objects = object.__getattribute__(self, "_model_object_selector").GetAllObjects()
+
+        for obj in objects:
+            to = obj.unwrap() if isinstance(obj, BaseWrapper) else obj
+            yield record_type._make([getter(to) for getter in getters])
+
+    def get_objects_by_ids(self, ids):
+        """
+        Get objects from the model by their identifiers.
+
+        Parameters
+        ----------
+        ids : iterable of int
+            The identifiers of the objects.
+
+        Returns
+        -------
+        generator
+            A generator of [`ModelObjectWrapper`][pytekla.wrappers.ModelObjectWrapper] objects, in the same order as `ids`. None is generated for the identifiers that were not found.
+
+        Examples
+        -------
+        >>> model = ModelWrapper()
+        >>> for obj in model.get_objects_by_ids([1234, 5678]):
+        >>>     print(obj)
+        """
+        to = _get_tekla_object(self)
+        return (
+            wrap(to.SelectModelObject(Identifier(int(_id))), detect_types=False)
+            for _id in ids
+        )
+
 
 class DrawingDbObjectWrapper(BaseWrapper, WithUserPropertyMixin):
     """
@@ -658,17 +1058,27 @@ class DrawingDbObjectWrapper(BaseWrapper, WithUserPropertyMixin):
 
     main_type = DatabaseObject
 
-    def get_all_user_properties(self):
+    def get_all_user_properties(self, property_types=None):
         """
         Return a dictionary containing all of the user-defined properties associated
         with this DatabaseObject object.
 
+        Parameters
+        ----------
+        property_types : iterable of type, optional
+            The types of the user properties to retrieve, any of `str`, `int` and `float`. Only one call is made for each type. By default all of them.
+
         Returns
         -------
         dict
             A dictionary containing the user-defined properties, where the keys are
             the names of the properties and the values are their corresponding values.
 
+        Raises
+        ------
+        TypeError
+            If any of `property_types` is not `str`, `int`, or `float`.
+
         Notes
         -----
         This method retrieves all of the user-defined properties associated with this
@@ -684,18 +1094,21 @@ class DrawingDbObjectWrapper(BaseWrapper, WithUserPropertyMixin):
         >>> user_props
         {'property1': 'value1', 'property2': 42, 'property3': 3.14}
         """
+        property_types = set(property_types or (str, int, float))
+        for property_type in property_types:
+            check_property_type(property_type)
+
         to = _get_tekla_object(self)
-        _, string_dict = to.GetStringUserProperties(Dictionary[String, String]())
-        _, int_dict = to.GetIntegerUserProperties(Dictionary[String, Int32]())
-        _, float_dict = to.GetDoubleUserProperties(Dictionary[String, Double]())
+        net_dicts = []
+        if str in property_types:
+            net_dicts.append(to.GetStringUserProperties(Dictionary[String, String]())[1])
+        if int in property_types:
+            net_dicts.append(to.GetIntegerUserProperties(Dictionary[String, Int32]())[1])
+        if float in property_types:
+            net_dicts.append(to.GetDoubleUserProperties(Dictionary[String, Double]())[1])
 
         # it's easier to process the result as a Python dict
-        final_dict = {}
-
-        for net_dict in (string_dict, int_dict, float_dict):
-            final_dict |= net_idictionary_to_dict(net_dict)
-
-        return final_dict
+        return net_idictionaries_to_dict(*net_dicts)
 
 
 class DrawingHandlerWrapper(BaseWrapper):
@@ -720,13 +1133,18 @@ class DrawingHandlerWrapper(BaseWrapper):
         """
         Create a new DrawingHandlerWrapper instance.
 
+        Parameters
+        ----------
+        tekla_object : Tekla.Structures.Drawing.DrawingHandler, optional
+            The drawing handler to wrap. By default the one shared by the process (see [`session`][pytekla.session]).
+
         Examples
         --------
         >>> from pytekla import DrawingHandlerWrapper
         >>> drawing_handler = DrawingHandlerWrapper()
         """
         if tekla_object is None:
-            tekla_object = DrawingHandler()
+            tekla_object = session.get_drawing_handler()
         super().__init__(tekla_object)
 
     def get_drawings(self):
@@ -768,6 +1186,164 @@ class DrawingHandlerWrapper(BaseWrapper):
         if active_drawing is not None:
             return active_drawing
 
+    def batch(self, progress=None):
+        """
+        Start a batch of drawing changes that are applied together.
+
+        Parameters
+        ----------
+        progress : function, optional
+            A function called after each drawing is modified, with the number of modified drawings and the total number of drawings.
+
+        Returns
+        -------
+        DrawingBatch
+            The batch. Used as a context manager, the changes are applied when the block ends without errors.
+
+        Examples
+        --------
+        >>> from pytekla import DrawingHandlerWrapper
+        >>> drawing_handler = DrawingHandlerWrapper()
+        >>> with drawing_handler.batch(progress=lambda done, total: print(f"{done}/{total}")) as batch:
+        ...     for drawing in drawing_handler.get_drawings():
+        ...         batch.set_user_property(drawing, "DR_CHECKED_BY", "NAA")
+        ...         batch.set_attribute(drawing, "title1", "ISSUED FOR CONSTRUCTION")
+        >>> batch.report
+        {'drawings': 1250, 'modified': 1249, 'failed': ['A12'], 'errors': ['Modify failed'], 'seconds': 41.7}
+        """
+        return DrawingBatch(progress)
+
+
+class DrawingBatch:
+    """
+    A queue of attribute and user property changes of drawings.
+
+    The changes are grouped by drawing, so each drawing is modified only once, and they are committed
+    once at the end. Use [`DrawingHandlerWrapper.batch`][pytekla.wrappers.DrawingHandlerWrapper.batch] to create it.
+    """
+
+    def __init__(self, progress=None):
+        self.progress = progress
+        self.report = None
+        self._changes = {}
+
+    def _queue(self, drawing):
+        to = drawing.unwrap() if isinstance(drawing, BaseWrapper) else drawing
+        # several proxies can represent the same drawing, so they are grouped by its identifier
+        try:
+            key = to.GetIdentifier().ID or id(to)
+        except AttributeError:
+            key = id(to)
+        try:
+            return self._changes[key][1:]
+        except KeyError:
+            entry = self._changes[key] = (to, {}, {})
+            return entry[1:]
+
+    def set_attribute(self, drawing, attribute, value):
+        """
+        Queue the change of an attribute of a drawing.
+
+        Parameters
+        ----------
+        drawing : DrawingDbObjectWrapper or Tekla.Structures.Drawing.Drawing
+            The drawing.
+        attribute : str
+            The attribute name, in snake_case (for example "title1" or "name").
+        value : object
+            The new value.
+        """
+        self._queue(drawing)[0][to_pascal_case(attribute)] = value
+
+    def set_user_property(self, drawing, property_name, value):
+        """
+        Queue the change of a user property of a drawing.
+
+        Parameters
+        ----------
+        drawing : DrawingDbObjectWrapper or Tekla.Structures.Drawing.Drawing
+            The drawing.
+        property_name : str
+            The user property name.
+        value : str, int or float
+            The new value.
+
+        Raises
+        ------
+        TypeError
+            If the value type is not one of [str, int, float].
+        """
+        check_property_type(type(value))
+        self._queue(drawing)[1][property_name] = value
+
+    def __len__(self):
+        return len(self._changes)
+
+    def apply(self):
+        """
+        Apply the queued changes, modifying each drawing once, and commit them.
+
+        A drawing that fails doesn't stop the others, and the changes of the rest are still committed.
+
+        Returns
+        -------
+        dict
+            The report, with the number of "drawings", the number of "modified" drawings, the marks of
+            the drawings that "failed", the "errors" of the failed drawings (in the same order, as
+            several drawings can have the same mark) and the "seconds" spent. It is also stored in `report`.
+        """
+        start = time.perf_counter()
+        total = len(self._changes)
+        modified, failed, errors = 0, [], []
+
+        for done, (to, attributes, user_properties) in enumerate(self._changes.values(), start=1):
+            try:
+                for attribute, value in attributes.items():
+                    setattr(to, attribute, value)
+                results = [to.SetUserProperty(n, v) for n, v in user_properties.items()]
+                not_set = [n for n, ok in zip(user_properties, results) if not ok]
+                if not to.Modify():
+                    error = "Modify failed"
+                elif not_set:
+                    error = f"User properties not set: {not_set}"
+                else:
+                    error = None
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+
+            if error is None:
+                modified += 1
+            else:
+                failed.append(to.Mark)
+                errors.append(error)
+            if self.progress is not None:
+                self.progress(done, total)
+
+        if total:
+            session.get_model().CommitChanges()
+        self._changes.clear()
+        self.report = {
+            "drawings": total,
+            "modified": modified,
+            "failed": failed,
+            "errors": errors,
+            "seconds": time.perf_counter() - start,
+        }
+        return self.report
+
+    def discard(self):
+        """Drop the queued changes."""
+        self._changes.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.apply()
+        else:
+            self.discard()
+
 
 def _get_type_by_namespace(namespace):
     """
@@ -0,0 +1,75 @@
+"""Stand-ins for the Tekla Structures objects shared by the tests."""
+
+
+class FakeType:
+    def __init__(self, name):
+        self.Name = name
+
+
+class FakeIdentifier:
+    def __init__(self, _id):
+        self.ID = _id
+
+
+class FakePoint:
+    def __init__(self, x, y, z=0.0):
+        self.X, self.Y, self.Z = x, y, z
+
+
+class FakeModelObject:
+    """Stand-in for a model object that only answers report and user properties.
+
+    `calls` counts the property reads, and `deleted` makes `Select` fail.
+    """
+
+    def __init__(self, _id=0, type_name="Beam", name=None, user_properties=None, **properties):
+        self.Identifier = FakeIdentifier(_id)
+        self._type = FakeType(type_name)
+        self.Name = name
+        self.properties = properties
+        self.user_properties = user_properties or {}
+        self.calls = 0
+        self.deleted = False
+
+    def GetType(self):
+        return self._type
+
+    def GetAllReportProperties(self, string_names, float_names, int_names, hash_table):
+        self.calls += 1
+        for name in [*string_names, *float_names, *int_names]:
+            if name in self.properties:
+                hash_table[name] = self.properties[name]
+        return True
+
+    def GetReportProperty(self, name, value):
+        self.calls += 1
+        found = name in self.properties and isinstance(self.properties[name], type(value))
+        return found, self.properties[name] if found else value
+
+    def GetUserProperty(self, name, value):
+        self.calls += 1
+        if name in self.user_properties:
+            return True, self.user_properties[name]
+        return False, value
+
+    def get_report_property(self, property_name, property_type):
+        return self.properties.get(property_name)
+
+    def Select(self):
+        return not self.deleted
+
+
+class FakeModel:
+    """Stand-in for a `ModelWrapper` over a list of objects; `extractions` counts the queries."""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.extractions = 0
+
+    def get_all_objects(self):
+        self.extractions += 1
+        return iter(self.objects)
+
+    def get_objects_with_types(self, types):
+        self.extractions += 1
+        return (o for o in self.objects if o.GetType().Name in types)
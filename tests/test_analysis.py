@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from pytekla.analysis import MISSING_CONDITION, extract_analysis_model
+from tests.fakes import FakeIdentifier, FakePoint, FakeType
+
+
+class FakeAnalysisObject:
+    def __init__(self, type_name, id_, **attributes):
+        self._type = FakeType(type_name)
+        self.Identifier = FakeIdentifier(id_)
+        self.__dict__.update(attributes)
+
+    def GetType(self):
+        return self._type
+
+
+class FakeEnd:
+    def __init__(self, *conditions):
+        self.Ux, self.Uy, self.Uz, self.Rx, self.Ry, self.Rz = conditions
+
+
+def test_extract_analysis_model():
+    n1 = FakeAnalysisObject("AnalysisNode", 20, Position=FakePoint(0, 0, 0))
+    n2 = FakeAnalysisObject("AnalysisNode", 10, Position=FakePoint(3000, 0, 4000))
+    objects = [
+        n1,
+        FakeAnalysisObject(
+            "AnalysisBar",
+            1,
+            StartNode=n1,
+            EndNode=n2,
+            ModelObjectID=FakeIdentifier(500),
+            StartEnd=FakeEnd(0, 0, 0, 0, 0, 0),
+            EndEnd=FakeEnd(0, 0, 0, 1, 1, 1),
+        ),
+        FakeAnalysisObject(
+            "AnalysisBar",
+            2,
+            StartNode=n2,
+            EndNode=None,
+            ModelObjectID=None,
+            StartEnd=None,
+            EndEnd=None,
+        ),
+        FakeAnalysisObject("AnalysisLoad", 3),
+        n2,
+    ]
+
+    arrays = extract_analysis_model(objects)
+    assert list(arrays.node_ids) == [10, 20]
+    assert arrays.node_coordinates.tolist() == [[3000, 0, 4000], [0, 0, 0]]
+    assert list(arrays.member_ids) == [1, 2]
+    assert arrays.member_nodes.tolist() == [[1, 0], [0, -1]]
+    assert list(arrays.member_model_ids) == [500, 0]
+    assert arrays.end_conditions.shape == (2, 2, 6)
+    assert list(arrays.end_conditions[0, 1]) == [0, 0, 0, 1, 1, 1]
+    assert (arrays.end_conditions[1] == MISSING_CONDITION).all()
+    lengths = arrays.member_lengths()
+    assert lengths[0] == 5000
+    assert np.isnan(lengths[1])
+
+
+def test_extract_analysis_model_empty():
+    arrays = extract_analysis_model([])
+    assert arrays.node_coordinates.shape == (0, 3)
+    assert arrays.member_nodes.shape == (0, 2)
+    assert arrays.end_conditions.shape == (0, 2, 6)
+
+
+def test_extract_analysis_model_missing_attribute():
+    node = FakeAnalysisObject("AnalysisNode", 1, Location=FakePoint(0, 0, 0))
+    with pytest.raises(AttributeError, match="Position"):
+        extract_analysis_model([node])
+
+    class FakeRelease:
+        Ux = Uy = Uz = Rx = Ry = 0
+
+    bar = FakeAnalysisObject(
+        "AnalysisBar",
+        2,
+        StartNode=None,
+        EndNode=None,
+        ModelObjectID=None,
+        StartEnd=FakeRelease(),
+        EndEnd=None,
+    )
+    with pytest.raises(AttributeError, match="Rz"):
+        extract_analysis_model([bar])
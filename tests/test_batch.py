@@ -0,0 +1,50 @@
+import pytest
+
+from pytekla.batch import run_batch
+from tests.fakes import FakeModel, FakeModelObject
+
+
+def fake_model_factory(model_path):
+    if model_path == "missing":
+        raise FileNotFoundError(model_path)
+    size = int(model_path[-1])
+    beams = [
+        FakeModelObject(i, "Beam", PROFILE=f"HEA{size}00", WEIGHT=1.0) for i in range(size)
+    ]
+    return FakeModel(beams + [FakeModelObject(100, "ContourPlate", WEIGHT=5.0)])
+
+
+def count_objects(model):
+    return {"count": [len(model.objects)]}
+
+
+def test_run_batch():
+    spec = {"types": ["Beam"], "report_properties": {"PROFILE": str, "WEIGHT": float}}
+    table, timings = run_batch(
+        ["model2", "missing", "model3"], spec, max_workers=2, model_factory=fake_model_factory
+    )
+
+    assert len(table) == 5
+    assert list(table.columns) == ["id", "type", "PROFILE", "WEIGHT", "model"]
+    assert table.groupby("model", observed=True)["WEIGHT"].sum().to_dict() == {
+        "model2": 2.0,
+        "model3": 3.0,
+    }
+    assert set(table["PROFILE"]) == {"HEA200", "HEA300"}
+
+    assert list(timings["model"]) == ["model2", "missing", "model3"]
+    assert list(timings["rows"]) == [2, 0, 3]
+    assert timings["error"][1].startswith("FileNotFoundError")
+    assert timings["error"].isna()[[0, 2]].all()
+    assert (timings["seconds"] >= 0).all()
+
+
+def test_run_batch_function_spec():
+    table, _ = run_batch(["model1", "model4"], count_objects, model_factory=fake_model_factory)
+    assert list(table["count"]) == [2, 5]
+    assert list(table["model"]) == ["model1", "model4"]
+
+
+def test_run_batch_open_model_single_worker():
+    with pytest.raises(ValueError):
+        run_batch(["model1", "model2"], {}, max_workers=2)
@@ -0,0 +1,75 @@
+import time
+
+import pandas as pd
+
+from pytekla.catalogs import CatalogIndex
+from pytekla.data_manager import join_catalog_properties
+
+
+class FakeParameter:
+    def __init__(self, name, value):
+        self.Property = name
+        self.Value = value
+
+
+class FakeProfile:
+    def __init__(self, name, **parameters):
+        self.ProfileName = name
+        self.aProfileItemParameters = [FakeParameter(k, v) for k, v in parameters.items()]
+
+
+class FakeMaterial:
+    def __init__(self, name, density):
+        self.MaterialName = name
+        self.ProfileDensity = density
+
+
+class FakeBolt:
+    def __init__(self, standard, size):
+        self.Standard = standard
+        self.Size = size
+
+
+class FakeCatalogHandler:
+    def GetLibraryProfileItems(self):
+        return [FakeProfile("HEA200", HEIGHT=190.0, WEIGHT=42.3)]
+
+    def GetMaterialItems(self):
+        return [FakeMaterial("S355", 7850.0)]
+
+    def GetBoltItems(self):
+        return [FakeBolt("8.8XOX", 20.0)]
+
+
+def test_catalog_index_build():
+    catalogs = CatalogIndex.build(FakeCatalogHandler())
+    assert catalogs.profiles == {"HEA200": {"HEIGHT": 190.0, "WEIGHT": 42.3}}
+    assert catalogs.materials["S355"]["ProfileDensity"] == 7850.0
+    assert catalogs.bolts["8.8XOX 20.0"]["Size"] == 20.0
+
+
+def test_catalog_index_cache(tmp_path):
+    signature = {"model_path": "C:/model", "files": {"profdb.bin": 1.0}}
+    catalogs = CatalogIndex.build(FakeCatalogHandler(), signature)
+    catalogs.save(tmp_path / "catalogs.json")
+
+    loaded = CatalogIndex.load(tmp_path / "catalogs.json")
+    assert loaded.profiles == catalogs.profiles
+    assert not loaded.is_stale(signature)
+    assert loaded.is_stale({"model_path": "C:/model", "files": {"profdb.bin": 2.0}})
+
+    loaded.created = time.time() - 100
+    assert not loaded.is_stale(signature, max_age=1000)
+    assert loaded.is_stale(signature, max_age=10)
+
+
+def test_join_catalog_properties():
+    catalogs = CatalogIndex.build(FakeCatalogHandler())
+    df = pd.DataFrame({"PROFILE": ["HEA200", "PL10*100"], "MATERIAL": ["S355", "S355"]})
+    df = join_catalog_properties(
+        df, catalogs, profile_properties=["WEIGHT"], material_column="MATERIAL"
+    )
+    assert df["PROFILE.WEIGHT"].iloc[0] == 42.3
+    assert pd.isna(df["PROFILE.WEIGHT"].iloc[1])
+    assert "PROFILE.HEIGHT" not in df
+    assert list(df["MATERIAL.ProfileDensity"]) == [7850.0, 7850.0]
@@ -7,6 +7,8 @@ from pytekla.coreutils.collections import (
     iterable_to_net_array,
     iterable_to_net_array_list,
     iterable_to_net_list,
+    net_hashtable_to_dict,
+    net_idictionaries_to_dict,
     net_idictionary_to_dict,
 )
 
@@ -31,6 +33,40 @@ def test_net_idictionary_to_dict():
     assert actual_dict == expected_dict
 
 
+def test_net_hashtable_to_dict():
+    ht = Hashtable()
+    ht["key1"] = "value1"
+    ht["key2"] = 42
+    ht["key3"] = 3.14
+    ht["key4"] = ArrayList()
+
+    converted = []
+
+    def convert(value):
+        converted.append(value)
+        return "converted"
+
+    expected_dict = {"key1": "value1", "key2": 42, "key3": 3.14, "key4": "converted"}
+    assert net_hashtable_to_dict(ht, convert) == expected_dict
+    assert len(converted) == 1
+    assert isinstance(net_hashtable_to_dict(ht)["key4"], ArrayList)
+
+
+def test_net_idictionaries_to_dict():
+    str_dict = Dictionary[str, str]()
+    str_dict.Add("key1", "value1")
+    int_dict = Dictionary[str, int]()
+    int_dict.Add("key2", 42)
+    float_dict = Dictionary[str, float]()
+    float_dict.Add("key3", 3.14)
+    float_dict.Add("key1", 1.5)
+
+    expected_dict = {"key1": 1.5, "key2": 42, "key3": 3.14}
+    assert net_idictionaries_to_dict(str_dict, int_dict, float_dict) == expected_dict
+    assert net_idictionaries_to_dict(str_dict, None) == {"key1": "value1"}
+    assert net_idictionaries_to_dict() == {}
+
+
 @pytest.mark.parametrize(
     "test_input, expected_output",
     [
@@ -0,0 +1,220 @@
+import numpy as np
+import pytest
+
+from pytekla import DrawingDbObjectWrapper
+from pytekla.data_manager import (
+    aggregate_quantities,
+    create_drawings_dataframe,
+    create_lazy_dataframe,
+    create_model_objects_dataframe,
+    iter_drawings_dataframes,
+)
+from tests.fakes import FakeModelObject
+
+
+def test_aggregate_quantities():
+    objects = [
+        FakeModelObject(PHASE=1, PROFILE="HEA200", WEIGHT=100.0, VOLUME=1.0),
+        FakeModelObject(PHASE=1, PROFILE="HEA200", WEIGHT=50.0),
+        FakeModelObject(PHASE=2, PROFILE="HEA200", WEIGHT=10.0, VOLUME=0.5),
+        FakeModelObject(PHASE=1, PROFILE="IPE300", WEIGHT=30.0, VOLUME=2.0),
+    ]
+    result = aggregate_quantities(
+        iter(objects), by={"PHASE": int, "PROFILE": str}, quantities=["WEIGHT", "VOLUME"]
+    )
+
+    assert list(result.columns) == ["WEIGHT", "VOLUME", "count"]
+    assert result.loc[(1, "HEA200"), "WEIGHT"] == 150.0
+    assert result.loc[(1, "HEA200"), "VOLUME"] == 1.0
+    assert result.loc[(1, "HEA200"), "count"] == 2
+    assert result.loc[(2, "HEA200"), "count"] == 1
+    assert len(result) == 3
+
+
+def test_aggregate_quantities_wrong_type():
+    with pytest.raises(TypeError):
+        aggregate_quantities([], by={"PROFILE": list})
+
+
+def test_create_model_objects_dataframe_categorical():
+    profiles = ["HEA200", "IPE300", "HEB400"]
+    objects = [
+        FakeModelObject(PROFILE="".join(profiles[i % 3]), WEIGHT=float(i)) for i in range(3000)
+    ]
+    report_properties = {"PROFILE": str, "WEIGHT": float}
+
+    plain = create_model_objects_dataframe(objects, report_properties=report_properties)
+    categorical = create_model_objects_dataframe(
+        objects, report_properties=report_properties, categorical=True
+    )
+
+    assert str(categorical["PROFILE"].dtype) == "category"
+    assert categorical["WEIGHT"].dtype == float
+    assert list(categorical["PROFILE"].astype(str)) == list(plain["PROFILE"])
+    assert (
+        categorical["PROFILE"].memory_usage(deep=True)
+        < plain["PROFILE"].memory_usage(deep=True) / 4
+    )
+
+    only_weight = create_model_objects_dataframe(
+        objects, report_properties=report_properties, categorical=["WEIGHT"]
+    )
+    assert str(only_weight["PROFILE"].dtype) != "category"
+
+    with pytest.raises(ValueError, match="PROFIL"):
+        create_model_objects_dataframe(
+            objects, report_properties=report_properties, categorical=["PROFIL", "WEIGHT"]
+        )
+    empty = create_model_objects_dataframe(
+        [], report_properties=report_properties, categorical=["PROFILE"]
+    )
+    assert empty.empty
+
+
+def test_create_model_objects_dataframe_interning():
+    # every object gets its own copy of the mark, and the integer marks keep the column as objects
+    objects = [FakeModelObject(MARK="".join(["B", "1"]) if i % 3 else i) for i in range(6)]
+
+    dataframe = create_model_objects_dataframe(
+        objects, report_properties={"MARK": str}, categorical=True
+    )
+
+    marks = dataframe["MARK"].to_numpy()
+    assert marks.dtype == object
+    assert marks[1] == "B1"
+    assert marks[1] is marks[2] is marks[4]
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_lazy_dataframe(max_workers):
+    objects = [
+        FakeModelObject(i, user_properties={"USER_FIELD_1": f"U{i}"}, PROFILE="HEA200", WEIGHT=1.0)
+        for i in range(2500)
+    ]
+    frame = create_lazy_dataframe(
+        objects,
+        report_properties={"PROFILE": str, "WEIGHT": float, "LENGTH": float},
+        user_properties={"USER_FIELD_1": str},
+        max_workers=max_workers,
+    )
+
+    assert len(frame) == 2500
+    assert frame.columns == ["PROFILE", "WEIGHT", "LENGTH", "USER_FIELD_1"]
+    assert frame.materialized_columns == []
+    assert sum(o.calls for o in objects) == 0
+
+    assert frame["WEIGHT"].sum() == 2500.0
+    assert frame.materialized_columns == ["WEIGHT"]
+    assert all(o.calls == 1 for o in objects)
+
+    frame["WEIGHT"]
+    assert all(o.calls == 1 for o in objects)
+
+    dataframe = frame.to_pandas()
+    assert list(dataframe.columns) == frame.columns
+    assert dataframe.loc[7, "USER_FIELD_1"] == "U7"
+    assert dataframe["LENGTH"].isna().all()
+    assert all(o.calls == 3 for o in objects)
+
+
+def test_lazy_dataframe_unknown_column():
+    frame = create_lazy_dataframe([FakeModelObject(1)], report_properties={"PROFILE": str})
+    with pytest.raises(KeyError):
+        frame["WEIGHT"]
+
+
+def test_lazy_dataframe_invalidate():
+    objects = [FakeModelObject(i, PROFILE="HEA200", WEIGHT=1.0) for i in range(5)]
+    frame = create_lazy_dataframe(objects, report_properties={"PROFILE": str, "WEIGHT": float})
+    frame["WEIGHT"]
+
+    objects[1].properties["WEIGHT"] = 2.0
+    objects[3].properties["PROFILE"] = "HEA300"
+    frame.invalidate([1, 3, 99])
+
+    assert frame.materialized_columns == ["WEIGHT"]
+    assert list(frame["WEIGHT"]) == [1.0, 2.0, 1.0, 1.0, 1.0]
+    assert [o.calls for o in objects] == [1, 2, 1, 2, 1]
+
+    del objects[4].properties["WEIGHT"]
+    frame.invalidate([4])
+    assert frame["WEIGHT"].dtype == np.float64
+    assert np.isnan(frame["WEIGHT"].iloc[4])
+
+    objects[2].deleted = True
+    frame.invalidate([2, 3])
+    assert list(frame.ids) == [0, 1, 3, 4]
+    assert list(frame["WEIGHT"].index) == [0, 1, 3, 4]
+    assert list(frame["PROFILE"]) == ["HEA200", "HEA200", "HEA300", "HEA200"]
+    assert len(frame) == 4
+
+    frame.invalidate(None)
+    assert frame.materialized_columns == []
+
+
+class FakeDrawing:
+    """Stand-in for a drawing that only answers attributes and typed user properties."""
+
+    def __init__(self, mark, **user_properties):
+        self.Mark = mark
+        self.Title1 = f"TITLE {mark}"
+        self.user_properties = user_properties
+        self.calls = []
+
+    def _get_user_properties(self, property_type, dictionary):
+        self.calls.append(property_type)
+        for name, value in self.user_properties.items():
+            if type(value) is property_type:
+                dictionary[name] = value
+        return True, dictionary
+
+    def GetStringUserProperties(self, dictionary):
+        return self._get_user_properties(str, dictionary)
+
+    def GetIntegerUserProperties(self, dictionary):
+        return self._get_user_properties(int, dictionary)
+
+    def GetDoubleUserProperties(self, dictionary):
+        return self._get_user_properties(float, dictionary)
+
+
+def _fake_drawings(count):
+    return [
+        FakeDrawing(f"A{i}", DR_CHECKED_BY="NAA", DR_REVISION=i) if i % 2 else FakeDrawing(f"A{i}")
+        for i in range(count)
+    ]
+
+
+def test_create_drawings_dataframe():
+    drawings = _fake_drawings(3)
+    dataframe = create_drawings_dataframe(
+        [DrawingDbObjectWrapper(d) for d in drawings],
+        attributes=["mark", "title1"],
+        user_properties={"DR_CHECKED_BY": str, "DR_REVISION": int},
+    )
+
+    assert list(dataframe.columns) == ["mark", "title1", "DR_CHECKED_BY", "DR_REVISION"]
+    assert list(dataframe["mark"]) == ["A0", "A1", "A2"]
+    assert list(dataframe["title1"]) == ["TITLE A0", "TITLE A1", "TITLE A2"]
+    assert dataframe["DR_CHECKED_BY"].isna().tolist() == [True, False, True]
+    assert dataframe["DR_CHECKED_BY"][1] == "NAA"
+    assert dataframe["DR_REVISION"].isna().tolist() == [True, False, True]
+    assert dataframe["DR_REVISION"][1] == 1
+    # one call per requested type, the float properties are not read
+    assert all(sorted(d.calls, key=str) == [int, str] for d in drawings)
+
+
+@pytest.mark.parametrize("chunk_size, sizes", [(2, [2, 2, 1]), (5, [5]), (10, [5])])
+def test_iter_drawings_dataframes(chunk_size, sizes):
+    chunks = list(
+        iter_drawings_dataframes(
+            (DrawingDbObjectWrapper(d) for d in _fake_drawings(5)),
+            chunk_size,
+            attributes=["mark"],
+            user_properties={"DR_REVISION": int},
+        )
+    )
+
+    assert [len(c) for c in chunks] == sizes
+    assert [m for c in chunks for m in c["mark"]] == ["A0", "A1", "A2", "A3", "A4"]
+    assert all(list(c.columns) == ["mark", "DR_REVISION"] for c in chunks)
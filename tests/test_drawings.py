@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+import pytekla.drawings
+from pytekla.drawings import extract_drawing_contents
+from tests.fakes import FakeIdentifier, FakePoint, FakeType
+
+
+class FakeDrawingObject:
+    def __init__(self, _id, type_name, **attributes):
+        self._id = _id
+        self._type = FakeType(type_name)
+        self.__dict__.update(attributes)
+
+    def GetIdentifier(self):
+        return FakeIdentifier(self._id)
+
+    def GetType(self):
+        return self._type
+
+
+class FakeAttributes:
+    Scale = 20.0
+
+
+class FakeView(FakeDrawingObject):
+    def __init__(self, _id, objects):
+        super().__init__(_id, "View", Origin=FakePoint(10, 20), Attributes=FakeAttributes())
+        self.objects = objects
+
+    def GetObjects(self):
+        return iter(self.objects)
+
+
+class FakeSheet(FakeView):
+    def __init__(self, views, objects):
+        super().__init__(0, views + objects)
+        self.views = views
+
+    def GetAllViews(self):
+        return iter(self.views)
+
+
+class FakeDrawing(FakeDrawingObject):
+    def __init__(self, mark, sheet):
+        super().__init__(0, "AssemblyDrawing", Mark=mark, Name="A")
+        self.sheet = sheet
+
+    def GetSheet(self):
+        return self.sheet
+
+
+class FakeDrawingHandler:
+    def __init__(self):
+        self.active = None
+        self.opened = 0
+
+    def SetActiveDrawing(self, drawing, visible):
+        assert self.active is None
+        self.opened += 1
+        if drawing.Mark == "[LOCKED]":
+            return False
+        self.active = drawing
+        return True
+
+    def CloseActiveDrawing(self, save):
+        self.active = None
+
+
+@pytest.fixture(autouse=True)
+def fake_view_type(monkeypatch):
+    monkeypatch.setattr(pytekla.drawings, "View", FakeView)
+
+
+def _drawing(mark, base_id):
+    part = FakeDrawingObject(
+        base_id + 1, "Part", ModelIdentifier=FakeIdentifier(5000 + base_id)
+    )
+    mark_object = FakeDrawingObject(base_id + 2, "Mark", InsertionPoint=FakePoint(1.5, 2.5))
+    dimension = FakeDrawingObject(base_id + 3, "StraightDimensionSet")
+    view = FakeView(base_id + 10, [part, mark_object, dimension])
+    note = FakeDrawingObject(base_id + 4, "Text", InsertionPoint=FakePoint(300, 10))
+    return FakeDrawing(mark, FakeSheet([view], [note]))
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_extract_drawing_contents(max_workers):
+    handler = FakeDrawingHandler()
+    drawings = [_drawing("A1", 100), _drawing("[LOCKED]", 200), _drawing("A2", 300)]
+
+    tables = extract_drawing_contents(drawings, handler, max_workers=max_workers)
+
+    assert handler.opened == 3
+    assert handler.active is None
+    assert list(tables["drawings"]["mark"]) == ["A1", "[LOCKED]", "A2"]
+    assert list(tables["views"]["id"]) == [110, 310]
+    assert list(tables["views"]["scale"]) == [20.0, 20.0]
+
+    objects = tables["objects"]
+    assert list(objects["drawing"]) == [0, 0, 0, 0, 2, 2, 2, 2]
+    assert list(objects["view"]) == [0, 1, 1, 1, 0, 1, 1, 1]
+    assert list(objects["id"][:4]) == [104, 101, 102, 103]
+    assert list(objects["type"][:4]) == ["Text", "Part", "Mark", "StraightDimensionSet"]
+    assert list(objects["model_id"][:4]) == [0, 5100, 0, 0]
+    assert objects["x"][2] == 1.5
+    assert np.isnan(objects["x"][3])
+    assert objects["id"].dtype == np.int64
+
+
+def test_extract_drawing_contents_empty():
+    tables = extract_drawing_contents([], FakeDrawingHandler())
+    assert len(tables["objects"]) == 0
+    assert list(tables["objects"].columns) == [
+        "drawing",
+        "view",
+        "id",
+        "type",
+        "x",
+        "y",
+        "model_id",
+    ]
@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+from pytekla.events import ChangeLog, ManualEvents, ModelEventListener
+
+
+class RecordingInvalidator:
+    def __init__(self):
+        self.calls = []
+
+    def invalidate(self, ids):
+        self.calls.append(None if ids is None else list(ids))
+
+
+def test_change_log_record_and_drain():
+    log = ChangeLog()
+    log.record([3, 1], "modified")
+    log.record([2], "deleted")
+    log.record([1], "modified")
+    assert len(log) == 3
+
+    changes, reset = log.drain()
+    assert list(changes["modified"]) == [1, 3]
+    assert list(changes["deleted"]) == [2]
+    assert len(changes["inserted"]) == 0
+    assert not reset
+    assert len(log) == 0
+
+
+def test_change_log_wrong_kind():
+    with pytest.raises(ValueError):
+        ChangeLog().record([1], "renamed")
+
+
+def test_change_log_register():
+    with pytest.raises(TypeError):
+        ChangeLog().register(object())
+
+
+def test_change_log_thread_safe():
+    log = ChangeLog()
+    threads = [
+        threading.Thread(target=lambda k=k: [log.record([k * 1000 + i]) for i in range(1000)])
+        for k in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(log) == 8000
+    assert log.version == 8000
+
+
+def test_model_event_listener():
+    log = ChangeLog()
+    invalidator = RecordingInvalidator()
+    log.register(invalidator)
+    events = ManualEvents()
+
+    with ModelEventListener(log, events):
+        assert events.registered
+        events.emit_changes([(10, "modified"), (5, "deleted"), (10, "modified")])
+        assert invalidator.calls == []
+        assert list(log.flush()) == [5, 10]
+        assert invalidator.calls == [[5, 10]]
+
+        log.flush()
+        assert len(invalidator.calls) == 1
+
+        events.emit_model_load()
+        assert log.flush() is None
+        assert invalidator.calls[-1] is None
+
+    assert not events.registered
+    assert events.ModelObjectChanged.handlers == []
+    events.emit_changes([(1, "inserted")])
+    assert len(log) == 0
@@ -0,0 +1,50 @@
+import pytest
+from Tekla.Structures.Filtering import BinaryFilterExpressionCollection
+
+from pytekla.filtering import F, compile_filter, report_property_name
+
+
+def test_report_property_name():
+    assert report_property_name("profile") == "PROFILE"
+    assert report_property_name("class_") == "CLASS"
+    assert report_property_name("WEIGHT_NET") == "WEIGHT_NET"
+
+
+@pytest.mark.parametrize(
+    "predicate",
+    [
+        F.profile.startswith("HEA") & (F.phase == 2),
+        F.material.isin(["S235", "S355"]) | (F.length > 6000),
+        ~(F.name.contains("BEAM") & (F.class_ != "3")),
+        ~F.phase.isin([1, 2]),
+    ],
+)
+def test_compile_filter_fully_supported(predicate):
+    filter_expression, residual = compile_filter(predicate)
+    assert isinstance(filter_expression, BinaryFilterExpressionCollection)
+    assert residual is None
+
+
+def test_compile_filter_residual():
+    unsupported = F.weight / F.length > 0.1
+    filter_expression, residual = compile_filter(
+        F.profile.startswith("HEA") & unsupported & (F.phase == 2)
+    )
+    assert filter_expression is not None
+    assert residual is unsupported
+
+
+@pytest.mark.parametrize(
+    "predicate",
+    [
+        F.profile.isna(),
+        F.profile > "HEA",
+        (F.phase == 2) | F.profile.isna(),
+        F.phase.isin([]),
+        F.weight == F.length,
+    ],
+)
+def test_compile_filter_not_supported(predicate):
+    filter_expression, residual = compile_filter(predicate)
+    assert filter_expression is None
+    assert residual is predicate
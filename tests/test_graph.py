@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from pytekla.graph import ConnectivityGraph
+
+
+@pytest.fixture
+def graph():
+    # parts 100-101-102 connected by a bolt and a weld, parts 200-201 by a bolt
+    return ConnectivityGraph.from_edges(
+        connector_ids=[1, 2, 3],
+        connector_kinds=[0, 1, 0],
+        edge_connectors=[0, 0, 1, 1, 2, 2, 2],
+        edge_parts=[101, 100, 101, 102, 200, 201, 201],
+    )
+
+
+def test_graph_csr(graph):
+    assert list(graph.part_ids) == [100, 101, 102, 200, 201]
+    assert list(graph.indptr) == [0, 1, 3, 4, 5, 6]
+    assert list(graph.connectors_of(101)) == [1, 2]
+    assert list(graph.connectors_of(201)) == [3]
+    assert len(graph.connectors_of(999)) == 0
+
+
+def test_graph_part_adjacency(graph):
+    indptr, indices = graph.part_adjacency()
+    assert list(indptr) == [0, 1, 3, 4, 5, 6]
+    assert list(indices) == [1, 0, 2, 1, 4, 3]
+
+
+def test_graph_connected_components(graph):
+    labels = graph.connected_components()
+    assert labels[0] == labels[1] == labels[2]
+    assert labels[3] == labels[4]
+    assert labels[0] != labels[3]
+
+
+def test_graph_to_scipy(graph):
+    pytest.importorskip("scipy")
+    incidence = graph.to_scipy()
+    assert incidence.shape == (5, 3)
+    adjacency = graph.to_scipy(part_to_part=True)
+    assert adjacency.shape == (5, 5)
+    assert adjacency.nnz == 6
+
+
+def test_empty_graph():
+    graph = ConnectivityGraph.from_edges([], [], [], [])
+    assert len(graph) == 0
+    assert len(graph.connected_components()) == 0
+
+
+def test_graph_part_adjacency_random():
+    rng = np.random.default_rng(0)
+    edge_connectors = rng.integers(0, 50, 200)
+    edge_parts = rng.integers(0, 80, 200)
+    graph = ConnectivityGraph.from_edges(np.arange(50), np.zeros(50), edge_connectors, edge_parts)
+    parts = graph.part_index(edge_parts)
+    expected = set()
+    for connector in range(50):
+        connected = parts[edge_connectors == connector]
+        expected.update((a, b) for a in connected for b in connected if a != b)
+    indptr, indices = graph.part_adjacency()
+    rows = np.repeat(np.arange(len(graph)), np.diff(indptr))
+    assert set(zip(rows.tolist(), indices.tolist())) == expected
+    assert len(indices) == len(expected)
+    labels = graph.connected_components()
+    assert all(labels[a] == labels[b] for a, b in expected)
@@ -1,6 +1,6 @@
 import pytest
 
-from pytekla.coreutils.names import is_pascal_case, to_pascal_case
+from pytekla.coreutils.names import intern_string, is_pascal_case, to_pascal_case
 
 
 def test_is_pascal_case():
@@ -25,3 +25,12 @@ def test_to_pascal_case():
     assert to_pascal_case("_leading_underscore") == "LeadingUnderscore"
     assert to_pascal_case("trailing_underscore_") == "TrailingUnderscore"
     assert to_pascal_case("__double_underscore__") == "DoubleUnderscore"
+
+
+def test_intern_string():
+    a = intern_string("".join(["HEA", "200"]))
+    b = intern_string("".join(["HEA", "200"]))
+    assert a == "HEA200"
+    assert a is b
+    assert intern_string(42) == 42
+    assert intern_string(None) is None
@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pytekla.pipeline import Pipeline, compile_spec, parse_expression
+from pytekla.query import Field
+from tests.fakes import FakeModelObject
+
+
+class FakeSelector:
+    def __init__(self, objects):
+        self.objects = objects
+
+    def GetAllObjects(self):
+        return iter(self.objects)
+
+    def GetAllObjectsWithType(self, types):
+        return iter(self.objects)
+
+    def GetObjectsByFilter(self, filter_expression):
+        return iter(self.objects)
+
+
+class FakeTeklaModel:
+    def __init__(self, objects):
+        self.selector = FakeSelector(objects)
+
+    def GetModelObjectSelector(self):
+        return self.selector
+
+
+class FakeModel:
+    def __init__(self, objects):
+        self.tekla_model = FakeTeklaModel(objects)
+
+    def unwrap(self):
+        return self.tekla_model
+
+
+@pytest.fixture
+def model():
+    return FakeModel(
+        [
+            FakeModelObject(
+                i,
+                "Beam",
+                f"B{i}",
+                user_properties={"USER_FIELD_1": f"U{i}"},
+                WEIGHT=float(10 * i),
+                LENGTH=1000.0,
+            )
+            for i in range(1, 6)
+        ]
+    )
+
+
+def test_parse_expression():
+    expression = parse_expression(
+        "profile.startswith('HEA') and phase in [1, 2] and not WEIGHT / LENGTH > 0.1"
+    )
+    assert expression.fields() == {"profile", "phase", "WEIGHT", "LENGTH"}
+    assert isinstance(parse_expression("WEIGHT"), Field)
+    assert parse_expression("-WEIGHT * 2").fields() == {"WEIGHT"}
+
+    for text in ["__import__('os').system('x')", "WEIGHT.__class__", "1 < WEIGHT < 2", "WEIGHT +"]:
+        with pytest.raises(ValueError):
+            parse_expression(text)
+
+
+def test_pipeline_invalid_spec():
+    with pytest.raises(ValueError):
+        Pipeline({"source": "all", "filter": "WEIGHT > 1"})
+    with pytest.raises(ValueError):
+        Pipeline({"source": "everything"})
+    with pytest.raises(ValueError):
+        Pipeline({"sink": "out.txt"})
+    with pytest.raises(TypeError):
+        Pipeline({"report_properties": {"WEIGHT": "double"}})
+
+
+def test_pipeline_dedupes_report_properties():
+    pipeline = Pipeline(
+        {
+            "report_properties": {"WEIGHT": "int", "PROFILE": "str"},
+            "where": "WEIGHT / LENGTH > 0.01",
+        }
+    )
+    assert pipeline.filter_expression is None
+    assert pipeline.report_properties == {"WEIGHT": int, "PROFILE": str, "LENGTH": float}
+    assert pipeline.columns == ["id", "WEIGHT", "PROFILE"]
+
+
+def test_pipeline_run(model, tmp_path):
+    sink = tmp_path / "out.csv"
+    pipeline = compile_spec(
+        {
+            "types": ["Beam"],
+            "where": "WEIGHT / LENGTH >= 0.03",
+            "report_properties": {"WEIGHT": "float"},
+            "user_properties": {"USER_FIELD_1": "str"},
+            "attributes": ["name"],
+            "derived": {"WEIGHT_T": "WEIGHT / 1000"},
+            "sink": str(sink),
+            "chunk_size": 2,
+            "max_workers": 2,
+        }
+    )
+
+    dataframe = pipeline.run(model)
+
+    assert list(dataframe.columns) == ["id", "WEIGHT", "USER_FIELD_1", "name", "WEIGHT_T"]
+    assert list(dataframe["id"]) == [3, 4, 5]
+    assert list(dataframe["USER_FIELD_1"]) == ["U3", "U4", "U5"]
+    assert list(dataframe["name"]) == ["B3", "B4", "B5"]
+    assert list(dataframe["WEIGHT_T"]) == [0.03, 0.04, 0.05]
+    # one report property call per object, user properties only for the matching ones
+    assert [o.calls for o in model.tekla_model.selector.objects] == [1, 1, 2, 2, 2]
+    pd.testing.assert_frame_equal(pd.read_csv(sink), dataframe, check_dtype=False)
+
+
+def test_pipeline_run_selected(model, monkeypatch):
+    objects = model.tekla_model.selector.objects + [
+        FakeModelObject(6, "ContourPlate", "P6", WEIGHT=100.0)
+    ]
+
+    class FakeUISelector:
+        def GetSelectedObjects(self):
+            return iter(objects)
+
+    monkeypatch.setattr(
+        "pytekla.pipeline.session.get_ui_model_object_selector", lambda: FakeUISelector()
+    )
+    pipeline = Pipeline({"source": "selected", "types": ["Beam"], "where": "WEIGHT > 20"})
+
+    assert pipeline.filter_expression is None
+    assert "pushed-down" not in pipeline.explain()
+    assert [s[0] for s in pipeline.stages()][:2] == ["fetch", "type filter"]
+    assert list(pipeline.run(model)["id"]) == [3, 4, 5]
+
+
+def test_pipeline_run_missing_chunk():
+    objects = [
+        FakeModelObject(1, "Beam", "B1"),
+        FakeModelObject(2, "Beam", "B2"),
+        FakeModelObject(3, "Beam", "B3", WEIGHT=30.0, LENGTH=1000.0),
+    ]
+    pipeline = Pipeline(
+        {
+            "report_properties": {"WEIGHT": "float", "LENGTH": "float", "PROFILE": "str"},
+            "derived": {"WPM": "WEIGHT / LENGTH"},
+            "chunk_size": 2,
+        }
+    )
+
+    dataframe = pipeline.run(FakeModel(objects))
+
+    assert dataframe["WEIGHT"].dtype == np.float64
+    assert dataframe["WPM"].isna().tolist() == [True, True, False]
+    assert dataframe["WPM"][2] == 0.03
+    assert dataframe["PROFILE"].isna().all()
+
+
+def test_pipeline_run_empty():
+    dataframe = Pipeline({"report_properties": {"WEIGHT": "float"}}).run(FakeModel([]))
+    assert list(dataframe.columns) == ["id", "WEIGHT"]
+    assert len(dataframe) == 0
+
+
+def test_pipeline_explain():
+    pipeline = Pipeline(
+        {
+            "types": ["Beam"],
+            "where": "profile == 'HEA200' and WEIGHT / LENGTH > 0.1",
+            "report_properties": {"PROFILE": "str"},
+            "user_properties": {"USER_FIELD_1": "str"},
+            "attributes": ["start_point.x"],
+            "max_workers": 4,
+        }
+    )
+    assert [s[0] for s in pipeline.stages()] == [
+        "fetch",
+        "type filter",
+        "id",
+        "report properties",
+        "local filter",
+        "user properties",
+        "attributes",
+        "fan-out",
+    ]
+    plan = pipeline.explain(object_count=1000, selectivity=0.5)
+    assert plan.startswith("Execution plan")
+    assert "pushed-down model filter" in plan
+    assert "Estimated interop calls: ~11,500 calls" in plan
+    assert "Without optimizations: ~9,000 calls" in plan
@@ -1,6 +1,6 @@
 import pytest
 
-from pytekla.coreutils.properties import check_property_type
+from pytekla.coreutils.properties import check_property_type, split_names_by_type
 
 
 def test_check_property_type():
@@ -10,3 +10,15 @@ def test_check_property_type():
 
     with pytest.raises(TypeError):
         assert check_property_type(list)
+
+
+def test_split_names_by_type():
+    assert split_names_by_type({"PROFILE": str, "LENGTH": float, "PHASE": int, "NAME": str}) == (
+        ["PROFILE", "NAME"],
+        ["LENGTH"],
+        ["PHASE"],
+    )
+    assert split_names_by_type({}) == ([], [], [])
+
+    with pytest.raises(TypeError):
+        split_names_by_type({"PROFILE": list})
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pytekla.query import F, Field, Query
+from pytekla.snapshot import MISSING_INT, ModelSnapshot
+
+
+@pytest.fixture
+def snapshot():
+    return ModelSnapshot(
+        ids=[10, 11, 12, 13, 14],
+        types=["Beam", "Beam", "ContourPlate", "Beam", "Beam"],
+        columns={
+            "PROFILE": ["HEA200", "IPE300", None, "HEA300", "HEA200"],
+            "LENGTH": np.array([7000.0, 8000.0, np.nan, 6500.0, 5000.0]),
+            "PHASE": np.array([2, 2, MISSING_INT, 3, 1], dtype=np.int64),
+            "WEIGHT": np.array([300.0, 400.0, 50.0, 350.0, 200.0]),
+        },
+    )
+
+
+@pytest.fixture
+def dataframe(snapshot):
+    return snapshot.to_dataframe()
+
+
+@pytest.mark.parametrize("table_name", ["snapshot", "dataframe"])
+def test_query_where(table_name, request):
+    table = request.getfixturevalue(table_name)
+    query = Query(table).where(
+        F.PROFILE.startswith("HEA") & (F.LENGTH > 6000) & F.PHASE.isin([2, 3])
+    )
+    assert list(query.mask()) == [True, False, False, True, False]
+    assert list(query.ids()) == [10, 13]
+
+
+def test_query_expressions(snapshot):
+    assert list((F.type == "Beam").evaluate(snapshot)) == [True, True, False, True, True]
+    assert list(F.PROFILE.endswith("200").evaluate(snapshot)) == [True, False, False, False, True]
+    assert list(F.PROFILE.contains("EA").evaluate(snapshot)) == [True, False, False, True, True]
+    assert list(F.PROFILE.isna().evaluate(snapshot)) == [False, False, True, False, False]
+    assert list(F.PHASE.isna().evaluate(snapshot)) == [False, False, True, False, False]
+    assert list((~(F.WEIGHT >= 350)).evaluate(snapshot)) == [True, False, True, False, True]
+    assert list((F.WEIGHT / 100).evaluate(snapshot)) == [3.0, 4.0, 0.5, 3.5, 2.0]
+    assert Field("LENGTH").fields() == {"LENGTH"}
+    assert ((F.A > 1) | F.B.isin([1])).fields() == {"A", "B"}
+
+
+def test_query_missing_values(snapshot):
+    assert list((F.PHASE < 3).evaluate(snapshot)) == [True, True, False, False, True]
+    assert list((F.PHASE != 2).evaluate(snapshot)) == [False, False, False, True, True]
+    assert list((F.PROFILE != "HEA200").evaluate(snapshot)) == [False, True, False, True, False]
+    assert list((F.LENGTH != 7000).evaluate(snapshot)) == [False, True, False, True, True]
+    assert list((F.PHASE >= F.PHASE).evaluate(snapshot)) == [True, True, False, True, True]
+
+    phase = (F.PHASE + 1).evaluate(snapshot)
+    assert np.isnan(phase[2])
+    assert list(phase[[0, 1, 3, 4]]) == [3, 3, 4, 2]
+    assert list(((F.PHASE + 1) > 0).evaluate(snapshot)) == [True, True, False, True, True]
+    assert (F.WEIGHT * 2).evaluate(snapshot).dtype == np.float64
+    assert (F.id + 1).evaluate(snapshot).dtype == np.int64
+
+
+def test_query_select_and_rows(snapshot):
+    rows = (
+        Query(snapshot)
+        .where(F.WEIGHT > 300)
+        .select("PROFILE", WEIGHT_T=F.WEIGHT / 1000)
+        .rows()
+    )
+    assert list(rows.columns) == ["PROFILE", "WEIGHT_T"]
+    assert list(rows["PROFILE"]) == ["IPE300", "HEA300"]
+    assert list(rows["WEIGHT_T"]) == [0.4, 0.35]
+
+
+def test_query_group_by(snapshot):
+    grouped = Query(snapshot).where(F.type == "Beam").group_by(
+        "PROFILE", total=("WEIGHT", "sum"), count=("id", "count")
+    )
+    assert grouped.loc["HEA200", "total"] == 500.0
+    assert grouped.loc["HEA200", "count"] == 2
+
+
+def test_query_dict_table():
+    table = {"id": [1, 2, 3], "NAME": ["COLUMN", "BEAM", "BEAM"]}
+    assert list(Query(table).where(F.NAME == "BEAM").ids()) == [2, 3]
+    assert isinstance(Query(table).rows(), pd.DataFrame)
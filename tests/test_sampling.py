@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from pytekla.sampling import (
+    approximate_aggregates,
+    estimate_distinct,
+    reservoir_sample,
+    stratified_sample,
+)
+from tests.fakes import FakeModelObject
+
+
+@pytest.fixture
+def objects():
+    rng = np.random.default_rng(0)
+    beams = [
+        FakeModelObject(type_name="Beam", WEIGHT=w, PROFILE=f"HEA{100 + 20 * (i % 15)}")
+        for i, w in enumerate(rng.normal(400, 50, 5000))
+    ]
+    plates = [FakeModelObject(type_name="ContourPlate", WEIGHT=20.0) for _ in range(300)]
+    return beams + plates
+
+
+def test_reservoir_sample():
+    sample, count = reservoir_sample(range(10000), 100, seed=1)
+    assert count == 10000
+    assert len(set(sample)) == 100
+    assert reservoir_sample(range(10000), 100, seed=1)[0] == sample
+    assert reservoir_sample(range(5), 100) == ([0, 1, 2, 3, 4], 5)
+
+
+def test_stratified_sample(objects):
+    strata = stratified_sample(objects, 50, seed=1)
+    assert {k: (len(s), c) for k, (s, c) in strata.items()} == {
+        "Beam": (50, 5000),
+        "ContourPlate": (50, 300),
+    }
+
+
+def test_approximate_aggregates(objects):
+    estimates = approximate_aggregates(objects, ["WEIGHT"], sample_size=200, seed=1)
+    assert sum(o.calls for o in objects) == 400
+
+    beams = estimates.loc["Beam"]
+    exact = sum(o.properties["WEIGHT"] for o in objects[:5000])
+    assert beams["count"] == 5000
+    assert beams["sampled"] == 200
+    assert abs(beams["WEIGHT_total"] - exact) < 3 * beams["WEIGHT_error"]
+    assert estimates.loc["ContourPlate", "WEIGHT_total"] == 6000
+    assert estimates.loc["ContourPlate", "WEIGHT_error"] == 0
+    assert estimates.loc["total", "count"] == 5300
+
+
+def test_approximate_aggregates_quantiles(objects):
+    estimates = approximate_aggregates(
+        objects, ["WEIGHT"], sample_size=200, seed=1, quantiles=(0.05, 0.5, 0.9)
+    )
+    assert [c for c in estimates.columns if "_q" in c] == ["WEIGHT_q5", "WEIGHT_q50", "WEIGHT_q90"]
+    assert abs(estimates.loc["Beam", "WEIGHT_q50"] - 400) < 20
+    assert 400 < estimates.loc["Beam", "WEIGHT_q90"] < 500
+    assert estimates.loc["ContourPlate", "WEIGHT_q50"] == 20.0
+    # the plates are 300 of the 5300 objects, more than 5%, although half of the sample
+    assert estimates.loc["total", "WEIGHT_q5"] == 20.0
+    assert abs(estimates.loc["total", "WEIGHT_q50"] - 400) < 20
+
+
+def test_approximate_aggregates_missing_quantiles():
+    objects = [FakeModelObject(type_name="Beam", WEIGHT=100.0) for _ in range(10)]
+    objects += [FakeModelObject(type_name="Beam") for _ in range(30)]
+    estimates = approximate_aggregates(objects, ["WEIGHT"], sample_size=100, quantiles=(0.1, 0.5))
+    assert estimates.loc["Beam", "WEIGHT_total"] == 1000
+    assert estimates.loc["Beam", "WEIGHT_mean"] == 25
+    assert estimates.loc["Beam", "WEIGHT_q10"] == estimates.loc["Beam", "WEIGHT_q50"] == 100
+    assert estimates.loc["total", "WEIGHT_q50"] == 100
+
+
+def test_estimate_distinct(objects):
+    result = estimate_distinct(objects[:5000], "PROFILE", sample_size=500, seed=1)
+    assert result["observed"] == 15
+    assert result["estimate"] == 15
+
+    result = estimate_distinct(objects[:40], "PROFILE", sample_size=100)
+    assert result["estimate"] == result["observed"] == 15
@@ -0,0 +1,76 @@
+from pytekla.schema import REPROBE_LIMIT, ExtractionPlan, ReportPropertySchema
+from tests.fakes import FakeModelObject
+
+
+def test_schema_save_and_load(tmp_path):
+    schema = ReportPropertySchema(
+        {
+            "Beam": {"PROFILE": str, "LENGTH": float, "PHASE": int},
+            "BoltArray": {"PROFILE": None, "LENGTH": float, "PHASE": int},
+        }
+    )
+    path = tmp_path / "schema.json"
+    schema.save(path)
+    assert ReportPropertySchema.load(path).types == schema.types
+
+
+def test_schema_load_or_discover(tmp_path):
+    path = tmp_path / "schema.json"
+    objects = [FakeModelObject(type_name="Beam", PROFILE="HEA200", LENGTH=5000.0) for _ in range(5)]
+    objects += [FakeModelObject(type_name="BoltArray", BOLT_SIZE=20.0) for _ in range(5)]
+    names = ["PROFILE", "LENGTH", "BOLT_SIZE"]
+
+    schema = ReportPropertySchema.load_or_discover(None, objects, names, path=path)
+    assert schema.types["BoltArray"] == {"PROFILE": None, "LENGTH": None, "BOLT_SIZE": float}
+    probes = sum(o.calls for o in objects)
+
+    # the second session knows every property, even the ones that don't apply to a type
+    schema = ReportPropertySchema.load_or_discover(None, objects, names, path=path)
+    assert sum(o.calls for o in objects) == probes
+    schema.plan_for(objects[-1], names)
+    assert sum(o.calls for o in objects) == probes
+
+
+def test_schema_update_stops_when_sampled():
+    consumed = []
+
+    def objects():
+        for i in range(100):
+            consumed.append(i)
+            yield FakeModelObject(type_name="Beam", PROFILE="HEA200", PHASE=i)
+
+    schema = ReportPropertySchema.discover(objects(), ["PROFILE", "PHASE", "CAMBER"], sample_size=3)
+    assert schema.types == {"Beam": {"PROFILE": str, "PHASE": int, "CAMBER": None}}
+    assert len(consumed) == 3
+
+
+def test_schema_reprobes_not_found_properties():
+    schema = ReportPropertySchema.discover(
+        [FakeModelObject(type_name="Beam", PROFILE="HEA200")], ["PROFILE", "CAMBER"]
+    )
+    assert schema.types["Beam"]["CAMBER"] is None
+    assert schema.plan("Beam", ["PROFILE", "CAMBER"]).properties == {"PROFILE": str}
+
+    later = FakeModelObject(type_name="Beam", PROFILE="HEA200", CAMBER=5.0)
+    plan = schema.plan_for(later, ["PROFILE", "CAMBER"])
+    assert plan.properties == {"PROFILE": str, "CAMBER": float}
+
+    # after REPROBE_LIMIT objects, a property that is never found is not probed anymore
+    objects = [FakeModelObject(type_name="Plate") for _ in range(REPROBE_LIMIT + 5)]
+    for obj in objects:
+        schema.plan_for(obj, ["PROFILE"])
+    assert [o.calls for o in objects[REPROBE_LIMIT - 1 :]] == [3, 0, 0, 0, 0, 0]
+
+
+def test_schema_plan():
+    schema = ReportPropertySchema({"BoltArray": {"PROFILE": None, "BOLT_SIZE": float}})
+    plan = schema.plan("BoltArray", ["PROFILE", "BOLT_SIZE"])
+    assert isinstance(plan, ExtractionPlan)
+    assert plan.names == ["PROFILE", "BOLT_SIZE"]
+    assert plan.properties == {"BOLT_SIZE": float}
+    assert schema.plan("BoltArray", ["PROFILE", "BOLT_SIZE"]) is plan
+
+
+def test_empty_plan_does_not_read():
+    plan = ExtractionPlan(["PROFILE"], {})
+    assert plan.read(object()) == {"PROFILE": None}
@@ -0,0 +1,112 @@
+import threading
+
+import pytest
+
+from pytekla.events import ChangeLog
+from pytekla.query import F
+from pytekla.server import QueryClient, QueryServer
+from tests.fakes import FakeModel, FakeModelObject
+
+AUTHKEY = b"test-key"
+
+
+@pytest.fixture
+def model():
+    return FakeModel(
+        [
+            FakeModelObject(1, "Beam", PROFILE="HEA200", WEIGHT=150.0),
+            FakeModelObject(2, "Beam", PROFILE="IPE300", WEIGHT=80.0),
+            FakeModelObject(3, "ContourPlate", PROFILE="PL10*100", WEIGHT=20.0),
+        ]
+    )
+
+
+@pytest.fixture
+def server(model):
+    server = QueryServer(model, address=("127.0.0.1", 0), authkey=AUTHKEY, change_log=ChangeLog())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    with QueryClient(server.address, AUTHKEY) as client:
+        client.shutdown()
+    thread.join(5)
+
+
+def test_server_query(server, model):
+    properties = {"PROFILE": str, "WEIGHT": float}
+    with QueryClient(server.address, AUTHKEY) as client:
+        assert client.ping()
+        df = client.query(["Beam"], properties, where=F.WEIGHT > 100, columns=["id", "PROFILE"])
+        assert list(df["id"]) == [1]
+        assert list(df["PROFILE"]) == ["HEA200"]
+
+        df = client.query(["Beam"], properties)
+        assert list(df["WEIGHT"]) == [150.0, 80.0]
+        assert model.extractions == 1
+
+        assert len(client.query(report_properties=properties)) == 3
+        assert model.extractions == 2
+        assert sorted(client.tables().values()) == [2, 3]
+
+
+def test_server_invalidation(server, model):
+    properties = {"WEIGHT": float}
+    with QueryClient(server.address, AUTHKEY) as client:
+        client.query(["Beam"], properties)
+        client.query(["ContourPlate"], properties)
+
+        server.change_log.record([3], "modified")
+        model.objects[2].properties["WEIGHT"] = 25.0
+        assert list(client.query(["ContourPlate"], properties)["WEIGHT"]) == [25.0]
+        assert model.extractions == 3
+
+        client.query(["Beam"], properties)
+        assert model.extractions == 3
+
+        client.invalidate()
+        assert client.tables() == {}
+
+
+def test_server_errors(server):
+    with QueryClient(server.address, AUTHKEY) as client:
+        with pytest.raises(RuntimeError, match="Unknown operation"):
+            client._request(op="explode")
+        with pytest.raises(RuntimeError):
+            client.query(["Beam"], {"WEIGHT": float}, columns=["MISSING"])
+
+
+def test_server_extraction_does_not_block(model):
+    started, release = threading.Event(), threading.Event()
+    get_objects_with_types = model.get_objects_with_types
+
+    def slow_get_objects_with_types(types):
+        if "Beam" in types:
+            started.set()
+            release.wait(30)
+        return get_objects_with_types(types)
+
+    model.get_objects_with_types = slow_get_objects_with_types
+    server = QueryServer(model, address=("127.0.0.1", 0), authkey=AUTHKEY)
+    properties = {"WEIGHT": float}
+    tables = []
+    threads = [
+        threading.Thread(target=lambda: tables.append(server.get_table(["Beam"], properties)))
+        for _ in range(2)
+    ]
+    threads[0].start()
+    assert started.wait(5)
+    threads[1].start()
+
+    # the other tables are answered while the beams are extracted
+    plates = threading.Thread(target=server.get_table, args=(["ContourPlate"], properties))
+    plates.start()
+    plates.join(5)
+    assert not plates.is_alive()
+    assert server.handle({"op": "tables"})["result"] == {(("ContourPlate",), (("WEIGHT", "float"),)): 1}
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(tables) == 2 and tables[0] is tables[1]
+    assert model.extractions == 2
+    server._listener.close()
@@ -0,0 +1,32 @@
+import pytest
+from Tekla.Structures.Drawing import DrawingHandler
+from Tekla.Structures.Model import Model
+
+from pytekla import ModelWrapper, session
+
+
+def test_shared_handles():
+    session.reset()
+    model = session.get_model(check_connection=False)
+    assert isinstance(model, Model)
+    assert session.get_model(check_connection=False) is model
+    assert session.get_picker() is session.get_picker()
+    assert session.get_ui_model_object_selector() is session.get_ui_model_object_selector()
+    assert session.get_model_object_selector() is session.get_model_object_selector()
+    assert isinstance(session.get_drawing_handler(check_connection=False), DrawingHandler)
+
+
+def test_reset():
+    model = session.get_model(check_connection=False)
+    picker = session.get_picker()
+    session.reset()
+    assert session.get_model(check_connection=False) is not model
+    assert session.get_picker() is not picker
+
+
+def test_model_wrapper_uses_session():
+    session.reset()
+    if not session.is_connected():
+        pytest.skip("Tekla Structures is not running")
+    first, second = ModelWrapper(), ModelWrapper()
+    assert first.unwrap() is second.unwrap()
@@ -0,0 +1,122 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from pytekla.snapshot import MISSING_INT, ModelSnapshot, StringColumn, map_snapshot
+
+
+def _total_length(snapshot):
+    return np.nansum(snapshot["LENGTH"])
+
+
+@pytest.fixture
+def snapshot():
+    return ModelSnapshot(
+        ids=[10, 11, 12, 13],
+        types=["Beam", "Beam", "ContourPlate", "Beam"],
+        columns={
+            "PROFILE": ["HEA200", "HEA200", None, "IPE300"],
+            "LENGTH": np.array([5000.0, 7000.0, np.nan, 6500.0]),
+            "PHASE": np.array([1, 2, MISSING_INT, 2], dtype=np.int64),
+        },
+    )
+
+
+def test_string_column():
+    column = StringColumn.from_values(["a", "b", None, "a"])
+    assert list(column.codes) == [0, 1, -1, 0]
+    assert column.categories == ("a", "b")
+    assert list(column.decode()) == ["a", "b", None, "a"]
+
+
+def test_snapshot_columns(snapshot):
+    assert len(snapshot) == 4
+    assert list(snapshot["id"]) == [10, 11, 12, 13]
+    assert list(snapshot["type"]) == ["Beam", "Beam", "ContourPlate", "Beam"]
+    assert isinstance(snapshot.columns["PROFILE"], StringColumn)
+    assert list(snapshot["PROFILE"]) == ["HEA200", "HEA200", None, "IPE300"]
+
+
+def test_snapshot_wrong_length():
+    with pytest.raises(ValueError):
+        ModelSnapshot([1, 2], ["Beam"])
+
+
+def test_snapshot_take_and_split(snapshot):
+    taken = snapshot.take(snapshot["LENGTH"] > 6000)
+    assert list(taken.ids) == [11, 13]
+    assert list(taken["PROFILE"]) == ["HEA200", "IPE300"]
+
+    parts = snapshot.split(3)
+    assert [len(p) for p in parts] == [2, 1, 1]
+    assert list(np.concatenate([p.ids for p in parts])) == list(snapshot.ids)
+
+
+def test_snapshot_pickle(snapshot):
+    restored = pickle.loads(pickle.dumps(snapshot))
+    assert list(restored.ids) == list(snapshot.ids)
+    assert list(restored["PROFILE"]) == list(snapshot["PROFILE"])
+    assert np.array_equal(restored["PHASE"], snapshot["PHASE"])
+
+
+def test_snapshot_to_dataframe(snapshot):
+    dataframe = snapshot.to_dataframe()
+    assert list(dataframe.columns) == ["id", "type", "PROFILE", "LENGTH", "PHASE"]
+    assert dataframe["PHASE"].isna().tolist() == [False, False, True, False]
+    assert str(dataframe["PROFILE"].dtype) == "category"
+
+
+def test_map_snapshot(snapshot):
+    results = map_snapshot(_total_length, snapshot, chunks=2, max_workers=2)
+    assert len(results) == 2
+    assert sum(results) == 18500.0
+
+
+def test_snapshot_save_and_open(snapshot, tmp_path):
+    path = tmp_path / "model.snapshot"
+    snapshot.save(path)
+    opened = ModelSnapshot.open(path)
+
+    assert opened.path == str(path)
+    assert not opened.ids.flags.writeable
+    assert list(opened.ids) == list(snapshot.ids)
+    assert list(opened["type"]) == list(snapshot["type"])
+    assert list(opened["PROFILE"]) == list(snapshot["PROFILE"])
+    assert np.array_equal(opened["LENGTH"], snapshot["LENGTH"], equal_nan=True)
+    assert np.array_equal(opened["PHASE"], snapshot["PHASE"])
+
+    restored = pickle.loads(pickle.dumps(opened))
+    assert restored.path == opened.path
+
+
+def test_snapshot_file_parts_pickle(tmp_path):
+    size = 1000
+    path = tmp_path / "model.snapshot"
+    ModelSnapshot(
+        ids=np.arange(size),
+        types=["Beam"] * size,
+        columns={"LENGTH": np.arange(size) * 1.5},
+    ).save(path)
+    opened = ModelSnapshot.open(path)
+
+    parts = opened.split(3)
+    data = pickle.dumps(parts[1])
+    # the part is sent as the path and its rows, without the column data
+    assert parts[1].columns["LENGTH"].tobytes() not in data
+    assert len(data) < 1000
+
+    restored = pickle.loads(data)
+    assert restored.path == str(path)
+    assert list(restored.ids) == list(parts[1].ids)
+    assert np.array_equal(restored["LENGTH"], parts[1]["LENGTH"])
+    nested = restored.split(2)[1]
+    assert list(pickle.loads(pickle.dumps(nested)).ids) == list(nested.ids)
+    assert sum(map_snapshot(_total_length, opened, chunks=3, max_workers=2)) == 1.5 * 999 * 500
+
+
+def test_snapshot_open_invalid_file(tmp_path):
+    path = tmp_path / "not.snapshot"
+    path.write_bytes(b"something else")
+    with pytest.raises(ValueError):
+        ModelSnapshot.open(path)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from pytekla.spatial import sweep_bounding_box, tile_grid
+from tests.fakes import FakeIdentifier, FakeType
+
+
+class FakeBeam:
+    def __init__(self, _id, low, high):
+        self.Identifier = FakeIdentifier(_id)
+        self.low = np.asarray(low, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+        self.reads = 0
+
+    def GetType(self):
+        return FakeType("Beam")
+
+    def GetAllReportProperties(self, string_names, float_names, int_names, hash_table):
+        self.reads += 1
+        hash_table["LENGTH"] = float(np.linalg.norm(self.high - self.low))
+        return True
+
+
+class FakeModel:
+    def __init__(self, objects):
+        self.objects = objects
+
+    def get_objects_by_bounding_box(self, min_point_coords, max_point_coords):
+        low, high = np.asarray(min_point_coords), np.asarray(max_point_coords)
+        return (
+            o for o in self.objects if (o.low <= high).all() and (o.high >= low).all()
+        )
+
+
+def test_tile_grid():
+    tiles = tile_grid((0, 0, 0), (100, 100, 10), (2, 2, 1))
+    assert tiles.shape == (4, 2, 3)
+    assert tiles[1].tolist() == [[0, 50, 0], [50, 100, 10]]
+    assert tile_grid((0, 0, 0), (1, 1, 1), 3).shape == (27, 2, 3)
+    with pytest.raises(ValueError):
+        tile_grid((0, 0, 0), (1, 1, 1), (0, 1, 1))
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_sweep_bounding_box(max_workers):
+    objects = [
+        FakeBeam(i, (x, y, 0), (x + 10, y, 0))
+        for i, (x, y) in enumerate((x, y) for x in range(0, 100, 15) for y in range(0, 100, 15))
+    ]
+    model = FakeModel(objects + [FakeBeam(999, (500, 500, 0), (510, 500, 0))])
+
+    tiles = list(
+        sweep_bounding_box(
+            model,
+            (0, 0, -1),
+            (100, 100, 1),
+            shape=(3, 3, 1),
+            report_properties={"LENGTH": float},
+            max_workers=max_workers,
+        )
+    )
+
+    assert sorted(t.index for t in tiles) == list(range(9))
+    ids = np.concatenate([t.snapshot.ids for t in tiles])
+    assert sorted(ids) == list(range(len(objects)))
+    assert all(o.reads == 1 for o in objects)
+    assert all((t.snapshot["LENGTH"] == 10).all() for t in tiles)
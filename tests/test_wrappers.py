@@ -1,5 +1,6 @@
 import inspect
 
+import numpy as np
 import pytest
 from Tekla.Structures import TeklaStructuresSettings
 from Tekla.Structures.Analysis import AnalysisBeamEnd
@@ -15,6 +16,7 @@ from pytekla import (
     ModelWrapper,
     wrap,
 )
+from tests.fakes import FakeIdentifier, FakePoint
 
 
 @pytest.mark.parametrize(
@@ -55,3 +57,341 @@ def test_wrapper_objects_creation(tekla_object, wrapper_type, tekla_type, detect
         assert isinstance(wrapped_object, wrapper_type)
         if detect_type:
             assert isinstance(wrapped_object.unwrap(), tekla_type)
+
+
+def test_model_select():
+    beam = Beam(Point(0, 0, 0), Point(1000, 0, 0))
+    beam.Name = "B1"
+    beam.Profile.ProfileString = "HEA200"
+    beam.Material.MaterialString = "S355"
+
+    records = list(
+        ModelWrapper(Model()).select(
+            ["name", "profile", "material", "start_point", "end_point", "position.depth", "radius"],
+            [wrap(beam), beam],
+        )
+    )
+
+    assert len(records) == 2
+    record = records[0]
+    assert record == records[1]
+    assert not isinstance(record.name, BaseWrapper)
+    assert record.name == "B1"
+    assert record.profile == "HEA200"
+    assert record.material == "S355"
+    assert record.start_point == (0.0, 0.0, 0.0)
+    assert record.end_point == (1000.0, 0.0, 0.0)
+    assert record.position_depth is not None
+    assert record.radius is None
+
+
+class FakeAssembly:
+    def __init__(self, name):
+        self.Name = name
+
+
+class FakePart:
+    def __init__(self, _id, assembly=None):
+        self.Identifier = FakeIdentifier(_id)
+        self.Class = str(_id)
+        self.assembly = assembly
+        self.calls = 0
+
+    def GetAssembly(self):
+        self.calls += 1
+        return self.assembly
+
+
+def test_model_select_stand_in_objects():
+    parts = [FakePart(1), FakePart(2, FakeAssembly("A2")), FakePart(3, FakeAssembly("A3"))]
+
+    records = list(
+        ModelWrapper(Model()).select(["id", "class", "get_assembly.name", "finish"], parts)
+    )
+
+    assert records[0]._fields == ("id", "class_", "get_assembly_name", "finish")
+    assert [r.id for r in records] == [1, 2, 3]
+    assert [r.class_ for r in records] == ["1", "2", "3"]
+    # a None value in the first object doesn't hide the field in the other ones
+    assert [r.get_assembly_name for r in records] == [None, "A2", "A3"]
+    assert [r.finish for r in records] == [None, None, None]
+    assert [p.calls for p in parts] == [1, 1, 1]
+
+
+class FakeDrawing:
+    def __init__(self, mark, can_modify=True, _id=0, read_only=(), missing_properties=()):
+        self.Mark = mark
+        self.Title1 = ""
+        self.user_properties = {}
+        self.modifications = 0
+        self.can_modify = can_modify
+        self.identifier = FakeIdentifier(_id)
+        self.read_only = read_only
+        self.missing_properties = missing_properties
+
+    def __setattr__(self, name, value):
+        if name in self.__dict__.get("read_only", ()):
+            raise AttributeError(f"{name} is read only")
+        super().__setattr__(name, value)
+
+    def GetIdentifier(self):
+        return self.identifier
+
+    def SetUserProperty(self, name, value):
+        if name in self.missing_properties:
+            return False
+        self.user_properties[name] = value
+        return True
+
+    def Modify(self):
+        self.modifications += 1
+        return self.can_modify
+
+
+def test_drawing_batch():
+    drawings = [FakeDrawing("A1"), FakeDrawing("A2", can_modify=False), FakeDrawing("A3")]
+    progress = []
+
+    with DrawingHandlerWrapper().batch(lambda done, total: progress.append((done, total))) as batch:
+        for drawing in drawings:
+            batch.set_user_property(drawing, "DR_CHECKED_BY", "NAA")
+            batch.set_attribute(drawing, "title1", "IFC")
+        batch.set_user_property(drawings[0], "DR_REVISION", 2)
+        assert len(batch) == 3
+        assert all(d.modifications == 0 for d in drawings)
+
+    assert [d.modifications for d in drawings] == [1, 1, 1]
+    assert drawings[0].user_properties == {"DR_CHECKED_BY": "NAA", "DR_REVISION": 2}
+    assert all(d.Title1 == "IFC" for d in drawings)
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    assert batch.report["modified"] == 2
+    assert batch.report["failed"] == ["A2"]
+    assert batch.report["errors"] == ["Modify failed"]
+    assert len(batch) == 0
+
+
+def test_drawing_batch_failures():
+    drawings = [
+        FakeDrawing("A1", missing_properties=["DR_CHECKED_BY"]),
+        FakeDrawing("A2", read_only=["Title1"]),
+        FakeDrawing("A3"),
+    ]
+    batch = DrawingHandlerWrapper().batch()
+    for drawing in drawings:
+        batch.set_user_property(drawing, "DR_CHECKED_BY", "NAA")
+        batch.set_user_property(drawing, "DR_REVISION", 2)
+        batch.set_attribute(drawing, "title1", "IFC")
+    report = batch.apply()
+
+    # every queued property is set even after one fails
+    assert drawings[0].user_properties == {"DR_REVISION": 2}
+    assert drawings[0].modifications == 1
+    assert drawings[1].modifications == 0
+    assert drawings[2].user_properties == {"DR_CHECKED_BY": "NAA", "DR_REVISION": 2}
+    assert report["modified"] == 1
+    assert report["failed"] == ["A1", "A2"]
+    assert report["errors"][0] == "User properties not set: ['DR_CHECKED_BY']"
+    assert report["errors"][1].startswith("AttributeError")
+
+
+def test_drawing_batch_failures_with_the_same_mark():
+    drawings = [
+        FakeDrawing("A1", _id=1, can_modify=False),
+        FakeDrawing("A1", _id=2, read_only=["Title1"]),
+    ]
+    batch = DrawingHandlerWrapper().batch()
+    for drawing in drawings:
+        batch.set_attribute(drawing, "title1", "IFC")
+    report = batch.apply()
+
+    assert report["failed"] == ["A1", "A1"]
+    assert report["errors"][0] == "Modify failed"
+    assert report["errors"][1].startswith("AttributeError")
+
+
+def test_drawing_batch_groups_by_identifier():
+    first, second = FakeDrawing("A1", _id=7), FakeDrawing("A1", _id=7)
+    batch = DrawingHandlerWrapper().batch()
+    batch.set_attribute(first, "title1", "IFC")
+    batch.set_user_property(second, "DR_REVISION", 2)
+    assert len(batch) == 1
+
+    report = batch.apply()
+    assert report["drawings"] == 1
+    assert first.Title1 == "IFC"
+    assert first.user_properties == {"DR_REVISION": 2}
+
+
+def test_drawing_batch_discarded_on_error():
+    drawing = FakeDrawing("A1")
+    with pytest.raises(ValueError):
+        with DrawingHandlerWrapper().batch() as batch:
+            batch.set_attribute(drawing, "title1", "IFC")
+            raise ValueError
+    assert drawing.modifications == 0
+    assert batch.report is None
+
+    with pytest.raises(TypeError):
+        batch.set_user_property(drawing, "DR_CHECKED_BY", ["NAA"])
+
+
+class FakeTeklaModel:
+    def __init__(self):
+        self.commits = 0
+
+    def GetModelObjectSelector(self):
+        return None
+
+    def CommitChanges(self):
+        self.commits += 1
+        return True
+
+
+class FakeString:
+    def __init__(self):
+        self.ProfileString = None
+        self.MaterialString = None
+
+
+class FakeBeam:
+    class BeamTypeEnum:
+        BEAM = "beam"
+        COLUMN = "column"
+
+    created = []
+    next_id = 1
+
+    def __init__(self, beam_type):
+        self.beam_type = beam_type
+        self.Profile = FakeString()
+        self.Material = FakeString()
+        self.Class = None
+        self.Name = None
+        self.Identifier = FakeIdentifier(0)
+        FakeBeam.created.append(self)
+
+    def Insert(self):
+        if self.Profile.ProfileString == "UNKNOWN":
+            return False
+        self.Identifier = FakeIdentifier(FakeBeam.next_id)
+        FakeBeam.next_id += 1
+        return True
+
+
+@pytest.fixture
+def fake_beams(monkeypatch):
+    monkeypatch.setattr("pytekla.wrappers.Beam", FakeBeam)
+    monkeypatch.setattr("pytekla.wrappers.Point", FakePoint)
+    FakeBeam.created, FakeBeam.next_id = [], 1
+    return FakeBeam.created
+
+
+def test_create_beams(fake_beams):
+    tekla_model = FakeTeklaModel()
+    starts = [[0, 0, 0], [6000, 0, 0], [12000, 0, 0]]
+    ends = [[0, 0, 4000], [6000, 0, 4000], [12000, 0, 4000]]
+
+    ids = ModelWrapper(tekla_model).create_beams(
+        starts,
+        ends,
+        ["HEB300", "UNKNOWN", "HEB300"],
+        "S355",
+        name=("C1", "C2", "C3"),
+        beam_type="column",
+    )
+
+    assert ids.dtype == np.int64
+    assert list(ids) == [1, 0, 2]
+    assert tekla_model.commits == 1
+    assert [b.beam_type for b in fake_beams] == ["column"] * 3
+    assert [b.Material.MaterialString for b in fake_beams] == ["S355"] * 3
+    assert [b.Name for b in fake_beams] == ["C1", "C2", "C3"]
+    assert all(b.Class is None for b in fake_beams)
+    assert (fake_beams[1].StartPoint.X, fake_beams[1].EndPoint.Z) == (6000.0, 4000.0)
+    assert isinstance(fake_beams[1].StartPoint.X, float)
+
+
+def test_create_beams_wrong_sizes(fake_beams):
+    model = ModelWrapper(FakeTeklaModel())
+    with pytest.raises(ValueError):
+        model.create_beams([[0, 0, 0], [1, 0, 0]], [[0, 0, 1]], "HEB300")
+    with pytest.raises(ValueError):
+        model.create_beams([[0, 0, 0], [1, 0, 0]], [[0, 0, 1], [1, 0, 1]], ["HEB300"])
+    with pytest.raises(ValueError):
+        model.create_beams([[0, 0], [1, 0], [2, 0]], [[0, 1], [1, 1], [2, 1]], "HEB300")
+    with pytest.raises(ValueError):
+        model.create_beams(np.zeros((3, 2)), np.ones((3, 2)), "HEB300")
+    assert fake_beams == []
+
+
+def test_create_beams_single_point(fake_beams):
+    ids = ModelWrapper(FakeTeklaModel()).create_beams([0, 0, 0], [0, 0, 4000], "HEB300", part_class=3)
+    assert list(ids) == [1]
+    assert fake_beams[0].Class == "3"
+    assert fake_beams[0].EndPoint.Z == 4000.0
+
+
+class FakeHierarchyObject:
+    def __init__(self, _id):
+        self.Identifier = FakeIdentifier(_id)
+        self.expansions = 0
+
+
+class FakeHierarchyAssembly(FakeHierarchyObject):
+    def __init__(self, _id, main_part=None, secondaries=(), sub_assemblies=()):
+        super().__init__(_id)
+        self.main_part = main_part
+        self.secondaries = list(secondaries)
+        self.sub_assemblies = list(sub_assemblies)
+
+    def GetMainPart(self):
+        self.expansions += 1
+        return self.main_part
+
+    def GetSecondaries(self):
+        return self.secondaries
+
+    def GetSubAssemblies(self):
+        return self.sub_assemblies
+
+
+class FakeHierarchyComponent(FakeHierarchyObject):
+    def __init__(self, _id, children=()):
+        super().__init__(_id)
+        self.children = list(children)
+
+    def GetChildren(self):
+        self.expansions += 1
+        return self.children
+
+
+def test_get_hierarchy(monkeypatch):
+    monkeypatch.setattr("pytekla.wrappers.Assembly", FakeHierarchyAssembly)
+    monkeypatch.setattr("pytekla.wrappers.BaseComponent", FakeHierarchyComponent)
+
+    part_1, part_2, part_3 = FakeHierarchyObject(1), FakeHierarchyObject(2), FakeHierarchyObject(3)
+    sub_assembly = FakeHierarchyAssembly(20, main_part=part_3)
+    assembly = FakeHierarchyAssembly(
+        10, main_part=part_1, secondaries=[part_2], sub_assemblies=[sub_assembly]
+    )
+    component = FakeHierarchyComponent(30, children=[sub_assembly])
+    # a cycle: the component is a child of its own child
+    cycle = FakeHierarchyComponent(40)
+    cycle.children = [FakeHierarchyComponent(41, children=[cycle])]
+
+    hierarchy = ModelWrapper(FakeTeklaModel()).get_hierarchy([assembly, component, cycle])
+
+    # breadth first: the relations of the roots come before the ones of their children
+    assert list(zip(hierarchy["parent"], hierarchy["child"], hierarchy["relation"])) == [
+        (10, 1, 0),
+        (10, 2, 1),
+        (10, 20, 2),
+        (30, 20, 3),
+        (40, 41, 3),
+        (20, 3, 0),
+        (41, 40, 3),
+    ]
+    assert hierarchy["relation"].dtype == np.int8
+    # the shared sub assembly and the objects of the cycle are expanded only once
+    assert sub_assembly.expansions == 1
+    assert cycle.expansions == 1